@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Compare the wall time of packing and unpacking a component archive.
+
+Packs a generated component with single-threaded ``tarfile`` gzip (the previous
+implementation), with ``pack_archive`` using different numbers of threads,
+and with zstd if it's available.
+
+Usage: python benchmarks/archive_compression.py [--size-mb 256] [--threads 1 2 4 8]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+from idf_component_tools.archive_tools import (
+    is_known_format,
+    pack_archive,
+    unpack_archive,
+)
+
+
+def generate_component(path: Path, size_mb: int) -> None:
+    """Generate files that compress like sources and prebuilt binaries"""
+    rng = random.Random(0)
+    words = [
+        bytes(rng.choices(b'abcdefghijklmnopqrstuvwxyz_', k=rng.randint(2, 12)))
+        for _ in range(2000)
+    ]
+    file_size = 4 * 1024 * 1024
+
+    for index in range(max(size_mb * 1024 * 1024 // file_size, 1)):
+        directory = path / f'dir_{index % 8}'
+        directory.mkdir(parents=True, exist_ok=True)
+        if index % 2:
+            # Binary with some redundancy, like a model or a static library
+            chunk = rng.randbytes(4096)
+            data = b''.join(
+                chunk if rng.random() < 0.5 else rng.randbytes(4096)
+                for _ in range(file_size // 4096)
+            )
+            (directory / f'lib_{index}.a').write_bytes(data)
+        else:
+            data = b' '.join(rng.choices(words, k=file_size // 7))[:file_size]
+            (directory / f'source_{index}.c').write_bytes(data)
+
+
+def measure(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def pack_tarfile(source_dir: Path, archive_filepath: Path) -> None:
+    with tarfile.open(archive_filepath, 'w:gz') as archive:
+        archive.add(source_dir, arcname='./')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        source_dir = workdir / 'component'
+        generate_component(source_dir, args.size_mb)
+        print(f'Component size: {args.size_mb} MB, CPUs: {os.cpu_count()}')
+        print(f'{"method":<24}{"pack, s":>10}{"unpack, s":>12}{"size, MB":>12}')
+
+        cases = [('tarfile w:gz', 'tgz', lambda src, dst: pack_tarfile(src, dst))]
+        for threads in sorted(set(args.threads)):
+            cases.append((
+                f'gzip, {threads} threads',
+                'tgz',
+                lambda src, dst, threads=threads: pack_archive(src, dst, threads=threads),
+            ))
+        if is_known_format('zstdtar'):
+            cases.append(('zstd', 'tar.zst', lambda src, dst: pack_archive(src, dst)))
+        else:
+            print('zstd is not available, install the "zstandard" package to compare with it')
+
+        for index, (name, ext, pack) in enumerate(cases):
+            archive = workdir / f'archive_{index}.{ext}'
+            pack_time = measure(lambda: pack(source_dir, archive))
+            unpack_time = measure(lambda: unpack_archive(archive, str(workdir / 'unpacked')))
+            size = archive.stat().st_size / 1024 / 1024
+            print(f'{name:<24}{pack_time:>10.2f}{unpack_time:>12.2f}{size:>12.1f}')
+            archive.unlink()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
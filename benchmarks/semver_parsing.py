@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Measure parsing of semantic versions and specs in the hot loops of the solver.
+
+Runs the loops with empty interning caches, as every call parsed its string before,
+and with warm caches, as in a solve where the same versions and specs are seen again:
+
+- building Version and SimpleSpec objects from strings;
+- filtering and sorting versions of a component response, as the registry clients do;
+- converting specs to solver constraints.
+
+Prints the time per iteration of every loop.
+
+Usage: python benchmarks/semver_parsing.py [--versions 500] [--repeat 20]
+"""
+
+import argparse
+import time
+import typing as t
+
+from idf_component_manager.version_solver.helper import parse_constraint
+from idf_component_tools.registry.api_models import VersionResponse
+from idf_component_tools.registry.base_client import filter_versions
+from idf_component_tools.semver import SimpleSpec, Version
+from idf_component_tools.semver import base as semver_base
+
+SPECS = ['>=1.0.0,<3.0.0', '^2.1.0', '~1.4.0', '*', '>=2.0.0-rc.1', '==1.2.3', '!=2.0.0']
+
+
+def clear_caches() -> None:
+    for cache in (
+        semver_base._parse_version,
+        semver_base._intern_version,
+        semver_base._parse_simple_spec,
+        semver_base._intern_simple_spec,
+    ):
+        cache.cache_clear()
+
+
+def version_strings(count: int) -> t.List[str]:
+    versions = []
+    for i in range(count):
+        major, minor, patch = i // 100, (i // 10) % 10, i % 10
+        suffix = '-rc.1' if i % 17 == 0 else ''
+        versions.append(f'{major}.{minor}.{patch}{suffix}')
+    return versions
+
+
+def measure(func: t.Callable[[], t.Any], repeat: int, cold: bool) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        func()
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--versions', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    strings = version_strings(args.versions)
+    # Sorted by semver, descending, as returned by the registry clients
+    responses = [
+        VersionResponse(url=f'cmp_{version}.tgz', version=version, component_hash='0' * 64)
+        for version in sorted(strings, key=Version, reverse=True)
+    ]
+
+    loops = [
+        ('Version(str)', lambda: [Version(s) for s in strings]),
+        ('Version.intern(str)', lambda: [Version.intern(s) for s in strings]),
+        ('SimpleSpec(str)', lambda: [SimpleSpec(s) for s in SPECS * 20]),
+        ('SimpleSpec.intern(str)', lambda: [SimpleSpec.intern(s) for s in SPECS * 20]),
+        ('filter_versions', lambda: [filter_versions(responses, s, 'cmp') for s in SPECS]),
+        (
+            'sort responses',
+            lambda: sorted(responses, key=lambda v: Version.intern(v.version), reverse=True),
+        ),
+        ('parse_constraint', lambda: [parse_constraint(s) for s in SPECS * 20]),
+    ]
+
+    print(f'{"loop":<24}{"cold, ms":>12}{"warm, ms":>12}{"speedup":>10}')
+    for name, func in loops:
+        cold = measure(func, args.repeat, cold=True)
+        warm = measure(func, args.repeat, cold=False)
+        print(f'{name:<24}{cold * 1000:>12.3f}{warm * 1000:>12.3f}{cold / warm:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Compare decision heuristics of the mixology version solver.
+
+Solves generated graphs where newer versions of components conflict with each other
+again, after new versions were published and a dependency was added to the project.
+The default heuristic, which chooses the package with the fewest allowed versions first,
+is compared with PreferLockedHeuristic, which also chooses packages whose previously
+locked version is still allowed first between equal ones.
+
+Prints the number of attempted solutions, the wall time and the number of components
+that got a different version than the locked one.
+
+Usage: python benchmarks/solver_heuristics.py [--sizes 10 20 30] [--versions 15]
+"""
+
+import argparse
+import random
+import time
+import typing as t
+
+from idf_component_manager.version_solver.helper import PackageSource
+from idf_component_manager.version_solver.metrics import SolverMetrics
+from idf_component_manager.version_solver.mixology.failure import SolverFailure
+from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.version_solver import (
+    DecisionHeuristic,
+    PreferLockedHeuristic,
+    VersionSolver,
+)
+from idf_component_tools.logging import suppress_logging
+from idf_component_tools.sources import WebServiceSource
+
+NEW_VERSIONS = 3
+
+
+def build_graph(packages: int, versions: int, extra_dependency: bool = False) -> PackageSource:
+    """
+    Chain of packages where only the older versions are compatible with each other.
+
+    Dependencies of every version are generated from its own seed, so a graph
+    with more versions only adds newer versions to a graph with fewer ones.
+    """
+    service = WebServiceSource()
+    names = [Package(f'example/cmp_{i}', service) for i in range(packages)]
+    source = PackageSource()
+
+    for i, package in enumerate(names):
+        for version in range(1, versions + 1):
+            rng = random.Random(f'{i}-{version}')
+            dependencies = {}
+            for j in rng.sample(range(i + 1, packages), min(3, packages - i - 1)):
+                # Newer versions require newer versions of dependencies,
+                # which conflict with requirements of other packages
+                low = max(1, version - rng.randint(0, 2))
+                dependencies[names[j]] = f'>={low}.0.0,<{version + 1}.0.0'
+            source.add(package, f'{version}.0.0', dependencies)
+
+    for package in names[: packages // 4]:
+        source.root_dep(package, '*')
+    source.root_dep(names[-1], f'<{max(versions // 3, 2)}.0.0')
+    if extra_dependency:
+        source.root_dep(names[packages // 2], '*')
+
+    return source
+
+
+def solve(
+    source: PackageSource, heuristic: DecisionHeuristic
+) -> t.Tuple[SolverMetrics, float, t.Dict[Package, str]]:
+    metrics = SolverMetrics()
+    decisions = {}
+    start = time.perf_counter()
+    try:
+        result = VersionSolver(source, metrics=metrics, heuristic=heuristic).solve()
+        decisions = {
+            package: str(version)
+            for package, version in result.decisions.items()
+            if package != Package.root()
+        }
+    except SolverFailure:
+        pass
+
+    return metrics, time.perf_counter() - start, decisions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 30])
+    parser.add_argument('--versions', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f'{"graph":<28}{"heuristic":<16}{"attempts":>10}{"time, ms":>10}{"changed":>10}')
+    with suppress_logging():
+        for packages in args.sizes:
+            name = f'{packages} packages, relock'
+            _, _, locked = solve(
+                build_graph(packages, args.versions - NEW_VERSIONS), DecisionHeuristic()
+            )
+            for label, heuristic in (
+                ('fewest first', DecisionHeuristic()),
+                ('prefer locked', PreferLockedHeuristic(locked)),
+            ):
+                metrics, elapsed, decisions = solve(
+                    build_graph(packages, args.versions, extra_dependency=True), heuristic
+                )
+                changed = sum(
+                    1
+                    for package, version in decisions.items()
+                    if package in locked and locked[package] != version
+                )
+                print(
+                    f'{name:<28}{label:<16}{metrics.attempted_solutions:>10}'
+                    f'{elapsed * 1000:>10.1f}{changed:>10}'
+                )
+
+
+if __name__ == '__main__':
+    main()
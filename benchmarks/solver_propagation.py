@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Measure unit propagation of the mixology version solver.
+
+Solves the graphs from tests/version_solver and a generated graph with many
+components and versions that needs a lot of backtracking. Prints the wall time
+and the number of incompatibilities checked by the propagation.
+
+Usage: python benchmarks/solver_propagation.py [--repeat 20] [--packages 30] [--versions 15]
+"""
+
+import argparse
+import inspect
+import random
+import sys
+import time
+from pathlib import Path
+
+from idf_component_manager.version_solver.helper import PackageSource
+from idf_component_manager.version_solver.mixology.failure import SolverFailure
+from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.version_solver import VersionSolver
+from idf_component_tools.logging import suppress_logging
+from idf_component_tools.sources import WebServiceSource
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from tests.version_solver import (
+    test_backtracking,
+    test_basic_graph,
+    test_unsolvable,
+)
+
+
+class CountingVersionSolver(VersionSolver):
+    checked = 0
+
+    def _propagate_incompatibility(self, incompatibility):
+        CountingVersionSolver.checked += 1
+        return super()._propagate_incompatibility(incompatibility)
+
+
+def solve(source: PackageSource) -> None:
+    try:
+        CountingVersionSolver(source).solve()
+    except SolverFailure:
+        pass
+
+
+def test_graphs():
+    """Graphs from tests/version_solver, as functions building the package source"""
+    for module in (test_backtracking, test_basic_graph, test_unsolvable):
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith('test_') or 'source' not in inspect.signature(func).parameters:
+                continue
+
+            def build(func=func):
+                sources = []
+
+                def check(source, *args, **kwargs):
+                    sources.append(source)
+
+                func(PackageSource(), check)
+                return sources[0]
+
+            yield f'{module.__name__.rsplit(".", 1)[-1]}::{name}', build
+
+
+def generated_graph(packages: int, versions: int):
+    """Chain of packages where only the oldest versions are compatible with each other"""
+
+    def build():
+        rng = random.Random(0)
+        service = WebServiceSource()
+        names = [Package(f'example/cmp_{i}', service) for i in range(packages)]
+        source = PackageSource()
+
+        for i, package in enumerate(names):
+            for version in range(1, versions + 1):
+                dependencies = {}
+                for j in rng.sample(range(i + 1, packages), min(3, packages - i - 1)):
+                    # Newer versions require newer versions of dependencies,
+                    # which conflict with requirements of other packages
+                    low = max(1, version - rng.randint(0, 2))
+                    dependencies[names[j]] = f'>={low}.0.0,<{version + 1}.0.0'
+                source.add(package, f'{version}.0.0', dependencies)
+
+        for package in names[: packages // 4]:
+            source.root_dep(package, '*')
+        source.root_dep(names[-1], f'<{max(versions // 3, 2)}.0.0')
+        return source
+
+    return f'generated {packages} packages x {versions} versions', build
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--packages', type=int, default=30)
+    parser.add_argument('--versions', type=int, default=15)
+    args = parser.parse_args()
+
+    cases = list(test_graphs())
+    cases.append(generated_graph(args.packages, args.versions))
+
+    total = 0.0
+    print(f'{"graph":<80}{"time, ms":>10}{"checked":>10}')
+    for name, build in cases:
+        repeat = args.repeat if not name.startswith('generated') else 1
+        # Some graphs warn about their sources on every build
+        with suppress_logging():
+            sources = [build() for _ in range(repeat)]
+
+            CountingVersionSolver.checked = 0
+            start = time.perf_counter()
+            for source in sources:
+                solve(source)
+        elapsed = (time.perf_counter() - start) / repeat
+        total += elapsed
+
+        print(f'{name:<80}{elapsed * 1000:>10.2f}{CountingVersionSolver.checked // repeat:>10}')
+
+    print(f'{"total":<80}{total * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
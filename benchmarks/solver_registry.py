@@ -0,0 +1,225 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Measure the version solver against synthetic component registries.
+
+Generates local storage mirrors with layers of components, each version depending on
+components of the next layers, which makes a lot of diamond dependencies. Optionally
+adds dependencies with "rules" and "matches", and a conflict that makes the graph
+unsolvable. The mirror is served with file:// URLs, so the whole solve goes through
+WebServiceSource and StorageClient without network access.
+
+Prints wall time, peak memory (traced in a separate run), the number of requests to
+the storage and the solver counters for every scenario and size.
+
+The "small" preset (50 and 100 components with 10 versions) runs in minutes. The "large"
+preset solves registries of 250 to 1000 components with 100 versions each, it takes much
+longer, most of the time is spent parsing dependencies of the versions in the responses.
+
+Usage: python benchmarks/solver_registry.py [--preset small|large] [--components 50 100]
+    [--versions 10] [--scenarios ...]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import typing as t
+from pathlib import Path
+from unittest import mock
+
+from requests.adapters import HTTPAdapter
+from requests_file import FileAdapter
+
+from idf_component_manager.version_solver.mixology.failure import SolverFailure
+from idf_component_manager.version_solver.version_solver import VersionSolver
+from idf_component_tools.errors import SolverError
+from idf_component_tools.logging import suppress_logging
+from idf_component_tools.manifest import Manifest
+from idf_component_tools.registry import request_processor
+from idf_component_tools.utils import ProjectRequirements
+
+NAMESPACE = 'bench'
+LAYERS = 5
+PINNED_RATIO = 0.02
+TARGET = 'esp32'
+SCENARIOS = ('diamonds', 'optional', 'unsolvable')
+# Numbers of components and versions of every component
+PRESETS = {
+    'small': ([50, 100], 10),
+    'large': ([250, 500, 1000], 100),
+}
+
+
+class RequestCounter:
+    """Counts requests to the mirror and fails on any request to the network"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    @contextlib.contextmanager
+    def patch(self) -> t.Iterator[None]:
+        file_send = FileAdapter.send
+
+        def count(adapter, request, **kwargs):
+            self.count += 1
+            return file_send(adapter, request, **kwargs)
+
+        def deny(adapter, request, **kwargs):  # noqa: ARG001
+            raise RuntimeError(f'Unexpected network request to {request.url}')
+
+        with mock.patch.object(FileAdapter, 'send', count):
+            with mock.patch.object(HTTPAdapter, 'send', deny):
+                yield
+
+
+def component_name(index: int) -> str:
+    return f'cmp_{index}'
+
+
+def dependency(index: int, spec: str, **kwargs: t.Any) -> t.Dict[str, t.Any]:
+    return dict(
+        source='service',
+        namespace=NAMESPACE,
+        name=component_name(index),
+        spec=spec,
+        **kwargs,
+    )
+
+
+def generate_registry(
+    path: Path, scenario: str, components: int, versions: int
+) -> t.Dict[str, str]:
+    """Write the mirror to the path and return dependencies of the project"""
+    rng = random.Random(0)
+    layer_size = max(components // LAYERS, 1)
+    component_dir = path / 'components' / NAMESPACE
+    component_dir.mkdir(parents=True)
+
+    roots = rng.sample(range(layer_size), min(10, layer_size))
+    # Components of the last layer have no dependencies
+    leaf = components - 1
+
+    for index in range(components):
+        layer = index // layer_size
+        next_layers = range((layer + 1) * layer_size, min((layer + 3) * layer_size, components))
+        name = component_name(index)
+
+        version_responses = []
+        for major in range(1, versions + 1):
+            dependencies = [{'source': 'idf', 'spec': '>=4.4'}]
+            for dep_index in rng.sample(next_layers, min(3, len(next_layers))):
+                # Newer versions need newer dependencies, and some are stuck on old ones,
+                # so the solver has to backtrack when a dependency is shared
+                if rng.random() < PINNED_RATIO:
+                    spec = f'<{rng.randint(2, versions)}.0.0'
+                else:
+                    spec = f'>={max(1, major - rng.randint(1, 3))}.0.0,<{major + 1}.0.0'
+                dependencies.append(dependency(dep_index, spec))
+
+            if scenario == 'optional' and next_layers:
+                dep_index = rng.choice(next_layers)
+                dependencies.append(
+                    dependency(
+                        dep_index,
+                        '*',
+                        rules=[{'if': f'target in [{TARGET}, esp32s3]'}],
+                        matches=[
+                            {'if': 'idf_version >= 5.0', 'version': f'>={max(1, major - 2)}.0.0'},
+                            {'if': 'idf_version < 5.0', 'version': '1.0.0'},
+                        ],
+                    )
+                )
+                dep_index = rng.choice(next_layers)
+                dependencies.append(dependency(dep_index, '*', rules=[{'if': 'target == esp32p4'}]))
+
+            if scenario == 'unsolvable' and index == roots[0]:
+                # Conflicts with the project, the solver has to try every version
+                dependencies.append(dependency(leaf, '>=2.0.0'))
+
+            version = f'{major}.0.0'
+            version_responses.append({
+                'version': version,
+                'component_hash': hashlib.sha256(f'{name}@{version}'.encode()).hexdigest(),
+                'url': f'components/{NAMESPACE}/{name}/{name}_{version}.tgz',
+                'targets': [],
+                'dependencies': dependencies,
+            })
+
+        with open(component_dir / f'{name}.json', 'w', encoding='utf-8') as f:
+            json.dump({'name': name, 'namespace': NAMESPACE, 'versions': version_responses}, f)
+
+    project_dependencies = {f'{NAMESPACE}/{component_name(index)}': '*' for index in roots}
+    if scenario == 'unsolvable':
+        project_dependencies[f'{NAMESPACE}/{component_name(leaf)}'] = '<2.0.0'
+
+    return project_dependencies
+
+
+def solve(dependencies: t.Dict[str, str]) -> t.Tuple[bool, VersionSolver]:
+    # Drop responses cached in the process by the previous run
+    request_processor._request_cache.clear()
+    manifest = Manifest.fromdict({'dependencies': dependencies})
+    solver = VersionSolver(ProjectRequirements([manifest]))
+    try:
+        solver.solve()
+    except (SolverFailure, SolverError):
+        return False, solver
+
+    return True, solver
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--preset', choices=PRESETS, default='small')
+    parser.add_argument('--components', type=int, nargs='+', help='overrides the preset')
+    parser.add_argument('--versions', type=int, help='overrides the preset')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    args = parser.parse_args()
+    preset_components, preset_versions = PRESETS[args.preset]
+    components_sizes = args.components or preset_components
+    versions = args.versions or preset_versions
+
+    os.environ['IDF_TARGET'] = TARGET
+    os.environ['CI_TESTING_IDF_VERSION'] = '5.3.0'
+
+    print(
+        f'{"scenario":<12}{"components":>12}{"solved":>8}{"time, s":>10}{"peak, MiB":>11}'
+        f'{"requests":>10}{"attempts":>10}{"decisions":>11}{"backtracks":>12}'
+    )
+    for scenario in args.scenarios:
+        for components in components_sizes:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # Don't read the user config and cache
+                os.environ['IDF_TOOLS_PATH'] = tmp_dir
+                os.environ['IDF_COMPONENT_CACHE_PATH'] = os.path.join(tmp_dir, 'cache')
+                mirror = Path(tmp_dir) / 'mirror'
+                dependencies = generate_registry(mirror, scenario, components, versions)
+                os.environ['IDF_COMPONENT_LOCAL_STORAGE_URL'] = mirror.as_uri()
+
+                counter = RequestCounter()
+                with suppress_logging(), counter.patch():
+                    start = time.perf_counter()
+                    solved, solver = solve(dependencies)
+                    elapsed = time.perf_counter() - start
+
+                    tracemalloc.start()
+                    solve(dependencies)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+            metrics = solver.metrics
+            # Both runs make the same requests
+            print(
+                f'{scenario:<12}{components:>12}{"yes" if solved else "no":>8}{elapsed:>10.2f}'
+                f'{peak / 2**20:>11.1f}{counter.count // 2:>10}{metrics.attempted_solutions:>10}'
+                f'{metrics.decisions:>11}{metrics.backtracks:>12}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -75,6 +75,13 @@ def init_component():
         + DEST_DIR_OPTION
         + COMMIT_SHA_REPO_OPTION
     )
+    @click.option(
+        '--staged',
+        is_flag=True,
+        default=False,
+        help='Copy the component files into the dist directory before packing them. '
+        'Useful to inspect the content of the archive.',
+    )
     def pack(
         manager,
         name,
@@ -83,6 +90,7 @@ def init_component():
         repository,
         commit_sha,
         repository_path,
+        staged,
     ):  # namespace is not used
         """
         Create a component archive and store it in the dist directory.
@@ -94,6 +102,7 @@ def init_component():
             repository=repository,
             commit_sha=commit_sha,
             repository_path=repository_path,
+            staged=staged,
         )
 
     @component.command()
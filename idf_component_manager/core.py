@@ -24,7 +24,7 @@ from ruamel.yaml import YAML, CommentedMap
 
 from idf_component_manager.utils import ComponentSource, VersionSolverResolution
 from idf_component_tools import ComponentManagerSettings, debug
-from idf_component_tools.archive_tools import pack_archive, unpack_archive
+from idf_component_tools.archive_tools import pack_archive, pack_paths, unpack_archive
 from idf_component_tools.build_system_tools import build_name, get_idf_path, is_component
 from idf_component_tools.config import root_managed_components_dir
 from idf_component_tools.constants import MANIFEST_FILENAME
@@ -39,6 +39,7 @@ from idf_component_tools.errors import (
 from idf_component_tools.file_tools import (
     check_examples_folder,
     copy_filtered_directory,
+    filtered_paths,
     prepare_empty_directory,
 )
 from idf_component_tools.git_client import GitClient, clean_tag_version
@@ -91,6 +92,7 @@ from .core_utils import (
 from .dependencies import download_project_dependencies
 from .local_component_list import parse_component_list
 from .sync import sync_components
+from .version_solver.target_locks import TargetLocks
 
 try:
     import truststore
@@ -367,7 +369,15 @@ class ComponentManager:
         repository: t.Optional[str] = None,
         commit_sha: t.Optional[str] = None,
         repository_path: t.Optional[str] = None,
+        staged: bool = False,
     ) -> t.Tuple[str, t.Optional[str], Manifest]:
+        """
+        Create component archive and examples archive, if the component has examples.
+
+        By default, archives are written directly from the component directory.
+        If ``staged`` is True, files are copied into the dist directory first,
+        which is useful to inspect the content of the archive.
+        """
         dest_path = self.path / dest_dir if dest_dir else self.default_dist_path
 
         if version == 'git':
@@ -395,28 +405,47 @@ class ComponentManager:
             repository_path=repository_path,
         )
         manifest = manifest_manager.load()
-        dest_temp_dir = dest_path / dist_name(name, manifest.version)
         exclude_set = manifest.exclude_set
 
         # If a custom directory is defined, add it to the set of files to exclude
         if dest_dir is not None:
             exclude_set.add(os.path.relpath(dest_path, self.path) + '/**/*')
 
-        copy_filtered_directory(
-            self.path.as_posix(),
-            dest_temp_dir.as_posix(),
-            use_gitignore=manifest.use_gitignore,
-            include=manifest.include_set,
-            exclude=exclude_set,
-        )
+        archive_filepath = os.path.join(dest_path, archive_filename(name, manifest.version))
+
+        if staged:
+            dest_temp_dir = dest_path / dist_name(name, manifest.version)
+            copy_filtered_directory(
+                self.path.as_posix(),
+                dest_temp_dir.as_posix(),
+                use_gitignore=manifest.use_gitignore,
+                include=manifest.include_set,
+                exclude=exclude_set,
+            )
 
-        manifest_manager.dump(str(dest_temp_dir))
+            manifest_manager.dump(str(dest_temp_dir))
 
-        get_validated_manifest(manifest_manager, str(dest_temp_dir))
+            get_validated_manifest(manifest_manager, str(dest_temp_dir))
 
-        archive_filepath = os.path.join(dest_path, archive_filename(name, manifest.version))
-        notice(f'Saving component archive to "{archive_filepath}"')
-        pack_archive(str(dest_temp_dir), archive_filepath)
+            notice(f'Saving component archive to "{archive_filepath}"')
+            pack_archive(str(dest_temp_dir), archive_filepath)
+        else:
+            paths = filtered_paths(
+                self.path,
+                use_gitignore=manifest.use_gitignore,
+                include=manifest.include_set,
+                exclude=exclude_set,
+            )
+
+            get_validated_manifest(manifest_manager, str(self.path), files=paths)
+
+            notice(f'Saving component archive to "{archive_filepath}"')
+            os.makedirs(dest_path, exist_ok=True)
+            pack_paths(
+                {path.relative_to(self.path).as_posix(): path for path in paths},
+                archive_filepath,
+                contents={MANIFEST_FILENAME: manifest_manager.dumps().encode('utf-8')},
+            )
 
         if not manifest.examples:
             return archive_filepath, None, manifest
@@ -425,9 +454,11 @@ class ComponentManager:
 
         # Create a destination directory for examples defined in the manifest
         examples_dest_dir = dest_path / f'{name}_{manifest.version}_examples'
-        # If exists delete it
-        prepare_empty_directory(examples_dest_dir)
+        if staged:
+            # If exists delete it
+            prepare_empty_directory(examples_dest_dir)
 
+        examples_paths: t.Dict[str, Path] = {}
         for example in manifest.examples:
             example_path = (self.path / Path(list(example.values())[0])).resolve()
             # Do not consider examples from the `examples` directory
@@ -435,16 +466,30 @@ class ComponentManager:
                 continue
 
             # Create a random directory to avoid conflicts with other examples
-            copy_filtered_directory(
-                example_path.as_posix(),
-                (examples_dest_dir / secrets.token_hex(4) / example_path.name).as_posix(),
-                use_gitignore=manifest.use_gitignore,
-                include=manifest.include_set,
-                exclude=exclude_set,
-            )
+            example_dest_dir = Path(secrets.token_hex(4)) / example_path.name
+            if staged:
+                copy_filtered_directory(
+                    example_path.as_posix(),
+                    (examples_dest_dir / example_dest_dir).as_posix(),
+                    use_gitignore=manifest.use_gitignore,
+                    include=manifest.include_set,
+                    exclude=exclude_set,
+                )
+            else:
+                for path in filtered_paths(
+                    example_path,
+                    use_gitignore=manifest.use_gitignore,
+                    include=manifest.include_set,
+                    exclude=exclude_set,
+                ):
+                    rel_path = example_dest_dir / path.relative_to(example_path)
+                    examples_paths[rel_path.as_posix()] = path
 
         examples_archive_filepath = f'{examples_dest_dir}.tgz'
-        pack_archive(examples_dest_dir.as_posix(), examples_archive_filepath)
+        if staged:
+            pack_archive(examples_dest_dir.as_posix(), examples_archive_filepath)
+        else:
+            pack_paths(examples_paths, examples_archive_filepath)
         notice(f'Saving examples archive to "{examples_archive_filepath}"')
 
         return archive_filepath, examples_archive_filepath, manifest
@@ -690,6 +735,11 @@ class ComponentManager:
         if self.lock_path.is_file():
             os.remove(self.lock_path)
 
+        target_locks = TargetLocks(str(self.lock_path))
+        for target in target_locks.targets:
+            if os.path.isfile(target_locks.path(target)):
+                os.remove(target_locks.path(target))
+
     # Function executed from CMake
 
     @general_error_handler
@@ -53,39 +53,54 @@ def _create_manifest_if_missing(manifest_dir: Path) -> bool:
     return True
 
 
-def get_validated_manifest(manifest_manager: ManifestManager, path: str) -> Manifest:
+def get_validated_manifest(
+    manifest_manager: ManifestManager, path: str, files: t.Optional[t.Iterable[Path]] = None
+) -> Manifest:
     """
     Get the validated manifest for the given path.
 
     :param manifest_manager: The ManifestManager object used to load the manifest.
     :param path: The path to the manifest file.
+    :param files: Files of the component, if not set all files in the path are checked.
     :return: The validated Manifest object.
 
     :raises ManifestError: If the manifest file is invalid.
     """
     manifest = manifest_manager.load()
-    validate_examples_manifest(path)
-    check_unexpected_component_files(path)
+    if files is not None:
+        files = list(files)
+    validate_examples_manifest(path, files)
+    check_unexpected_component_files(path, files)
     return manifest
 
 
-def validate_examples_manifest(path: str) -> None:
+def validate_examples_manifest(path: str, files: t.Optional[t.Iterable[Path]] = None) -> None:
     """
     Validates the manifest files in the examples directory.
 
     :param path: The path to the component directory.
     :type path: str
+    :param files: Files of the component, if not set all files in the path are checked.
 
     :raises ManifestError: If the manifest file is invalid.
     """
 
     examples_path = Path(path) / 'examples'
 
-    if not examples_path.exists():
-        return None
+    if files is None:
+        if not examples_path.exists():
+            return None
+
+        # Find all manifest files in examples directory
+        manifest_paths = examples_path.rglob(MANIFEST_FILENAME)
+    else:
+        manifest_paths = (
+            file
+            for file in files
+            if file.name == MANIFEST_FILENAME and examples_path in file.parents
+        )
 
-    # Find all manifest files in examples directory
-    for manifest_path in examples_path.rglob(MANIFEST_FILENAME):
+    for manifest_path in manifest_paths:
         # Check if the manifest file is valid
         ManifestManager(
             manifest_path, manifest_path.parent.parent.name, upload_mode=UploadMode.example
@@ -3,6 +3,8 @@
 import os
 import shutil
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from functools import total_ordering
 from pathlib import Path
 
@@ -10,6 +12,9 @@ from idf_component_manager.core_utils import raise_component_modified_error
 from idf_component_manager.version_solver.helper import parse_root_dep_conflict_constraints
 from idf_component_manager.version_solver.mixology.failure import SolverFailure
 from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.new_versions import NewVersionsCheck
+from idf_component_manager.version_solver.solution_cache import SolutionCache
+from idf_component_manager.version_solver.target_locks import TargetLocks
 from idf_component_manager.version_solver.version_solver import VersionSolver
 from idf_component_tools import ComponentManagerSettings
 from idf_component_tools.build_system_tools import build_name, get_idf_version
@@ -40,11 +45,16 @@ from idf_component_tools.hash_tools.validate import (
 from idf_component_tools.lock import LockManager
 from idf_component_tools.manifest import SolvedComponent, SolvedManifest
 from idf_component_tools.messages import debug, hint, notice, warn
+from idf_component_tools.metadata_cache import VerifiedVersionsCache
 from idf_component_tools.registry.client_errors import NetworkConnectionError
 from idf_component_tools.semver import SimpleSpec, Version
 from idf_component_tools.sources import IDFSource
 from idf_component_tools.sources.fetcher import ComponentFetcher
-from idf_component_tools.utils import ComponentVersion, ProjectRequirements
+from idf_component_tools.utils import (
+    ComponentVersion,
+    ComponentWithVersions,
+    ProjectRequirements,
+)
 
 
 def check_manifests_targets(project_requirements: ProjectRequirements) -> None:
@@ -154,7 +164,7 @@ def is_solve_required(project_requirements: ProjectRequirements, solution: Solve
     # if so, check if the components are compatible with the new idf version
     cur_idf_version = get_idf_version()
     if solution.idf_version != cur_idf_version:
-        idf_sem_ver = Version(cur_idf_version)
+        idf_sem_ver = Version.intern(cur_idf_version)
         for comp in solution.solved_components.values():
             if comp.name == IDFSource().type or (not comp.dependencies):
                 continue
@@ -168,7 +178,7 @@ def is_solve_required(project_requirements: ProjectRequirements, solution: Solve
                     return True
 
                 if dep.name == IDFSource().type:
-                    if not SimpleSpec(dep.version_spec).match(idf_sem_ver):
+                    if not SimpleSpec.intern(dep.version_spec).match(idf_sem_ver):
                         notice(
                             '{} is not compatible with the current idf version {}, '
                             'solving dependencies.'.format(comp, cur_idf_version)
@@ -180,71 +190,117 @@ def is_solve_required(project_requirements: ProjectRequirements, solution: Solve
         notice('Direct dependencies have changed, solving dependencies.')
         return True
 
-    for component in solution.dependencies:
-        if component.name == IDFSource().type:  # IDF version might have changed
-            continue
-
-        try:
-            # For downloadable volatile dependencies, like ones from git,
-            # if manifest didn't change, no need to solve
-            if component.source.downloadable and component.source.volatile:
-                continue
-
-            # For local components without version specified, nothing to do
-            if not component.version.is_semver and component.source.volatile:
-                continue
-
-            # get the same version one
-            try:
-                component_versions = component.source.versions(
-                    component.name, spec=f'=={component.version.semver}'
-                )
-            except FetchingError:
-                warn(
-                    f'Version {component.version} of dependency {component.name} not found, '
-                    'probably it was deleted, solving dependencies.'
-                )
-                return True
-            except NetworkConnectionError:
-                notice(
-                    'Cannot establish a connection to the component registry. '
-                    'Skipping checks of dependency changes.'
-                )
-                return False
+    cache = VerifiedVersionsCache()
+    components = [
+        component
+        for component in solution.dependencies
+        if _is_registry_check_required(component, cache)
+    ]
 
-            component_version = component_versions.versions[0]
+    # Fetch the locked versions concurrently, but check them in the order of the lock file
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+        futures = [
+            executor.submit(
+                copy_context().run,
+                component.source.versions,
+                component.name,
+                spec=f'=={component.version.semver}',
+            )
+            for component in components
+        ]
 
-            # Handle meta components, like ESP-IDF, and volatile components, like local
-            if component.source.meta or component.source.volatile:
-                if component_version.version != component.version:
-                    notice(
-                        'Dependency "{}" version has changed from {} to {}, '
-                        'solving dependencies.'.format(
-                            component, component.version, component_version
-                        )
+        try:
+            for component, future in zip(components, futures):
+                # get the same version one
+                try:
+                    component_versions = future.result()
+                except FetchingError:
+                    warn(
+                        f'Version {component.version} of dependency {component.name} not found, '
+                        'probably it was deleted, solving dependencies.'
                     )
                     return True
+                except NetworkConnectionError:
+                    notice(
+                        'Cannot establish a connection to the component registry. '
+                        'Skipping checks of dependency changes.'
+                    )
+                    return False
 
-            # Should check for all types of source, but after version checking
-            if component_version.component_hash != component.component_hash:
-                if component.source.volatile:
-                    notice(f'Dependency "{component}" has changed, solving dependencies.')
+                if _is_locked_component_changed(component, component_versions):
                     return True
-                else:
-                    raise InvalidComponentHashError(
-                        'The hash sum of the component "{}" does not match '
-                        'the one recorded in your dependencies.lock file. '
-                        'This could be due to a potential spoofing of the download server, '
-                        'or your lock file may have become corrupted. '
-                        "Please review the lock file and verify the download server's "
-                        "authenticity to ensure the component's security and integrity.".format(
-                            component
-                        )
+
+                if component.source.downloadable and component.component_hash:
+                    cache.add(
+                        component.source,
+                        component.name,
+                        str(component.version),
+                        component.component_hash,
                     )
+        finally:
+            for future in futures:
+                future.cancel()
+
+            cache.save()
+
+    return False
+
+
+def _is_registry_check_required(component: SolvedComponent, cache: VerifiedVersionsCache) -> bool:
+    if component.name == IDFSource().type:  # IDF version might have changed
+        return False
+
+    # For downloadable volatile dependencies, like ones from git,
+    # if manifest didn't change, no need to solve
+    if component.source.downloadable and component.source.volatile:
+        return False
+
+    # For local components without version specified, nothing to do
+    if not component.version.is_semver and component.source.volatile:
+        return False
+
+    # The registry has recently confirmed the hash of this version
+    if component.source.downloadable and component.component_hash:
+        cached_hash = cache.get(component.source, component.name, str(component.version))
+        if cached_hash == component.component_hash:
+            return False
+
+    return True
+
+
+def _is_locked_component_changed(
+    component: SolvedComponent, component_versions: ComponentWithVersions
+) -> bool:
+    try:
+        component_version = component_versions.versions[0]
+    except IndexError:
+        notice(f'Dependency "{component}" version changed, solving dependencies.')
+        return True
 
-        except IndexError:
-            notice(f'Dependency "{component}" version changed, solving dependencies.')
+    # Handle meta components, like ESP-IDF, and volatile components, like local
+    if component.source.meta or component.source.volatile:
+        if component_version.version != component.version:
+            notice(
+                'Dependency "{}" version has changed from {} to {}, solving dependencies.'.format(
+                    component, component.version, component_version
+                )
+            )
+            return True
+
+    # Should check for all types of source, but after version checking
+    if component_version.component_hash != component.component_hash:
+        if component.source.volatile:
+            notice(f'Dependency "{component}" has changed, solving dependencies.')
             return True
+        else:
+            raise InvalidComponentHashError(
+                'The hash sum of the component "{}" does not match '
+                'the one recorded in your dependencies.lock file. '
+                'This could be due to a potential spoofing of the download server, '
+                'or your lock file may have become corrupted. '
+                "Please review the lock file and verify the download server's "
+                "authenticity to ensure the component's security and integrity.".format(component)
+            )
 
     return False
 
@@ -288,40 +344,11 @@ class DownloadedComponent:
         return Path(self.abs_path).as_posix()
 
 
-def check_for_new_component_versions(project_requirements, old_solution):
+def check_for_new_component_versions(
+    project_requirements: ProjectRequirements, old_solution: SolvedManifest, lock_path: str
+) -> None:
     if ComponentManagerSettings().CHECK_NEW_VERSION:
-        # Check for newer versions of components
-        solver = VersionSolver(project_requirements)
-        try:
-            new_solution = solver.solve()
-            new_deps_names = [dep.name for dep in new_solution.dependencies]
-            updateable_components_messages = []
-
-            for old_dep in old_solution.dependencies:
-                # Check if the old dependency is present in the new solution
-                if old_dep.name not in new_deps_names:
-                    continue
-
-                # Find index of old dependency in new_solution dependencies
-                new_dep = new_solution.dependencies[new_deps_names.index(old_dep.name)]
-                # Check if the version of the old dependency is different from the new one
-                if old_dep.version != new_dep.version:
-                    updateable_components_messages.append(
-                        'Dependency "{}": "{}" -> "{}"'.format(
-                            old_dep.name, old_dep.version, new_dep.version
-                        )
-                    )
-
-            if updateable_components_messages:
-                messages_concat = '\n'.join(updateable_components_messages)
-                notice(
-                    '\nFollowing dependencies have new versions available:\n'
-                    f'{messages_concat}'
-                    '\nConsider running "idf.py update-dependencies" to update your lock file.'
-                )
-
-        except (SolverFailure, NetworkConnectionError):
-            pass
+        NewVersionsCheck(lock_path).run(project_requirements, old_solution)
 
 
 def dependency_pre_download_check(
@@ -418,6 +445,10 @@ def dependency_validate(component: SolvedComponent, download_path: t.Optional[st
     if not component.source.downloadable or download_path is None:
         return
 
+    # Components verified while unpacking are not hashed again
+    if component.source.is_download_verified(download_path):
+        return
+
     try:
         validate_hashfile_eq_hashdir(download_path)
     except ValidatingHashError as e:
@@ -426,6 +457,17 @@ def dependency_validate(component: SolvedComponent, download_path: t.Optional[st
         )
 
 
+def use_current_idf_version(solution: SolvedManifest) -> None:
+    """Replace the version of idf in the old solution with the current idf version."""
+    for dep in solution.dependencies:
+        if dep.name == IDFSource().type:
+            cur_idf_version = get_idf_version()
+            debug(
+                f'replacing {dep.name} version {dep.version} with current idf version {cur_idf_version}'
+            )
+            dep.version = ComponentVersion(cur_idf_version)
+
+
 def download_project_dependencies(
     project_requirements: ProjectRequirements,
     lock_path: str,
@@ -453,59 +495,72 @@ def download_project_dependencies(
         warn(f'Unknown error: {e}, recreating lock file.')
         solution = SolvedManifest.fromdict({})
 
-    # replace the old solution with the current idf
-    for dep in solution.dependencies:
-        if dep.name == IDFSource().type:
-            cur_idf_version = get_idf_version()
-            debug(
-                f'replacing {dep.name} version {dep.version} with current idf version {cur_idf_version}'
-            )
-            dep.version = ComponentVersion(cur_idf_version)
+    use_current_idf_version(solution)
 
     check_manifests_targets(project_requirements)
 
-    if is_solve_required(project_requirements, solution):
-        solver = VersionSolver(
-            project_requirements,
-            old_solution=solution,
-            component_solved_callback=print_dot,
-        )
+    # the target has changed, use the lock file solved for it before
+    target_locks = TargetLocks(lock_path)
+    if target_locks.enabled and solution.target != project_requirements.target:
+        target_solution = target_locks.load(project_requirements)
+        if target_solution is not None:
+            debug(f'Using the lock file of target "{project_requirements.target}"')
+            solution = target_solution
+            use_current_idf_version(solution)
+
+    solve_required = is_solve_required(project_requirements, solution)
+    if solve_required:
+        solution_cache = SolutionCache()
+        cache_key = solution_cache.key(project_requirements, solution)
+        cached_solution = solution_cache.get(cache_key)
+        if cached_solution is not None:
+            debug('Using the cached solution of the version solver')
+            solution = cached_solution
+        else:
+            solver = VersionSolver(
+                project_requirements,
+                old_solution=solution,
+                component_solved_callback=print_dot,
+            )
 
-        try:
-            solution = solver.solve()
-        except SolverFailure as e:
-            debug_info = DEBUG_INFO_COLLECTOR.get()
-            if debug_info.msgs:
-                msg = '\n'.join(debug_info.msgs)
-                hint(f'Failed to solve dependencies. Here are some possible reasons:\n{msg}')
-
-            conflict_constraints = parse_root_dep_conflict_constraints(e)
-            components_introduce_conflict = []
-            for conflict_constraint in conflict_constraints:
-                for manifest in project_requirements.manifests:
-                    for req in manifest.requirements:
-                        if Package(
-                            req.name, req.source
-                        ) == conflict_constraint.package and req.version_spec == str(
-                            conflict_constraint.constraint
-                        ):
-                            components_introduce_conflict.append(manifest.real_name)
-                            break
-
-            if components_introduce_conflict:
-                hint(
-                    'Please check manifest file of the following component(s): {}'.format(
-                        ', '.join(components_introduce_conflict)
+            try:
+                solution = solver.solve()
+            except SolverFailure as e:
+                debug_info = DEBUG_INFO_COLLECTOR.get()
+                if debug_info.msgs:
+                    msg = '\n'.join(debug_info.msgs)
+                    hint(f'Failed to solve dependencies. Here are some possible reasons:\n{msg}')
+
+                conflict_constraints = parse_root_dep_conflict_constraints(e)
+                components_introduce_conflict = []
+                for conflict_constraint in conflict_constraints:
+                    for manifest in project_requirements.manifests:
+                        for req in manifest.requirements:
+                            if Package(
+                                req.name, req.source
+                            ) == conflict_constraint.package and req.version_spec == str(
+                                conflict_constraint.constraint
+                            ):
+                                components_introduce_conflict.append(manifest.real_name)
+                                break
+
+                if components_introduce_conflict:
+                    hint(
+                        'Please check manifest file of the following component(s): {}'.format(
+                            ', '.join(components_introduce_conflict)
+                        )
                     )
-                )
-            raise SolverError(str(e))
+                raise SolverError(str(e))
+
+            solution_cache.add(cache_key, solver, solution)
     else:
         check_for_new_component_versions(
-            project_requirements=project_requirements, old_solution=solution
+            project_requirements=project_requirements, old_solution=solution, lock_path=lock_path
         )
 
     # always dump file, file won't be touched if content is the same
     lock_manager.dump(solution)
+    target_locks.update(project_requirements, solution, solved=solve_required)
 
     # Download components
     downloaded_components = set()
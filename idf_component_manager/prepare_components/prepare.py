@@ -7,19 +7,29 @@
 # from package manager
 
 import argparse
+import json
 import os
 import shutil
 import sys
 import typing as t
+from contextlib import contextmanager
 from pathlib import Path
 
 from esp_pylib.excepthook import install_exception_reporting
 
 from idf_component_manager.core import ComponentManager
-from idf_component_tools import error, setup_logging, warn
+from idf_component_tools import ComponentManagerSettings, debug, error, setup_logging, warn
+from idf_component_tools.__version__ import __version__
 from idf_component_tools.debugger import KCONFIG_CONTEXT
 from idf_component_tools.errors import FatalError
 from idf_component_tools.manifest import ComponentRequirement
+from idf_component_tools.manifest_cache import (
+    ManifestCache,
+    manifest_cache_path,
+    set_manifest_cache,
+)
+from idf_component_tools.metadata_cache import dump_json_atomic
+from idf_component_tools.registry.request_processor import set_response_snapshot
 
 from .cmake_pid import get_cmake_pid
 
@@ -67,6 +77,77 @@ class RunCounter:
             self._file_path.unlink()
 
 
+class PassState:
+    """
+    Responses of the component registry kept in the build directory between runs of
+    prepare_dependencies during one CMake run.
+
+    When Kconfig options used in "if" clauses are missing, CMake runs the Component Manager
+    again. The next run gets the same component metadata without requests to the registry,
+    so only the dependencies depending on Kconfig options are evaluated differently.
+    Disabled if ``IDF_COMPONENT_CACHE_RESPONSES_BETWEEN_RUNS`` is 0.
+    """
+
+    def __init__(self, build_dir: t.Union[str, Path]):
+        self._file_path = Path(build_dir) / f'component_manager_state.{get_cmake_pid()}.json'
+        self.enabled = ComponentManagerSettings().CACHE_RESPONSES_BETWEEN_RUNS
+        self.responses: t.Optional[t.Dict[str, t.Any]] = None
+
+    def load(self) -> None:
+        """
+        Starts recording responses, with the ones saved by the previous run.
+        """
+        if not self.enabled:
+            return
+
+        self.responses = {}
+        try:
+            with self._file_path.open(encoding='utf-8') as f:
+                state = json.load(f)
+            if state['version'] == __version__:
+                self.responses = dict(state['responses'])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            debug(f'Ignoring unreadable state of the previous run {self._file_path}: {e}')
+
+        set_response_snapshot(self.responses)
+
+    def save(self) -> None:
+        if self.responses is None:
+            return
+
+        try:
+            dump_json_atomic(
+                str(self._file_path), {'version': __version__, 'responses': self.responses}
+            )
+        except OSError as e:
+            debug(f'Cannot save state for the next run {self._file_path}: {e}')
+
+    def cleanup(self) -> None:
+        """
+        Removes the state file.
+        """
+        if self._file_path.exists():
+            self._file_path.unlink()
+
+
+@contextmanager
+def manifest_cache(build_dir: t.Union[str, Path]) -> t.Generator[None, None, None]:
+    """
+    Load manifests validated by previous runs of the Component Manager from the build directory
+    and store new ones.
+    """
+    cache = ManifestCache(manifest_cache_path(build_dir))
+    cache.load()
+    set_manifest_cache(cache)
+    try:
+        yield
+    finally:
+        set_manifest_cache(None)
+        cache.save()
+
+
 def _get_ppid_file_path(local_component_list_file: t.Optional[str]) -> Path:
     return Path(f'{local_component_list_file}.{get_cmake_pid()}')
 
@@ -152,18 +233,30 @@ def prepare_dep_dirs(args):
         args.local_components_list_file, args.interface_version
     )
 
-    ComponentManager(
-        args.project_dir,
-        lock_path=args.lock_path,
-        interface_version=args.interface_version,
-    ).prepare_dep_dirs(
-        managed_components_list_file=args.managed_components_list_file,
-        component_list_file=_component_list_file(build_dir),
-        local_components_list_file=local_components_list_file,
-    )
+    pass_state = PassState(build_dir)
+    pass_state.load()
+    try:
+        with manifest_cache(build_dir):
+            ComponentManager(
+                args.project_dir,
+                lock_path=args.lock_path,
+                interface_version=args.interface_version,
+            ).prepare_dep_dirs(
+                managed_components_list_file=args.managed_components_list_file,
+                component_list_file=_component_list_file(build_dir),
+                local_components_list_file=local_components_list_file,
+            )
+    except BaseException:
+        pass_state.cleanup()
+        raise
+    finally:
+        set_response_snapshot(None)
 
     kconfig_ctx = KCONFIG_CONTEXT.get()
     if kconfig_ctx.missed_keys:
+        # The next run gets the same component metadata
+        pass_state.save()
+
         debug_strs: t.Set[str] = set()
 
         def debug_message(req: ComponentRequirement) -> str:
@@ -206,6 +299,8 @@ def prepare_dep_dirs(args):
         # Exiting with code 10 to signal CMake to re-run component discovery due to missing KConfig options
         sys.exit(10)
 
+    pass_state.cleanup()
+
     if args.interface_version == 4:
         # Clean up PPID files on successful completion
         if args.local_components_list_file:
@@ -222,15 +317,16 @@ def inject_requirements(args):
     ):
         KCONFIG_CONTEXT.get().update_from_file(sdk_config_json_path)  # type: ignore
 
-    ComponentManager(
-        args.project_dir,
-        lock_path=args.lock_path,
-        interface_version=args.interface_version,
-    ).inject_requirements(
-        component_requires_file=args.component_requires_file,
-        component_list_file=_component_list_file(args.build_dir),
-        cm_run_counter=RunCounter(args.build_dir).value,
-    )
+    with manifest_cache(args.build_dir):
+        ComponentManager(
+            args.project_dir,
+            lock_path=args.lock_path,
+            interface_version=args.interface_version,
+        ).inject_requirements(
+            component_requires_file=args.component_requires_file,
+            component_list_file=_component_list_file(args.build_dir),
+            cm_run_counter=RunCounter(args.build_dir).value,
+        )
 
     # Last run of prepare_dep_dirs was successful
     # -> Clean up CM Run counter
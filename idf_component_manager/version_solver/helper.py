@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2022-2025 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 import typing as t
+from bisect import bisect_left, bisect_right
 
 from idf_component_tools import ComponentManagerSettings, debug
 from idf_component_tools.semver import Range as SemverRange
@@ -17,7 +18,7 @@ from .mixology.union import Union
 
 def parse_constraint(spec: str) -> t.Union[Union, Range]:
     try:
-        clause = SimpleSpec(spec).clause
+        clause = SimpleSpec.intern(spec).clause
     except ValueError:  # if not semspec, expect an exact version
         constraint = parse_single_constraint(HashedComponentVersion(spec))
     else:
@@ -64,6 +65,36 @@ def parse_root_dep_conflict_constraints(failure: SolverFailure) -> t.List[Constr
     return res
 
 
+def _is_semver(version: t.Optional[HashedComponentVersion]) -> bool:
+    return version is None or version.version.is_semver
+
+
+def _constraint_key(constraint: t.Any) -> t.Optional[t.Hashable]:
+    """Hashable key of Range or Union constraint, or None if it's not supported"""
+    if constraint is None:
+        return ()
+
+    if isinstance(constraint, Union):
+        ranges = constraint.ranges
+    elif isinstance(constraint, Range):
+        if constraint.is_empty():
+            return 'empty'
+
+        ranges = [constraint]
+    else:
+        return None
+
+    return tuple(
+        (
+            None if r.min is None else str(r.min),
+            None if r.max is None else str(r.max),
+            r.include_min,
+            r.include_max,
+        )
+        for r in ranges
+    )
+
+
 class Dependency:
     def __init__(self, package: Package, spec: str) -> None:
         self.package = package
@@ -78,6 +109,14 @@ class PackageSource(BasePackageSource):
         self._packages: t.Dict[Package, t.Dict[HashedComponentVersion, t.List[Dependency]]] = {}
         self._constraints = ComponentManagerSettings().constraints
 
+        # Versions of packages allowed by the constraint file, and if they are all semver,
+        # so they are sorted in ascending order and can be searched with bisect
+        self._allowed_versions: t.Dict[Package, t.Tuple[t.List[HashedComponentVersion], bool]] = {}
+        # Results of _versions_for by package and constraint
+        self._versions_cache: t.Dict[
+            t.Tuple[Package, t.Hashable], t.List[HashedComponentVersion]
+        ] = {}
+
         super().__init__()
 
     @property
@@ -110,6 +149,11 @@ class PackageSource(BasePackageSource):
             dependencies.append(Dependency(dep_package, spec))
 
         self._packages[package][version] = dependencies
+        self._clear_versions_cache()
+
+    def _clear_versions_cache(self) -> None:
+        self._allowed_versions.clear()
+        self._versions_cache.clear()
 
     def override_dependencies(self, overriders: t.Set[str]) -> None:
         for package in list(self._packages.keys()):
@@ -124,6 +168,8 @@ class PackageSource(BasePackageSource):
                     if elem.package.source.is_overrider or elem.package.name not in overriders
                 ]
 
+        self._clear_versions_cache()
+
     def root_dep(self, package: Package, spec: str) -> None:
         if package.source:
             spec = package.source.normalize_spec(spec)
@@ -131,24 +177,21 @@ class PackageSource(BasePackageSource):
         debug(f'Adding root dependency: {repr(package)} {spec}')
         self._root_dependencies.append(Dependency(package, spec))
 
-    def _versions_for(
-        self, package: Package, constraint: t.Any = None
-    ) -> t.List[HashedComponentVersion]:
-        if package not in self._packages:
-            return []
+    def _package_versions(self, package: Package) -> t.Tuple[t.List[HashedComponentVersion], bool]:
+        """Versions of the package allowed by the constraint file.
+
+        Returns the list of versions and True if all of them are semver,
+        then the list is sorted in ascending order.
+        """
+        if package in self._allowed_versions:
+            return self._allowed_versions[package]
 
         versions = []
         for version in self._packages[package].keys():
-            version_range = Range(version, version, True, True)
-
-            # Apply the given constraint
-            if constraint and not constraint.allows_any(version_range):
-                continue
-
             # Apply constraint file constraints
             if package.name in self._constraints:
                 constraint_file_constraint = self._constraints[package.name]
-                if not constraint_file_constraint.allows_any(version_range):
+                if not constraint_file_constraint.allows_any(Range(version, version, True, True)):
                     debug(
                         f'Version {version} of {package.name} filtered by constraint file: {constraint_file_constraint}'
                     )
@@ -156,7 +199,97 @@ class PackageSource(BasePackageSource):
 
             versions.append(version)
 
-        return sorted(versions, reverse=True)
+        # Not semver versions, like commit IDs, can't be ordered
+        is_sorted = all(_is_semver(version) for version in versions)
+        if is_sorted:
+            # Reversed later, equal versions keep the original order, same as with sorted(reverse=True)
+            versions.reverse()
+            versions.sort()
+
+        self._allowed_versions[package] = (versions, is_sorted)
+        return versions, is_sorted
+
+    def _versions_for(
+        self, package: Package, constraint: t.Any = None
+    ) -> t.List[HashedComponentVersion]:
+        """Versions of the package that match the constraint, from the newest to the oldest.
+
+        Results are cached, the returned list should not be modified.
+        """
+        if package not in self._packages:
+            return []
+
+        key = _constraint_key(constraint)
+        if key is not None and (package, key) in self._versions_cache:
+            return self._versions_cache[(package, key)]
+
+        versions, is_sorted = self._package_versions(package)
+
+        if constraint is None:
+            result = versions
+        elif (
+            is_sorted
+            and key is not None
+            and all(
+                _is_semver(r.min) and _is_semver(r.max)
+                for r in (constraint.ranges if isinstance(constraint, Union) else [constraint])
+                if not r.is_empty()
+            )
+        ):
+            result = self._select_sorted(versions, constraint)
+        else:
+            result = [
+                version
+                for version in versions
+                if constraint.allows_any(Range(version, version, True, True))
+            ]
+
+        result = result[::-1] if is_sorted else sorted(result, reverse=True)
+
+        if key is not None:
+            self._versions_cache[(package, key)] = result
+
+        return result
+
+    @staticmethod
+    def _select_sorted(
+        versions: t.List[HashedComponentVersion], constraint: t.Union[Range, Union]
+    ) -> t.List[HashedComponentVersion]:
+        """Versions from the sorted list that match the constraint, in ascending order"""
+        if constraint.is_empty():
+            return []
+
+        ranges = constraint.ranges if isinstance(constraint, Union) else [constraint]
+
+        # Slices of the versions list for each range
+        slices = []
+        for r in ranges:
+            if r.min is None:
+                start = 0
+            elif r.include_min:
+                start = bisect_left(versions, r.min)
+            else:
+                start = bisect_right(versions, r.min)
+
+            if r.max is None:
+                end = len(versions)
+            elif r.include_max:
+                end = bisect_right(versions, r.max)
+            else:
+                end = bisect_left(versions, r.max)
+
+            if start < end:
+                slices.append((start, end))
+
+        result: t.List[HashedComponentVersion] = []
+        last_end = 0
+        for start, end in sorted(slices):
+            start = max(start, last_end)
+            if start < end:
+                result.extend(versions[start:end])
+                last_end = end
+
+        return result
 
     def dependencies_for(self, package: Package, version: t.Any) -> t.List[t.Any]:
         if package == self.root:
@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Metrics of the version solver, exported for profiling slow solves"""
+
+import json
+import os
+import threading
+import time
+import typing as t
+from contextlib import contextmanager
+
+from idf_component_tools import ComponentManagerSettings
+from idf_component_tools.messages import warn
+
+
+class SolverMetrics:
+    """
+    Counters and timings collected while solving dependencies.
+
+    Set ``IDF_COMPONENT_SOLVER_METRICS_FILE`` to append the metrics of every solve
+    to a file as a JSON line, and ``IDF_COMPONENT_SOLVER_TRACE_FILE`` to append
+    solve phases to a file in Chrome trace format (open it with https://ui.perfetto.dev).
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        self.decisions = 0
+        self.backtracks = 0
+        self.derived_incompatibilities = 0
+        self.propagation_iterations = 0
+        self.checked_incompatibilities = 0
+        self.largest_conflict_chain = 0
+        self.attempted_solutions = 0
+
+        self.versions_for_calls = 0
+        self.versions_for_time = 0.0
+        self.fetch_versions_calls = 0
+        self.fetch_versions_time = 0.0
+
+        self.solve_time = 0.0
+
+        self._start = time.perf_counter()
+        self.trace_events: t.Optional[t.List[t.Dict[str, t.Any]]] = [] if trace else None
+
+    @classmethod
+    def from_settings(cls) -> 'SolverMetrics':
+        return cls(trace=bool(ComponentManagerSettings().SOLVER_TRACE_FILE))
+
+    @contextmanager
+    def phase(self, name: str, **args: t.Any) -> t.Iterator[None]:
+        """Record a phase of the solve in the trace, if it's enabled"""
+        if self.trace_events is None:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.trace_events.append({
+                'name': name,
+                'cat': 'solver',
+                'ph': 'X',
+                'ts': round((start - self._start) * 1e6, 3),
+                'dur': round((time.perf_counter() - start) * 1e6, 3),
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args,
+            })
+
+    def add_conflict_chain(self, length: int) -> None:
+        self.largest_conflict_chain = max(self.largest_conflict_chain, length)
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            'solve_time': round(self.solve_time, 6),
+            'attempted_solutions': self.attempted_solutions,
+            'decisions': self.decisions,
+            'backtracks': self.backtracks,
+            'derived_incompatibilities': self.derived_incompatibilities,
+            'propagation_iterations': self.propagation_iterations,
+            'checked_incompatibilities': self.checked_incompatibilities,
+            'largest_conflict_chain': self.largest_conflict_chain,
+            'versions_for': {
+                'calls': self.versions_for_calls,
+                'time': round(self.versions_for_time, 6),
+            },
+            'fetch_versions': {
+                'calls': self.fetch_versions_calls,
+                'time': round(self.fetch_versions_time, 6),
+            },
+        }
+
+    def export(self, **info: t.Any) -> None:
+        """Append metrics and trace events to the files set in the environment"""
+        settings = ComponentManagerSettings()
+
+        if settings.SOLVER_METRICS_FILE:
+            data = dict(info, **self.to_dict())
+            try:
+                with open(settings.SOLVER_METRICS_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(data) + '\n')
+            except OSError as e:
+                warn(f'Cannot write solver metrics to {settings.SOLVER_METRICS_FILE}: {e}')
+
+        if settings.SOLVER_TRACE_FILE and self.trace_events:
+            # The closing bracket is optional in the JSON array trace format,
+            # so events of later solves can be appended to the same file
+            try:
+                with open(settings.SOLVER_TRACE_FILE, 'a', encoding='utf-8') as f:
+                    if f.tell() == 0:
+                        f.write('[\n')
+                    for event in self.trace_events:
+                        f.write(json.dumps(event) + ',\n')
+            except OSError as e:
+                warn(f'Cannot write solver trace to {settings.SOLVER_TRACE_FILE}: {e}')
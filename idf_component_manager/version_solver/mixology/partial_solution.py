@@ -52,6 +52,10 @@ class PartialSolution:
         # Whether the solver is currently backtracking.
         self._backtracking = False
 
+        # Relations of terms to the assignments of their package, cleared
+        # when the assignments of the package change.
+        self._relations: t.Dict[Package, t.Dict[Term, SetRelation]] = {}
+
     @property
     def decisions(self) -> t.Dict[Package, HashedComponentVersion]:
         return self._decisions
@@ -124,6 +128,8 @@ class PartialSolution:
 
         # Re-compute _positive and _negative for the packages that were removed.
         for package in packages:
+            self._relations.pop(package, None)
+
             if package in self._positive:
                 del self._positive[package]
 
@@ -139,6 +145,8 @@ class PartialSolution:
         Registers an Assignment in _positive or _negative.
         """
         package = assignment.package
+        self._relations.pop(package, None)
+
         old_positive = self._positive.get(package)
         if old_positive is not None:
             self._positive[package] = old_positive.intersect(assignment)
@@ -198,6 +206,14 @@ class PartialSolution:
         return self.relation(term) == SetRelation.SUBSET
 
     def relation(self, term: Term) -> SetRelation:
+        relations = self._relations.setdefault(term.package, {})
+        relation = relations.get(term)
+        if relation is None:
+            relation = relations[term] = self._relation(term)
+
+        return relation
+
+    def _relation(self, term: Term) -> SetRelation:
         positive = self._positive.get(term.package)
         if positive is not None:
             return positive.relation(term)
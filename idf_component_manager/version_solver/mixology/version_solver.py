@@ -4,6 +4,7 @@
 
 import time
 import typing as t
+from contextlib import nullcontext
 
 from idf_component_tools import debug
 
@@ -22,6 +23,45 @@ from .term import Term
 _conflict = object()
 
 
+class DecisionHeuristic:
+    """
+    Decides which package the solver chooses a version for next, and which version.
+
+    Chooses the package with the fewest versions allowed by its constraint, so that if
+    a conflict is necessary it's found quickly, and its highest version. Equal packages
+    are taken in the order they were added to the solution.
+    """
+
+    def term_priority(self, term: Term, versions: t.List[t.Any]) -> t.Any:
+        """Sort key of the term, the term with the lowest key is decided first"""
+        return len(versions)
+
+    def choose_version(self, package: Package, versions: t.List[t.Any]) -> t.Any:
+        """Version to try from the non-empty list of allowed versions, newest first"""
+        return versions[0]
+
+
+class PreferLockedHeuristic(DecisionHeuristic):
+    """
+    Between packages with the same number of allowed versions, chooses first the one
+    whose locked version is still allowed. Versions are tried newest first,
+    as with the default heuristic.
+    """
+
+    def __init__(self, locked_versions: t.Mapping[Package, str]) -> None:
+        self._locked_versions = locked_versions
+
+    def _is_locked_version_allowed(self, package: Package, versions: t.List[t.Any]) -> bool:
+        locked_version = self._locked_versions.get(package)
+        if locked_version is None:
+            return False
+
+        return any(str(version) == locked_version for version in versions)
+
+    def term_priority(self, term: Term, versions: t.List[t.Any]) -> t.Any:
+        return len(versions), not self._is_locked_version_allowed(term.package, versions)
+
+
 class VersionSolver:
     """
     The version solver that finds a set of package versions that satisfy the
@@ -34,12 +74,27 @@ class VersionSolver:
     def __init__(
         self,
         source: PackageSource,
+        metrics: t.Optional[t.Any] = None,
+        heuristic: t.Optional[DecisionHeuristic] = None,
     ):
         self._source = source
+        # Optional collector of solving statistics, for example SolverMetrics of the wrapper
+        self._metrics = metrics
+        self._heuristic = heuristic or DecisionHeuristic()
 
         self._incompatibilities: t.Dict[Package, t.List[Incompatibility]] = {}
         self._solution = PartialSolution()
 
+        # Two watched terms of each incompatibility, as in two-watched-literal SAT propagation.
+        # While both watched terms are not satisfied by _solution, the incompatibility
+        # can't derive anything and _propagate() skips it.
+        self._watches: t.Dict[Incompatibility, t.List[Term]] = {}
+        # Incompatibilities watching terms of each package, ordered to keep solving reproducible.
+        self._watchers: t.Dict[Package, t.Dict[Incompatibility, None]] = {}
+        # Incompatibilities that may have less than two unsatisfied terms,
+        # they are checked by _propagate() as usual.
+        self._unwatched: t.Set[Incompatibility] = set()
+
     @property
     def solution(self) -> PartialSolution:
         return self._solution
@@ -55,25 +110,36 @@ class VersionSolver:
         """
         start = time.time()
 
-        self._add_incompatibility(
-            Incompatibility([Term(Constraint(self._source.root, Range()), False)], RootCause())
-        )
-        self._propagate(self._source.root)
+        try:
+            self._add_incompatibility(
+                Incompatibility([Term(Constraint(self._source.root, Range()), False)], RootCause())
+            )
+            self._propagate(self._source.root)
 
-        while not self.is_solved():
-            if not self._run():
-                break
+            while not self.is_solved():
+                if not self._run():
+                    break
+        finally:
+            if self._metrics is not None:
+                self._metrics.attempted_solutions += self._solution.attempted_solutions
 
         debug('Version solving took {:.3f} seconds.\n'.format(time.time() - start))
         debug(f'Tried {self._solution.attempted_solutions} solutions.')
 
         return SolverResult(self._solution.decisions, self._solution.attempted_solutions)
 
+    def _phase(self, name: str, **args: t.Any) -> t.ContextManager[t.Any]:
+        if self._metrics is None:
+            return nullcontext()
+
+        return self._metrics.phase(name, **args)
+
     def _run(self) -> bool:
         if self.is_solved():
             return False
 
-        next_package = self._choose_package_version()
+        with self._phase('choose version'):
+            next_package = self._choose_package_version()
         self._propagate(next_package)
 
         if self.is_solved():
@@ -86,16 +152,28 @@ class VersionSolver:
         Performs unit propagation on incompatibilities transitively
         related to package to derive new assignments for _solution.
         """
+        with self._phase('propagate', package=str(package)):
+            self._propagate_changes(package)
+
+    def _propagate_changes(self, package: Package) -> None:
         changed: t.Set[Package] = set()
         changed.add(package)
 
         while changed:
             package = changed.pop()
+            if self._metrics is not None:
+                self._metrics.propagation_iterations += 1
             # Iterate in reverse because conflict resolution tends to produce more
             # general incompatibilities as time goes on. If we look at those first,
             # we can derive stronger assignments sooner and more eagerly find
             # conflicts.
             for incompatibility in reversed(self._incompatibilities[package]):
+                # Both watched terms are unsatisfied, nothing can be derived
+                if incompatibility not in self._unwatched:
+                    continue
+
+                if self._metrics is not None:
+                    self._metrics.checked_incompatibilities += 1
                 result = self._propagate_incompatibility(incompatibility)
 
                 if result is _conflict:
@@ -106,7 +184,8 @@ class VersionSolver:
                     # It also backjumps to a point in the solution
                     # where that incompatibility will allow us to derive new assignments
                     # that avoid the conflict.
-                    root_cause = self._resolve_conflict(incompatibility)
+                    with self._phase('resolve conflict'):
+                        root_cause = self._resolve_conflict(incompatibility)
 
                     # Back jumping erases all the assignments we did at the previous
                     # decision level, so we clear [changed] and refill it with the
@@ -142,11 +221,14 @@ class VersionSolver:
                 # If term is already contradicted by _solution, then
                 # incompatibility is contradicted as well and there's nothing new we
                 # can deduce from it.
+                if unsatisfied is not None:
+                    self._watch(incompatibility, [unsatisfied, term])
                 return
             elif relation == SetRelation.OVERLAPPING:
                 # If more than one term is inconclusive, we can't deduce anything about
                 # incompatibility.
                 if unsatisfied is not None:
+                    self._watch(incompatibility, [unsatisfied, term])
                     return
 
                 # If exactly one term in incompatibility is inconclusive, then it's
@@ -164,9 +246,51 @@ class VersionSolver:
         self._solution.derive(
             unsatisfied.constraint, not unsatisfied.is_positive(), incompatibility
         )
+        self._update_watches(unsatisfied.package)
 
         return unsatisfied.package
 
+    def _watch(self, incompatibility: Incompatibility, terms: t.List[Term]) -> None:
+        """
+        Makes incompatibility watch the given terms, which must be unsatisfied by _solution,
+        or marks it as unwatched if there are less than two of them.
+        """
+        for term in self._watches.pop(incompatibility, []):
+            del self._watchers[term.package][incompatibility]
+
+        if len(terms) < 2:
+            self._unwatched.add(incompatibility)
+            return
+
+        self._unwatched.discard(incompatibility)
+        self._watches[incompatibility] = terms
+        for term in terms:
+            self._watchers.setdefault(term.package, {})[incompatibility] = None
+
+    def _update_watches(self, package: Package) -> None:
+        """
+        Moves watches from terms of package satisfied by a new assignment
+        to other unsatisfied terms of the same incompatibilities.
+        """
+        for incompatibility in list(self._watchers.get(package, ())):
+            watched = self._watches[incompatibility]
+            unsatisfied = [
+                term
+                for term in watched
+                if term.package != package or not self._solution.satisfies(term)
+            ]
+            if len(unsatisfied) == len(watched):
+                continue
+
+            for term in incompatibility.terms:
+                if len(unsatisfied) == 2:
+                    break
+
+                if term not in watched and not self._solution.satisfies(term):
+                    unsatisfied.append(term)
+
+            self._watch(incompatibility, unsatisfied)
+
     def _resolve_conflict(self, incompatibility: Incompatibility) -> Incompatibility:
         """
         Given an incompatibility that's satisfied by _solution,
@@ -182,6 +306,7 @@ class VersionSolver:
         debug(f'conflict: {incompatibility}')
 
         new_incompatibility = False
+        chain = 0
         while not incompatibility.is_failure():
             # The term in incompatibility.terms that was most recently satisfied by
             # _solution.
@@ -247,6 +372,9 @@ class VersionSolver:
                 or most_recent_satisfier.cause is None
             ):
                 self._solution.backtrack(previous_satisfier_level)
+                if self._metrics is not None:
+                    self._metrics.backtracks += 1
+                    self._metrics.add_conflict_chain(chain)
                 if new_incompatibility:
                     self._add_incompatibility(incompatibility)
 
@@ -287,6 +415,9 @@ class VersionSolver:
                 new_terms, ConflictCause(incompatibility, most_recent_satisfier.cause)
             )
             new_incompatibility = True
+            chain += 1
+            if self._metrics is not None:
+                self._metrics.derived_incompatibilities += 1
 
             partially = '' if difference is None else ' partially'
             bang = '!'
@@ -298,6 +429,8 @@ class VersionSolver:
             debug(f'{bang} which is caused by "{most_recent_satisfier.cause}"')
             debug(f'{bang} thus: {incompatibility}')
 
+        if self._metrics is not None:
+            self._metrics.add_conflict_chain(chain)
         raise SolverFailure(incompatibility)
 
     def _next_term_to_try(self) -> t.Optional[Term]:
@@ -305,17 +438,25 @@ class VersionSolver:
         if not unsatisfied:
             return
 
-        # Prefer packages with as few remaining versions as possible,
-        # so that if a conflict is necessary it's forced quickly.
-        def _get_min(_term):
-            return len(self._source.versions_for(_term.package, _term.constraint.constraint))
-
         if len(unsatisfied) == 1:
-            term = unsatisfied[0]
-        else:
-            term = min(*unsatisfied, key=_get_min)
+            return unsatisfied[0]
+
+        # min() keeps the first of the terms with the same priority
+        return min(
+            unsatisfied,
+            key=lambda term: self._heuristic.term_priority(
+                term, self._versions_for(term.package, term.constraint.constraint)
+            ),
+        )
 
-        return term
+    def _versions_for(self, package: Package, constraint: t.Any) -> t.List[t.Any]:
+        start = time.perf_counter()
+        versions = self._source.versions_for(package, constraint)
+        if self._metrics is not None:
+            self._metrics.versions_for_time += time.perf_counter() - start
+            self._metrics.versions_for_calls += 1
+
+        return versions
 
     def _choose_package_version(self) -> t.Optional[Package]:
         """
@@ -329,7 +470,7 @@ class VersionSolver:
         if not term:
             return
 
-        versions = self._source.versions_for(term.package, term.constraint.constraint)
+        versions = self._versions_for(term.package, term.constraint.constraint)
         if not versions:
             # If there are no versions that satisfy the constraint,
             # add an incompatibility that indicates that.
@@ -337,7 +478,7 @@ class VersionSolver:
 
             return term.package
 
-        version = versions[0]
+        version = self._heuristic.choose_version(term.package, versions)
         conflict = False
         for incompatibility in self._source.incompatibilities_for(term.package, version):
             self._add_incompatibility(incompatibility)
@@ -354,6 +495,9 @@ class VersionSolver:
 
         if not conflict:
             self._solution.decide(term.package, version)
+            if self._metrics is not None:
+                self._metrics.decisions += 1
+            self._update_watches(term.package)
             debug(f'selecting {term.package} ({str(version)})')
 
         return term.package
@@ -369,3 +513,9 @@ class VersionSolver:
                 continue
 
             self._incompatibilities[term.package].append(incompatibility)
+
+        if incompatibility not in self._watches and incompatibility not in self._unwatched:
+            unsatisfied = [
+                term for term in incompatibility.terms if not self._solution.satisfies(term)
+            ]
+            self._watch(incompatibility, unsatisfied[:2])
@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Rate-limited check for new versions of locked components"""
+
+import json
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
+import typing as t
+
+from idf_component_tools import ComponentManagerSettings
+from idf_component_tools.debugger import KCONFIG_CONTEXT
+from idf_component_tools.file_cache import FileCache
+from idf_component_tools.hash_tools.calculate import hash_object
+from idf_component_tools.logging import suppress_logging
+from idf_component_tools.manager import ManifestManager
+from idf_component_tools.manifest import SolvedManifest
+from idf_component_tools.messages import debug, notice
+from idf_component_tools.metadata_cache import dump_json_atomic
+from idf_component_tools.registry.client_errors import NetworkConnectionError
+from idf_component_tools.utils import ProjectRequirements
+
+from .mixology.failure import SolverFailure
+from .version_solver import VersionSolver
+
+NEW_VERSIONS_CACHE_DIR = 'new_versions'
+
+
+def solve_new_versions(project_requirements: ProjectRequirements) -> t.Dict[str, str]:
+    """Solve dependencies without the lock file and return versions of components"""
+    solution = VersionSolver(project_requirements).solve()
+    return {dep.name: str(dep.version) for dep in solution.dependencies}
+
+
+def notify_new_versions(old_solution: SolvedManifest, new_versions: t.Dict[str, str]) -> None:
+    updateable_components_messages = []
+
+    for old_dep in old_solution.dependencies:
+        # Check if the old dependency is present in the new solution
+        new_version = new_versions.get(old_dep.name)
+        if new_version is None:
+            continue
+
+        # Check if the version of the old dependency is different from the new one
+        if str(old_dep.version) != new_version:
+            updateable_components_messages.append(
+                'Dependency "{}": "{}" -> "{}"'.format(old_dep.name, old_dep.version, new_version)
+            )
+
+    if updateable_components_messages:
+        messages_concat = '\n'.join(updateable_components_messages)
+        notice(
+            '\nFollowing dependencies have new versions available:\n'
+            f'{messages_concat}'
+            '\nConsider running "idf.py update-dependencies" to update your lock file.'
+        )
+
+
+class NewVersionsCheck:
+    """
+    Check for new versions of components, at most once per
+    ``IDF_COMPONENT_CHECK_NEW_VERSION_INTERVAL`` seconds for a project.
+
+    The check runs in a detached process, so it doesn't slow down the build. Its result is
+    stored in the cache directory and shown on the next run. If the interval is 0, the check
+    runs on every run before the components are downloaded.
+    """
+
+    def __init__(self, lock_path: str, path: t.Optional[str] = None) -> None:
+        self.interval = ComponentManagerSettings().CHECK_NEW_VERSION_INTERVAL
+        self.background = self.interval > 0
+        self._lock_path = os.path.abspath(lock_path)
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(FileCache().path(), NEW_VERSIONS_CACHE_DIR)
+
+        return self._path
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.path, f'{hash_object(self._lock_path)}.json')
+
+    def load_state(self) -> t.Optional[t.Dict[str, t.Any]]:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            float(state['checked_at'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            debug('Ignoring unreadable new versions check state %s: %s', self.state_path, e)
+            return None
+
+        return state
+
+    def run(self, project_requirements: ProjectRequirements, old_solution: SolvedManifest) -> None:
+        if not self.background:
+            try:
+                notify_new_versions(old_solution, solve_new_versions(project_requirements))
+            except (SolverFailure, NetworkConnectionError):
+                pass
+            return
+
+        state = self.load_state()
+        up_to_date = (
+            state is not None
+            and state.get('manifest_hash') == project_requirements.manifest_hash
+            and state.get('target') == project_requirements.target
+        )
+        # The background check may have failed, in that case there are no versions to show
+        if up_to_date and state and isinstance(state.get('versions'), dict):
+            notify_new_versions(old_solution, state['versions'])
+
+        if up_to_date and state and time.time() - state['checked_at'] < self.interval:
+            return
+
+        self.start(project_requirements)
+
+    def start(self, project_requirements: ProjectRequirements) -> None:
+        """Start the check in a detached process"""
+        manifests = []
+        for manifest in project_requirements.manifests:
+            if manifest.manifest_manager is None:
+                debug('Skipping the check for new versions, manifests are not loaded from files')
+                return
+
+            manifests.append({
+                'path': str(manifest.manifest_manager.path),
+                'name': manifest.manifest_manager.name,
+            })
+
+        state = {
+            'checked_at': time.time(),
+            'manifest_hash': project_requirements.manifest_hash,
+            'target': project_requirements.target,
+            'versions': None,
+        }
+        request = {
+            'manifests': manifests,
+            'sdkconfig': KCONFIG_CONTEXT.get().sdkconfig,
+            'state_path': self.state_path,
+            'state': state,
+        }
+
+        try:
+            # Record the start, so concurrent builds don't start the check again
+            dump_json_atomic(self.state_path, state)
+            fd, request_path = tempfile.mkstemp(dir=self.path, suffix='.request')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(request, f)
+
+            kwargs: t.Dict[str, t.Any] = {}
+            if sys.platform == 'win32':
+                kwargs['creationflags'] = getattr(subprocess, 'DETACHED_PROCESS', 0) | getattr(
+                    subprocess, 'CREATE_NEW_PROCESS_GROUP', 0
+                )
+            else:
+                kwargs['start_new_session'] = True
+
+            subprocess.Popen(  # noqa: S603
+                [sys.executable, '-m', __name__, request_path],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+                **kwargs,
+            )
+        except OSError as e:
+            debug('Cannot start the check for new versions: %s', e)
+
+
+def run_request(request_path: str) -> None:
+    """Run the check started by ``NewVersionsCheck.start``"""
+    with open(request_path, encoding='utf-8') as f:
+        request = json.load(f)
+    os.unlink(request_path)
+
+    KCONFIG_CONTEXT.get().sdkconfig.update(request['sdkconfig'])
+    project_requirements = ProjectRequirements([
+        ManifestManager(manifest['path'], manifest['name']).load()
+        for manifest in request['manifests']
+    ])
+
+    state = request['state']
+    state['versions'] = solve_new_versions(project_requirements)
+    dump_json_atomic(request['state_path'], state)
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    with suppress_logging():
+        try:
+            run_request(args[0])
+        except Exception:  # noqa: S110
+            # Nothing to report to, the next check will run after the interval
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Solutions of the version solver, reused while the registry returns the same metadata"""
+
+import json
+import os
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from pydantic import ValidationError
+
+from idf_component_tools import ComponentManagerSettings
+from idf_component_tools.__version__ import __version__
+from idf_component_tools.build_system_tools import get_idf_version
+from idf_component_tools.debugger import KCONFIG_CONTEXT
+from idf_component_tools.errors import FetchingError, SourceError
+from idf_component_tools.file_cache import FileCache
+from idf_component_tools.hash_tools.calculate import hash_object
+from idf_component_tools.manifest import SolvedManifest
+from idf_component_tools.messages import debug
+from idf_component_tools.metadata_cache import dump_json_atomic
+from idf_component_tools.registry.client_errors import APIClientError
+from idf_component_tools.sources import IDFSource, Source
+from idf_component_tools.utils import ComponentWithVersions, ProjectRequirements
+
+if t.TYPE_CHECKING:
+    from .version_solver import VersionSolver
+
+SOLUTIONS_CACHE_DIR = 'solutions'
+
+
+def versions_fingerprint(cmp_with_versions: t.Optional[ComponentWithVersions]) -> str:
+    """Hash of the versions returned by a component source"""
+    if cmp_with_versions is None:
+        return hash_object(None)
+
+    return hash_object([
+        [
+            str(version),
+            version.component_hash,
+            sorted(version.targets or []),
+            # Versions from local directories have no hash covering their dependencies
+            None
+            if version.component_hash
+            else [dependency.serialize() for dependency in version.dependencies],
+        ]
+        for version in cmp_with_versions.versions
+    ])
+
+
+class SolutionCache:
+    """
+    Solutions of the version solver stored in the cache directory.
+
+    Solutions are stored by the hash of the solver input: manifests, target, ESP-IDF version,
+    constraints, sdkconfig values and the current lock file. A stored solution is used only
+    if component sources still return the same versions for every request made by the solver.
+    To check it, all these requests are made again (in parallel), so a stored solution saves
+    the solving time, but not the requests to the registry.
+
+    Local components are stored with absolute paths, so only solutions with components
+    from the registry can be shared between machines. The cache is disabled if
+    ``IDF_COMPONENT_SOLUTION_CACHE`` is 0 or HTTP requests caching is disabled.
+    """
+
+    def __init__(self, path: t.Optional[str] = None) -> None:
+        settings = ComponentManagerSettings()
+        self.enabled = settings.SOLUTION_CACHE and settings.CACHE_HTTP_REQUESTS
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(FileCache().path(), SOLUTIONS_CACHE_DIR)
+
+        return self._path
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.json')
+
+    @staticmethod
+    def key(requirements: ProjectRequirements, old_solution: SolvedManifest) -> str:
+        """Hash of the solver input, should be calculated before solving"""
+        return hash_object({
+            'version': __version__,
+            'manifest_hash': requirements.manifest_hash,
+            'target': requirements.target,
+            'idf_version': get_idf_version(),
+            'constraints': {
+                name: str(constraint)
+                for name, constraint in ComponentManagerSettings().constraints.items()
+            },
+            'sdkconfig': KCONFIG_CONTEXT.get().sdkconfig,
+            'locked': [
+                [component.name, str(component.version), component.component_hash]
+                for component in old_solution.dependencies
+            ],
+        })
+
+    def get(self, key: str) -> t.Optional[SolvedManifest]:
+        """
+        Return the stored solution if the metadata of components hasn't changed.
+        Requests all component versions used by the stored solution from their sources.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with open(self._entry_path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+
+            fetches = entry['fetches']
+            solution = SolvedManifest.fromdict(entry['solution'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            debug('Ignoring unreadable solution cache entry %s: %s', key, e)
+            return None
+
+        if not self._is_metadata_unchanged(fetches):
+            return None
+
+        return solution
+
+    def _is_metadata_unchanged(self, fetches: t.List[t.Dict[str, t.Any]]) -> bool:
+        def fingerprint(fetch: t.Dict[str, t.Any]) -> str:
+            source = Source.from_dict(fetch['source'])
+            return versions_fingerprint(
+                source.versions(fetch['name'], spec=fetch['spec'], target=fetch['target'])
+            )
+
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+            futures = [executor.submit(copy_context().run, fingerprint, fetch) for fetch in fetches]
+
+            try:
+                for fetch, future in zip(fetches, futures):
+                    if future.result() != fetch['fingerprint']:
+                        debug(
+                            'Versions of "%s" changed, not using the cached solution', fetch['name']
+                        )
+                        return False
+            except (APIClientError, FetchingError, SourceError, ValidationError, KeyError) as e:
+                debug('Cannot check the cached solution: %s', e)
+                return False
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return True
+
+    def add(self, key: str, solver: 'VersionSolver', solution: SolvedManifest) -> None:
+        """Store the solution with the requests to component sources made by the solver"""
+        if not self.enabled:
+            return
+
+        # The same request may be made several times while solving, it's checked once
+        fetches: t.Dict[str, t.Dict[str, t.Any]] = {}
+        for source, name, spec, target, cmp_with_versions in solver.fetched_versions:
+            # The ESP-IDF version is a part of the key
+            if isinstance(source, IDFSource):
+                continue
+
+            fetch = {'source': source.model_dump(), 'name': name, 'spec': spec, 'target': target}
+            fetches.setdefault(
+                hash_object(fetch),
+                {**fetch, 'fingerprint': versions_fingerprint(cmp_with_versions)},
+            )
+
+        # The solution depends on sdkconfig options that are not known yet
+        if KCONFIG_CONTEXT.get().missed_keys:
+            return
+
+        try:
+            dump_json_atomic(
+                self._entry_path(key),
+                {'fetches': list(fetches.values()), 'solution': solution.model_dump()},
+            )
+        except OSError as e:
+            debug('Cannot write solution cache %s: %s', self.path, e)
@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Lock files of several targets, to switch the target without solving dependencies again"""
+
+import os
+import typing as t
+from contextlib import contextmanager
+
+from idf_component_tools import ComponentManagerSettings
+from idf_component_tools.debugger import KCONFIG_CONTEXT, SdkconfigContext
+from idf_component_tools.errors import FetchingError, LockError, SolverError
+from idf_component_tools.lock import LockManager
+from idf_component_tools.manifest import Manifest, SolvedManifest
+from idf_component_tools.messages import debug, notice, warn
+from idf_component_tools.registry.client_errors import APIClientError
+from idf_component_tools.utils import ProjectRequirements
+
+from .mixology.failure import SolverFailure
+from .version_solver import VersionSolver
+
+
+def target_lock_path(lock_path: str, target: str) -> str:
+    """Path of the lock file of the target, like ``dependencies.lock.esp32s3``"""
+    return f'{lock_path}.{target}'
+
+
+@contextmanager
+def idf_target(target: str) -> t.Generator[None, None, None]:
+    """Set ``IDF_TARGET``, used by the version solver and in manifest conditions"""
+    old_target = os.environ.get('IDF_TARGET')
+    os.environ['IDF_TARGET'] = target
+    try:
+        yield
+    finally:
+        if old_target is None:
+            del os.environ['IDF_TARGET']
+        else:
+            os.environ['IDF_TARGET'] = old_target
+
+
+def uses_kconfig(project_requirements: ProjectRequirements, solution: SolvedManifest) -> bool:
+    """Whether dependencies of the project depend on sdkconfig options"""
+    for manifest in project_requirements.manifests:
+        for requirement in manifest.raw_requirements:
+            if requirement.optional_requirement.has_kconfig_option:
+                return True
+
+    for component in solution.dependencies:
+        for dependency in component.dependencies or []:
+            if dependency.optional_requirement.has_kconfig_option:
+                return True
+
+    return False
+
+
+class TargetLocks:
+    """
+    Lock files of the targets listed in ``IDF_COMPONENT_LOCK_TARGETS``, stored next to
+    the project lock file with the target as a suffix.
+
+    After dependencies are solved for the current target, they are solved for the other
+    listed targets in the same run. These solves reuse the registry responses and prefer
+    the versions of the current solution. When the target is changed, the lock file of the
+    new target is used instead of solving dependencies again.
+
+    Dependencies depending on sdkconfig options are solved only for the current target,
+    as sdkconfig values of other targets are not known.
+    """
+
+    def __init__(self, lock_path: str) -> None:
+        settings = ComponentManagerSettings()
+        self.targets = [
+            target.strip() for target in (settings.LOCK_TARGETS or '').split(';') if target.strip()
+        ]
+        self._lock_path = lock_path
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.targets)
+
+    def path(self, target: str) -> str:
+        return target_lock_path(self._lock_path, target)
+
+    def _load(self, target: str) -> t.Optional[SolvedManifest]:
+        lock_manager = LockManager(self.path(target))
+        if not lock_manager.exists():
+            return None
+
+        try:
+            return lock_manager.load()
+        except LockError as e:
+            debug('Ignoring lock file of target "%s": %s', target, e)
+            return None
+
+    @staticmethod
+    def _is_up_to_date(
+        solution: t.Optional[SolvedManifest],
+        project_requirements: ProjectRequirements,
+        target: str,
+    ) -> bool:
+        return (
+            solution is not None
+            and solution.manifest_hash == project_requirements.manifest_hash
+            and solution.target == target
+        )
+
+    def load(self, project_requirements: ProjectRequirements) -> t.Optional[SolvedManifest]:
+        """Return the lock of the current target, if it was solved for the current manifests"""
+        target = project_requirements.target
+        if target not in self.targets:
+            return None
+
+        solution = self._load(target)
+        if solution is None or not self._is_up_to_date(solution, project_requirements, target):
+            return None
+
+        if uses_kconfig(project_requirements, solution):
+            return None
+
+        return solution
+
+    def update(
+        self, project_requirements: ProjectRequirements, solution: SolvedManifest, solved: bool
+    ) -> None:
+        """
+        Store the solution of the current target and solve dependencies for other targets.
+        Lock files of other targets are updated if the manifests have changed, or
+        if dependencies were solved again for the current target.
+        """
+        if not self.enabled:
+            return
+
+        current_target = project_requirements.target
+        if current_target in self.targets:
+            LockManager(self.path(current_target)).dump(solution)
+
+        if uses_kconfig(project_requirements, solution):
+            debug('Dependencies use sdkconfig options, not solving them for other targets')
+            return
+
+        for target in self.targets:
+            if target == current_target:
+                continue
+
+            if not solved and self._is_up_to_date(self._load(target), project_requirements, target):
+                continue
+
+            notice(f'Solving dependencies for target "{target}"')
+            with idf_target(target):
+                target_solution = self._solve(project_requirements.manifests, target, solution)
+                if target_solution is not None:
+                    LockManager(self.path(target)).dump(target_solution)
+
+    @staticmethod
+    def _solve(
+        manifests: t.List[Manifest], target: str, solution: SolvedManifest
+    ) -> t.Optional[SolvedManifest]:
+        for manifest in manifests:
+            if manifest.targets and target not in manifest.targets:
+                debug(
+                    'Component "%s" is not compatible with target "%s"', manifest.real_name, target
+                )
+                return None
+
+        # Prefer versions of the current solution, if they are available for the target
+        old_solution = solution.model_copy(deep=True)
+        old_solution.target = target
+
+        token = KCONFIG_CONTEXT.set(SdkconfigContext())
+        try:
+            target_solution = VersionSolver(
+                ProjectRequirements(manifests), old_solution=old_solution
+            ).solve()
+
+            if KCONFIG_CONTEXT.get().missed_keys:
+                debug('Dependencies for target "%s" depend on sdkconfig options', target)
+                return None
+        except (SolverFailure, SolverError, FetchingError, APIClientError) as e:
+            warn(f'Cannot solve dependencies for target "{target}": {e}')
+            return None
+        finally:
+            KCONFIG_CONTEXT.reset(token)
+
+        return target_solution
@@ -2,10 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import time
 import typing as t
-from collections import defaultdict
 from contextlib import contextmanager
-from copy import deepcopy
+from types import MappingProxyType
 
 from idf_component_tools import debug, notice
 from idf_component_tools.debugger import DEBUG_INFO_COLLECTOR, KCONFIG_CONTEXT
@@ -16,16 +16,19 @@ from idf_component_tools.manifest import (
     SolvedComponent,
     SolvedManifest,
 )
-from idf_component_tools.sources import LocalSource
+from idf_component_tools.sources import BaseSource, LocalSource
 from idf_component_tools.utils import (
+    ComponentWithVersions,
     OverrideRule,
     ProjectRequirements,
     canonical_component_name,
 )
 
 from .helper import PackageSource
+from .metrics import SolverMetrics
 from .mixology.failure import SolverFailure
 from .mixology.package import Package
+from .mixology.version_solver import DecisionHeuristic, PreferLockedHeuristic
 from .mixology.version_solver import VersionSolver as Solver
 
 
@@ -50,6 +53,7 @@ class VersionSolver:
                     self.old_solution.dependencies.remove(d)
 
         self.component_solved_callback = component_solved_callback
+        self.metrics = SolverMetrics.from_settings()
 
         self._init()
 
@@ -57,7 +61,9 @@ class VersionSolver:
         # put all the intermediate generated attrs here
         # to reset them when the solver is reused
         self._source = PackageSource()
-        self._solver = Solver(self._source)
+        self._solver = Solver(
+            self._source, metrics=self.metrics, heuristic=self._decision_heuristic()
+        )
         self._target = None
         self._overriders: t.Set[str] = set()
         self._used_override_rules: t.Set[str] = set()
@@ -67,11 +73,31 @@ class VersionSolver:
         self._parse_local_root_requirements()
 
         self._solved_requirements: t.Set[ComponentRequirement] = set()
+        # requests to component sources made while solving, to check if the solution is outdated
+        self.fetched_versions: t.List[
+            t.Tuple[
+                BaseSource, str, t.Optional[str], t.Optional[str], t.Optional[ComponentWithVersions]
+            ]
+        ] = []
+        # read-only lookup of the components of the current solution, built once per solve
+        self._cur_solution: t.Optional[SolvedManifest] = None
+        self._cur_solved_components: t.Mapping[str, SolvedComponent] = MappingProxyType({})
         self._candidate_missed_kconfigs: t.Dict[
             t.Tuple[Package, str, t.Optional[str]],
             t.Dict[str, t.Set[ComponentRequirement]],
         ] = {}
 
+    def _decision_heuristic(self) -> DecisionHeuristic:
+        # between equal packages, decide the ones whose locked version is still allowed first,
+        # versions are still tried newest first
+        if not self.old_solution or not self.old_solution.dependencies:
+            return DecisionHeuristic()
+
+        return PreferLockedHeuristic({
+            Package(component.name, component.source): str(component.version)
+            for component in self.old_solution.dependencies
+        })
+
     def _parse_local_root_requirements(self) -> None:
         # scan all LocalSource dependencies and add all local components to _local_root_requirements
         # This ensures that when we process dependencies in the second pass,
@@ -251,6 +277,23 @@ class VersionSolver:
         """
         Solve the version requirements and return the result.
         """
+        start = time.perf_counter()
+        solution = None
+        try:
+            with self.metrics.phase('solve'):
+                solution = self._solve_with_current_solution()
+
+            return solution
+        finally:
+            self.metrics.solve_time += time.perf_counter() - start
+            if solution is None:
+                self.metrics.export(solved=False)
+            else:
+                self.metrics.export(
+                    solved=True, manifest_hash=solution.manifest_hash, target=solution.target
+                )
+
+    def _solve_with_current_solution(self) -> SolvedManifest:
         if self.old_solution != SolvedManifest():
             try:
                 return self._solve(cur_solution=self.old_solution)
@@ -302,26 +345,17 @@ class VersionSolver:
         if requirement in self._solved_requirements:
             return
 
-        solved_components = deepcopy(cur_solution.solved_components) if cur_solution else {}
-        # drop the current solution if the source is different from the current one
-        if cur_solution and requirement.name in solved_components:
-            if solved_components[requirement.name].source != requirement.source:
-                solved_components.pop(requirement.name)
-
-        if cur_solution and requirement.name in solved_components:
+        locked_component = self._locked_component(requirement, cur_solution)
+        if cur_solution and locked_component is not None:
             # need to get again to get all info from the SolvedComponent
             # version 1.0 lock file does not include all the info
             # like `dependencies`, and `targets`
-            cmp_with_versions = requirement.source.versions(
-                name=requirement.name,
-                spec=solved_components[requirement.name].version,
-                target=cur_solution.target,
+            cmp_with_versions = self._fetch_versions(
+                requirement, spec=locked_component.version, target=cur_solution.target
             )
         else:
-            cmp_with_versions = requirement.source.versions(
-                name=requirement.name,
-                spec=requirement.version_spec,
-                target=self.requirements.target,
+            cmp_with_versions = self._fetch_versions(
+                requirement, spec=requirement.version_spec, target=self.requirements.target
             )
 
         self._solved_requirements.add(requirement)
@@ -355,6 +389,47 @@ class VersionSolver:
         if self.component_solved_callback:
             self.component_solved_callback()
 
+    def _fetch_versions(
+        self, requirement: ComponentRequirement, spec: t.Any, target: t.Optional[str]
+    ) -> t.Optional[ComponentWithVersions]:
+        start = time.perf_counter()
+        with self.metrics.phase('fetch versions', component=requirement.name, spec=str(spec)):
+            cmp_with_versions = requirement.source.versions(
+                name=requirement.name, spec=spec, target=target
+            )
+
+        self.metrics.fetch_versions_time += time.perf_counter() - start
+        self.metrics.fetch_versions_calls += 1
+        self.fetched_versions.append((
+            requirement.source,
+            requirement.name,
+            None if spec is None else str(spec),
+            target,
+            cmp_with_versions,
+        ))
+        return cmp_with_versions
+
+    def _locked_component(
+        self, requirement: ComponentRequirement, cur_solution: t.Optional[SolvedManifest]
+    ) -> t.Optional[SolvedComponent]:
+        """
+        Return the component of the current solution for the requirement,
+        or None if it's not there or comes from a different source.
+        """
+        if not cur_solution:
+            return None
+
+        if cur_solution is not self._cur_solution:
+            self._cur_solution = cur_solution
+            self._cur_solved_components = MappingProxyType(cur_solution.solved_components)
+
+        component = self._cur_solved_components.get(requirement.name)
+        # drop the current solution if the source is different from the current one
+        if component is None or component.source != requirement.source:
+            return None
+
+        return component
+
     @staticmethod
     def _candidate_key(package: Package, version: t.Any) -> t.Tuple[Package, str, t.Optional[str]]:
         return package, str(version), getattr(version, 'component_hash', None)
@@ -366,21 +441,12 @@ class VersionSolver:
         version: t.Any,
     ) -> t.Generator[None, None, None]:
         kconfig_ctx = KCONFIG_CONTEXT.get()
-        missed_keys = kconfig_ctx.missed_keys
-        previous_missed_keys = defaultdict(
-            set, {key: set(reqs) for key, reqs in missed_keys.items()}
-        )
+        checkpoint = kconfig_ctx.checkpoint()
 
         try:
             yield
         finally:
-            new_missed_keys = {
-                key: set(reqs) - previous_missed_keys.get(key, set())
-                for key, reqs in missed_keys.items()
-                if set(reqs) - previous_missed_keys.get(key, set())
-            }
-            missed_keys.clear()
-            missed_keys.update(previous_missed_keys)
+            new_missed_keys = kconfig_ctx.rollback(checkpoint)
 
             if new_missed_keys:
                 candidate_missed_keys = self._candidate_missed_kconfigs.setdefault(
@@ -399,7 +465,8 @@ class VersionSolver:
                 self._candidate_key(package, version), {}
             )
             for key, reqs in missed_keys.items():
-                kconfig_ctx.missed_keys[key].update(reqs)
+                for req in reqs:
+                    kconfig_ctx.set_missed_kconfig(key, req)
 
     def _dependencies_with_local_precedence(
         self,
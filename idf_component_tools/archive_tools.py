@@ -2,20 +2,44 @@
 # SPDX-License-Identifier: Apache-2.0
 """Set of tools to work with archives"""
 
+import io
+import os
 import re
+import shutil
+import struct
 import tarfile
+import tempfile
+import time
 import typing as t
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from hashlib import sha256
 from pathlib import Path
 from shutil import get_archive_formats
 
 from .errors import FatalError
 from .file_tools import prepare_empty_directory
+from .hash_tools.constants import BLOCK_SIZE
+
+if t.TYPE_CHECKING:
+    from .hash_tools.checksums import ChecksumsModel, FileField
 
 
 class ArchiveError(FatalError):
     pass
 
 
+class ArchiveVerificationError(ArchiveError):
+    pass
+
+
+class ArchiveUnverifiableError(ArchiveVerificationError):
+    """The archive has entries that can't be checked against the expected checksums"""
+
+
 KNOWN_MIME_TYPES = [
     'application/x-tar',
     'application/x-gtar',
@@ -23,19 +47,29 @@ KNOWN_MIME_TYPES = [
     'application/gzip',
     'application/tar+gzip',
     'application/octet-stream',
+    'application/zstd',
 ]
 
 KNOWN_ARCHIVE_EXTENSIONS = [
     'tar.bz2',
     'tar.gz',
     'tar.xz',
+    'tar.zst',
     'tar',
     'tbz2',
     'tgz',
     'txz',
+    'tzst',
     'zip',
 ]
 
+# Same as used by tarfile for tar+gzip archives
+GZIP_COMPRESS_LEVEL = 9
+# Size of blocks compressed independently, same as the default of pigz
+GZIP_BLOCK_SIZE = 128 * 1024
+# Size of the deflate window, the end of the previous block is used as a dictionary
+GZIP_DICTIONARY_SIZE = 32 * 1024
+
 
 def get_archive_extension(filename: str) -> t.Optional[str]:
     """Get archive extension from filename.
@@ -60,6 +94,8 @@ def get_format_from_path(path):
         return ('bztar', 'tbz2', unpack_tar)
     elif re.search(r'(\.tar\.xz$)|(\.txz$)', path):
         return ('xztar', 'txz', unpack_tar)
+    elif re.search(r'(\.tar\.zst$)|(\.tzst$)', path):
+        return ('zstdtar', 'tzst', unpack_tar_zst)
     elif path.endswith('.tar'):
         return ('tar', 'tar', unpack_tar)
     else:
@@ -67,6 +103,9 @@ def get_format_from_path(path):
 
 
 def is_known_format(fmt):
+    if fmt == 'zstdtar':
+        return _zstd_module() is not None
+
     for known_format in get_archive_formats():
         if fmt == known_format[0]:
             return True
@@ -88,6 +127,22 @@ def unpack_tar(file, destination_directory):
         tar.close()
 
 
+def unpack_tar_zst(file, destination_directory):
+    """Unpack .(tar.|t)zst file"""
+    try:
+        fileobj = _open_zstd(file, 'rb')
+        tar = tarfile.open(fileobj=fileobj, mode='r|')
+        prepare_empty_directory(destination_directory)
+    except (tarfile.TarError, OSError):
+        raise ArchiveError(f'{file} is not a valid tar+zstd archive')
+
+    try:
+        tar.extractall(destination_directory)  # noqa: S202
+    finally:
+        tar.close()
+        fileobj.close()
+
+
 def unpack_zip(file, destination_directory):
     """Unpack zip file"""
     import zipfile
@@ -102,18 +157,553 @@ def unpack_zip(file, destination_directory):
             archive.extract(item, destination_directory)
 
 
-def unpack_archive(file: t.Union[str, Path], destination_directory: str) -> None:
-    prepare_empty_directory(destination_directory)
-    archive_format, ext, handler = get_format_from_path(file)
+def unpack_archive(
+    file: t.Union[str, Path],
+    destination_directory: str,
+    expected_checksums: t.Optional['ChecksumsModel'] = None,
+) -> None:
+    """Unpack archive to the destination directory.
+
+    :param expected_checksums: If set, every file is checked against its size and hash
+        while it's unpacked, see ``unpack_verified``.
+    """
+    archive_format, ext, handler = get_format_from_path(str(file))
     if not is_known_format(archive_format):
         raise ArchiveError(f'.{ext} files are not supported on your system')
+
+    if expected_checksums is not None:
+        unpack_verified(file, destination_directory, expected_checksums)
+        return
+
+    prepare_empty_directory(destination_directory)
     handler(file, destination_directory)
 
 
-def pack_archive(source_dir: t.Union[str, Path], archive_filepath: str) -> None:
-    """Create tar+gzip archive"""
+def _archive_entry_path(name: str) -> str:
+    """Normalized relative POSIX path of the archive entry, empty for the root of the archive"""
+    path = name.replace('\\', '/')
+    if path.startswith('/') or re.match(r'^[A-Za-z]:', path):
+        raise ArchiveVerificationError(f'Absolute path "{name}" in the archive')
+
+    parts = [part for part in path.split('/') if part not in ('', '.')]
+    if '..' in parts:
+        raise ArchiveVerificationError(f'Path "{name}" in the archive points outside of it')
+
+    return '/'.join(parts)
+
+
+def _iter_archive_entries(
+    file: t.Union[str, Path],
+) -> t.Iterator[t.Tuple[str, str, int, int, str, t.Callable[[], t.IO[bytes]]]]:
+    """Iterate over entries of the archive in the order they are stored.
+
+    Yields tuples of the entry name, type ('file', 'dir', 'symlink' or 'other'), size,
+    permission bits, target of the symlink and a function that opens the content of the file.
+    """
+    archive_format, _, _ = get_format_from_path(str(file))
+
+    if archive_format == 'zip':
+        import zipfile
+
+        if not zipfile.is_zipfile(file):
+            raise ArchiveError(f'{file} is not a zip file')
+
+        with zipfile.ZipFile(file) as archive:
+            for info in archive.infolist():
+                kind = 'dir' if info.is_dir() else 'file'
+                mode = (info.external_attr >> 16) & 0o777 or 0o644
+                yield (
+                    info.filename,
+                    kind,
+                    info.file_size,
+                    mode,
+                    '',
+                    partial(archive.open, info),
+                )
+        return
+
+    if archive_format == 'zstdtar':
+        fileobj = _open_zstd(file, 'rb')
+    else:
+        fileobj = open(file, 'rb')
+
+    try:
+        # Stream mode, so the archive is read only once
+        with tarfile.open(fileobj=fileobj, mode='r|*') as tar:
+            for member in tar:
+                if member.isdir():
+                    kind = 'dir'
+                elif member.isfile():
+                    kind = 'file'
+                elif member.issym():
+                    kind = 'symlink'
+                else:
+                    kind = 'other'
+                yield (
+                    member.name,
+                    kind,
+                    member.size,
+                    member.mode,
+                    member.linkname,
+                    partial(tar.extractfile, member),  # type: ignore
+                )
+    except tarfile.TarError:
+        raise ArchiveError(f'{file} is not a valid tar archive')
+    finally:
+        fileobj.close()
+
+
+def _check_file(
+    stream: t.IO[bytes],
+    path: str,
+    expected: 'FileField',
+    destination: t.Optional[t.IO[bytes]] = None,
+) -> None:
+    """Check the size and hash of the file content, copying it to the destination if set"""
+    sha = sha256()
+    read = 0
+    while True:
+        block = stream.read(BLOCK_SIZE)
+        if not block:
+            break
+
+        read += len(block)
+        if read > expected.size:
+            raise ArchiveVerificationError(
+                f'File "{path}" is larger than expected {expected.size} bytes'
+            )
+
+        sha.update(block)
+        if destination is not None:
+            destination.write(block)
+
+    if read != expected.size or sha.hexdigest() != expected.hash:
+        raise ArchiveVerificationError(
+            f'Hash of the file "{path}" does not match expected hash "{expected.hash}"'
+        )
+
+
+def _is_inside(path: str, directory: str) -> bool:
+    return os.path.commonpath([path, directory]) == directory
+
+
+def _replace_directory(source: str, destination: str) -> None:
+    if os.path.isdir(destination) and not os.path.islink(destination):
+        shutil.rmtree(destination)
+    elif os.path.lexists(destination):
+        os.unlink(destination)
+
+    os.replace(source, destination)
+
+
+def unpack_verified(
+    file: t.Union[str, Path],
+    destination_directory: t.Union[str, Path],
+    expected_checksums: 'ChecksumsModel',
+) -> None:
+    """Unpack archive checking every file against the expected checksums.
+
+    The archive is read once, the size and SHA256 hash of each file are checked
+    while it's written. Files are unpacked to a temporary directory next to the destination,
+    which replaces the destination only if all files are valid,
+    so the destination is not touched if the archive is corrupted.
+
+    Symlinks are created after all files, they must point to a path inside of the archive.
+    Expected files reached through symlinks are checked by reading them.
+
+    :param file: Path to the archive
+    :param destination_directory: Directory to unpack the archive to
+    :param expected_checksums: Expected size and hash of every file in the archive
+    :raises ArchiveUnverifiableError: If the archive has files that are not expected
+        or entries that are not files, directories or symlinks, like hard links.
+    :raises ArchiveVerificationError: If files don't match the expected size or hash,
+        entries or symlinks point outside of the archive, or some expected files are missing.
+    """
+    expected_files = {
+        _archive_entry_path(expected.path.replace(os.sep, '/')): expected
+        for expected in expected_checksums.files
+    }
+
+    destination_directory = os.path.abspath(destination_directory)
+    parent_directory = os.path.dirname(destination_directory)
+    os.makedirs(parent_directory, exist_ok=True)
+    staging_directory = tempfile.mkdtemp(
+        prefix=f'.{os.path.basename(destination_directory)}_', dir=parent_directory
+    )
+
     try:
-        with tarfile.open(archive_filepath, 'w:gz') as archive:
+        unpacked: t.Set[str] = set()
+        symlinks: t.List[t.Tuple[str, str, str]] = []
+        for name, kind, size, mode, linkname, open_entry in _iter_archive_entries(file):
+            path = _archive_entry_path(name)
+            target = os.path.join(staging_directory, *path.split('/'))
+
+            if kind == 'dir':
+                os.makedirs(target, exist_ok=True)
+                continue
+
+            if kind == 'symlink':
+                symlinks.append((path, target, linkname))
+                continue
+
+            if kind != 'file':
+                raise ArchiveUnverifiableError(f'Unsupported type of the entry "{name}"')
+
+            expected = expected_files.get(path)
+            if expected is None:
+                raise ArchiveUnverifiableError(f'Unexpected file "{path}" in the archive')
+
+            if path in unpacked:
+                raise ArchiveVerificationError(f'Duplicate file "{path}" in the archive')
+
+            if size != expected.size:
+                raise ArchiveVerificationError(
+                    f'Size of the file "{path}" is {size} bytes, expected {expected.size} bytes'
+                )
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open_entry() as source, open(target, 'wb') as destination:
+                _check_file(source, path, expected, destination)
+
+            # Same as the "data" extraction filter: no special bits and no write access for others
+            os.chmod(target, mode & 0o755 | 0o600)
+            unpacked.add(path)
+
+        # Symlinks are created last, so no file is written through them
+        for path, target, linkname in symlinks:
+            if os.path.isabs(linkname):
+                raise ArchiveVerificationError(
+                    f'Symlink "{path}" in the archive points outside of it'
+                )
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.symlink(linkname, target)
+            except FileExistsError:
+                raise ArchiveVerificationError(f'Duplicate file "{path}" in the archive')
+            except OSError as e:
+                # For example, creating symlinks requires privileges on Windows
+                raise ArchiveUnverifiableError(f'Cannot create symlink "{path}": {e}')
+
+        # Checked when all symlinks exist, as they may point through each other
+        real_staging_directory = os.path.realpath(staging_directory)
+        for path, target, _ in symlinks:
+            if not _is_inside(os.path.realpath(target), real_staging_directory):
+                raise ArchiveVerificationError(
+                    f'Symlink "{path}" in the archive points outside of it'
+                )
+
+        # Expected files that are not in the archive may be reached through symlinks
+        for path in sorted(set(expected_files) - unpacked if symlinks else ()):
+            target = os.path.join(staging_directory, *path.split('/'))
+            if not os.path.isfile(target):
+                continue
+
+            with open(target, 'rb') as source:
+                _check_file(source, path, expected_files[path])
+            unpacked.add(path)
+
+        missing = sorted(set(expected_files) - unpacked)
+        if missing:
+            raise ArchiveVerificationError(
+                'Files are missing in the archive: {}'.format(', '.join(missing))
+            )
+
+        _replace_directory(staging_directory, destination_directory)
+    except BaseException:
+        shutil.rmtree(staging_directory, ignore_errors=True)
+        raise
+
+
+def _zstd_module() -> t.Any:
+    """Returns the module with zstd support if it's available, otherwise None.
+
+    Python 3.14+ has it in the standard library, for older versions
+    the ``zstandard`` package is used if it's installed.
+    """
+    try:
+        from compression import zstd  # type: ignore
+
+        return zstd
+    except ImportError:
+        pass
+
+    try:
+        import zstandard  # type: ignore
+
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _compression_threads(threads: t.Optional[int]) -> int:
+    if threads is None:
+        threads = os.cpu_count() or 1
+
+    return max(threads, 1)
+
+
+def _open_zstd(file: t.Union[str, Path], mode: str, threads: t.Optional[int] = None) -> t.Any:
+    zstd = _zstd_module()
+    if zstd is None:
+        raise ArchiveError(
+            'zstd compressed archives require Python 3.14+ or the "zstandard" package'
+        )
+
+    threads = _compression_threads(threads)
+    if zstd.__name__ == 'zstandard':
+        raw = open(file, mode)
+        if mode == 'rb':
+            return zstd.ZstdDecompressor().stream_reader(raw, closefd=True)
+
+        return zstd.ZstdCompressor(threads=threads).stream_writer(raw, closefd=True)
+
+    options = None
+    if mode == 'wb' and threads > 1 and zstd.CompressionParameter.nb_workers.bounds()[1] > 0:
+        options = {zstd.CompressionParameter.nb_workers: threads}
+
+    return zstd.ZstdFile(file, mode, options=options)
+
+
+def _compress_block(data: bytes, dictionary: bytes, last: bool, level: int) -> bytes:
+    # Raw deflate stream, the gzip header and trailer are written by ParallelGzipWriter
+    if dictionary:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zdict=dictionary
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL)
+
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    """Write-only gzip file that compresses blocks of data on multiple threads.
+
+    Works like pigz: the data is split into blocks, each block is compressed
+    independently, using the end of the previous block as the dictionary,
+    and flushed to a byte boundary, so the compressed blocks can be concatenated
+    into a single deflate stream. The result is a regular gzip file.
+    """
+
+    def __init__(
+        self,
+        file: t.Union[str, Path],
+        threads: t.Optional[int] = None,
+        level: int = GZIP_COMPRESS_LEVEL,
+        block_size: int = GZIP_BLOCK_SIZE,
+    ) -> None:
+        super().__init__()
+        self._threads = _compression_threads(threads)
+        self._level = level
+        self._block_size = block_size
+
+        self._file = open(file, 'wb')
+        self._buffer = bytearray()
+        self._dictionary = b''
+        self._crc = 0
+        self._size = 0
+
+        self._executor: t.Optional[ThreadPoolExecutor] = None
+        if self._threads > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self._threads)
+        # Compressed blocks in the order they should be written
+        self._pending: t.Deque[Future] = deque()
+
+        self._file.write(
+            struct.pack(
+                '<BBBBLBB',
+                0x1F,
+                0x8B,  # magic
+                zlib.DEFLATED,  # compression method
+                0,  # flags
+                int(time.time()),  # modification time
+                2 if level == zlib.Z_BEST_COMPRESSION else 0,  # extra flags
+                255,  # OS: unknown
+            )
+        )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore
+        if self.closed:
+            raise ValueError('write to closed file')
+
+        data = memoryview(data).cast('B')
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer += data
+
+        while len(self._buffer) > self._block_size:
+            block = bytes(self._buffer[: self._block_size])
+            del self._buffer[: self._block_size]
+            self._submit(block, last=False)
+
+        return len(data)
+
+    def _submit(self, block: bytes, last: bool) -> None:
+        dictionary = self._dictionary
+        self._dictionary = block[-GZIP_DICTIONARY_SIZE:]
+
+        if self._executor is None:
+            self._file.write(_compress_block(block, dictionary, last, self._level))
+            return
+
+        self._pending.append(
+            self._executor.submit(_compress_block, block, dictionary, last, self._level)
+        )
+        # Limit memory usage by the blocks waiting to be written
+        while len(self._pending) > 2 * self._threads:
+            self._file.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer.clear()
+
+            while self._pending:
+                self._file.write(self._pending.popleft().result())
+
+            self._file.write(struct.pack('<LL', self._crc, self._size & 0xFFFFFFFF))
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+            self._file.close()
+            super().close()
+
+
+@contextmanager
+def _open_archive_for_writing(
+    archive_filepath: t.Union[str, Path],
+    threads: t.Optional[int] = None,
+    dereference: bool = False,
+) -> t.Iterator[tarfile.TarFile]:
+    """Open tar archive for writing, compressed by the format defined by the extension.
+
+    ``.tar.zst`` and ``.tzst`` archives are compressed with zstd,
+    all others with gzip.
+
+    :param dereference: Add files and directories that symlinks point to instead of the links.
+    """
+    if re.search(r'(\.tar\.zst$)|(\.tzst$)', str(archive_filepath)):
+        fileobj = _open_zstd(archive_filepath, 'wb', threads)
+    else:
+        fileobj = ParallelGzipWriter(archive_filepath, threads)
+
+    try:
+        # Closing of the tar archive doesn't close a file object passed to it
+        with tarfile.open(fileobj=fileobj, mode='w|', dereference=dereference) as archive:
+            yield archive
+    finally:
+        fileobj.close()
+
+
+def pack_archive(
+    source_dir: t.Union[str, Path],
+    archive_filepath: t.Union[str, Path],
+    threads: t.Optional[int] = None,
+) -> None:
+    """Create tar+gzip archive, or tar+zstd if the path ends with ``.tar.zst`` or ``.tzst``
+
+    Symlinks are stored as links.
+
+    :param threads: Number of threads used for compression, by default the number of CPUs.
+    """
+    try:
+        with _open_archive_for_writing(archive_filepath, threads) as archive:
             archive.add(source_dir, arcname='./')
     except tarfile.TarError:
         raise ArchiveError(f'{archive_filepath} is not a valid tar archive')
+
+
+def _directory_tarinfo(arcname: str) -> tarfile.TarInfo:
+    tarinfo = tarfile.TarInfo(arcname)
+    tarinfo.type = tarfile.DIRTYPE
+    tarinfo.mode = 0o755
+    tarinfo.mtime = int(time.time())
+    return tarinfo
+
+
+def pack_paths(
+    paths: t.Mapping[str, t.Union[str, Path]],
+    archive_filepath: t.Union[str, Path],
+    contents: t.Optional[t.Mapping[str, bytes]] = None,
+    threads: t.Optional[int] = None,
+) -> None:
+    """Create tar+gzip archive directly from files, without copying them into a directory first.
+
+    The archive has the same layout as the one created by ``pack_archive``
+    for a directory with these files.
+
+    :param paths: Mapping of relative POSIX paths in the archive to paths on the disk.
+        Paths that are not files are added as empty directories.
+        Parent directories of all paths are added automatically.
+    :param contents: Mapping of relative POSIX paths in the archive to the content of generated files.
+        They replace files with the same path from ``paths``.
+    :param threads: Number of threads used for compression, by default the number of CPUs.
+    """
+    contents = contents or {}
+
+    # Relative path in the archive -> path on the disk, if known
+    directories: t.Dict[str, t.Optional[str]] = {}
+    files: t.Dict[str, str] = {}
+
+    for rel_path, source in paths.items():
+        source = str(source)
+        if os.path.isfile(source):
+            files[rel_path] = source
+        else:
+            directories[rel_path] = source if os.path.isdir(source) else None
+
+        parent, source_parent = rel_path, source
+        while '/' in parent:
+            parent = parent.rsplit('/', 1)[0]
+            source_parent = os.path.dirname(source_parent)
+            if directories.get(parent) is None:
+                directories[parent] = source_parent
+
+    for rel_path in contents:
+        files.pop(rel_path, None)
+        parent = rel_path
+        while '/' in parent:
+            parent = parent.rsplit('/', 1)[0]
+            directories.setdefault(parent, None)
+
+    # Same order as adding a directory recursively: parents first, then sorted children
+    entries = sorted(
+        set(directories) | set(files) | set(contents), key=lambda path: path.split('/')
+    )
+
+    try:
+        # Symlinked files and directories are added with their content,
+        # as they were copied to the directory packed by ``pack_archive``
+        with _open_archive_for_writing(archive_filepath, threads, dereference=True) as archive:
+            archive.addfile(_directory_tarinfo('.'))
+
+            for rel_path in entries:
+                arcname = f'./{rel_path}'
+                if rel_path in contents:
+                    data = contents[rel_path]
+                    tarinfo = tarfile.TarInfo(arcname)
+                    tarinfo.size = len(data)
+                    tarinfo.mode = 0o644
+                    tarinfo.mtime = int(time.time())
+                    archive.addfile(tarinfo, io.BytesIO(data))
+                elif rel_path in files:
+                    with open(files[rel_path], 'rb') as f:
+                        archive.addfile(archive.gettarinfo(arcname=arcname, fileobj=f), f)
+                else:
+                    source_dir = directories[rel_path]
+                    if source_dir is None:
+                        tarinfo = _directory_tarinfo(arcname)
+                    else:
+                        tarinfo = archive.gettarinfo(source_dir, arcname=arcname)
+                    archive.addfile(tarinfo)
+    except tarfile.TarError:
+        raise ArchiveError(f'{archive_filepath} is not a valid tar archive')
@@ -5,6 +5,7 @@ import json
 import typing as t
 from collections import defaultdict
 from pathlib import Path
+from types import MappingProxyType
 
 if t.TYPE_CHECKING:
     from idf_component_tools.manifest import ComponentRequirement
@@ -25,7 +26,15 @@ class DebugInfoCollector:
 class SdkconfigContext:
     def __init__(self):
         self.sdkconfig: t.Dict[str, t.Any] = {}
-        self.missed_keys: t.Dict[str, t.Set['ComponentRequirement']] = defaultdict(set)
+        self._missed_keys: t.Dict[str, t.FrozenSet['ComponentRequirement']] = {}
+        # Misses in the order they were added while a checkpoint is active, to roll back to it
+        self._journal: t.List[t.Tuple[str, 'ComponentRequirement']] = []
+        self._checkpoints: t.List[int] = []
+
+    @property
+    def missed_keys(self) -> t.Mapping[str, t.FrozenSet['ComponentRequirement']]:
+        """Read-only view of missed keys, use ``set_missed_kconfig`` to add them"""
+        return MappingProxyType(self._missed_keys)
 
     def update_from_file(self, file_path: t.Union[str, Path]):
         path = Path(file_path)
@@ -36,7 +45,45 @@ class SdkconfigContext:
             self.sdkconfig.update(json.load(f))
 
     def set_missed_kconfig(self, key: str, req: 'ComponentRequirement'):
-        self.missed_keys[key].add(req)
+        reqs = self._missed_keys.get(key, frozenset())
+        if req not in reqs:
+            self._missed_keys[key] = reqs | {req}
+            if self._checkpoints:
+                self._journal.append((key, req))
+
+    def checkpoint(self) -> int:
+        """Start journaling misses, returns the token to roll back to this point"""
+        self._checkpoints.append(len(self._journal))
+        return len(self._checkpoints) - 1
+
+    def rollback(self, checkpoint: int) -> t.Dict[str, t.Set['ComponentRequirement']]:
+        """
+        Remove misses added after the checkpoint and return them.
+        Checkpoints taken after this one are released with it.
+        """
+        position = self._checkpoints[checkpoint]
+        removed: t.Dict[str, t.Set['ComponentRequirement']] = {}
+        for key, req in self._journal[position:]:
+            reqs = self._missed_keys.get(key)
+            if reqs is None or req not in reqs:
+                continue
+
+            reqs = reqs - {req}
+            if reqs:
+                self._missed_keys[key] = reqs
+            else:
+                del self._missed_keys[key]
+            removed.setdefault(key, set()).add(req)
+
+        del self._checkpoints[checkpoint:]
+
+        # The journal is only kept while there are checkpoints to roll back to
+        if self._checkpoints:
+            del self._journal[position:]
+        else:
+            self._journal.clear()
+
+        return removed
 
 
 DEBUG_INFO_COLLECTOR = contextvars.ContextVar('DebugInfoCollector', default=DebugInfoCollector())
@@ -157,6 +157,24 @@ class ComponentManagerSettings(BaseSettings):
         """,
     )
 
+    METADATA_CACHE_TTL: int = Field(
+        default=24 * 60 * 60,
+        description="""
+            | Time in seconds to trust component hashes from the lock file verified
+            | against the Component Registry, stored in the cache directory.
+            | Set 0 to check the registry on every run.
+        """,
+    )
+
+    CACHE_RESPONSES_BETWEEN_RUNS: bool = Field(
+        True,
+        description="""
+            | Keep responses of the Component Registry in the build directory,
+            | when CMake runs the Component Manager again to evaluate Kconfig options.
+            | Set 0 to disable.
+        """,
+    )
+
     PROFILE: t.Optional[str] = Field(
         default=None,
         validation_alias=AliasChoices(
@@ -252,6 +270,24 @@ class ComponentManagerSettings(BaseSettings):
     # version solver
     CHECK_NEW_VERSION: bool = Field(True, description='Check for new versions of components.')
 
+    CHECK_NEW_VERSION_INTERVAL: int = Field(
+        default=24 * 60 * 60,
+        description="""
+            | Time in seconds between checks for new versions of components in a project.
+            | The check runs in the background and its result is shown on the next run.
+            | Set 0 to check on every run and show the result immediately.
+        """,
+    )
+
+    LOCK_TARGETS: t.Optional[str] = Field(
+        None,
+        description="""
+            | Targets to solve dependencies for in one run, separated by semicolons.
+            | Solutions are stored in lock files of the targets, like `dependencies.lock.esp32s3`,
+            | and used instead of solving dependencies again when the target is changed.
+        """,
+    )
+
     CONSTRAINT_FILES: t.Optional[str] = Field(
         None,
         description="""
@@ -270,6 +306,33 @@ class ComponentManagerSettings(BaseSettings):
         """,
     )
 
+    SOLUTION_CACHE: bool = Field(
+        True,
+        description="""
+            | Reuse solutions of the version solver stored in the cache directory,
+            | if component sources return the same component versions as before.
+            | The cache directory can be shared between machines only for projects
+            | with all dependencies from the Component Registry.
+            | Requires HTTP requests caching. Set 0 to disable.
+        """,
+    )
+
+    SOLVER_METRICS_FILE: t.Optional[str] = Field(
+        None,
+        description="""
+            | File to append version solver metrics to, as a JSON object per line.
+            | Includes decisions, backtracks, derived incompatibilities and time spent
+            | filtering and fetching component versions.
+        """,
+    )
+
+    SOLVER_TRACE_FILE: t.Optional[str] = Field(
+        None,
+        description="""
+            | File to append phases of version solving to, in Chrome trace format.
+        """,
+    )
+
     @field_validator('*', mode='wrap')
     @classmethod
     def fallback_to_default(
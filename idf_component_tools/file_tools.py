@@ -2,18 +2,25 @@
 # SPDX-License-Identifier: Apache-2.0
 """Set of tools and constants to work with files and directories"""
 
+import errno
 import os
 import shutil
-import tempfile
+import stat
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from shutil import copytree, rmtree
 
 from pathvalidate import ValidationError, validate_filename
 
 from idf_component_tools.errors import FatalError
-from idf_component_tools.git_client import GitClient
 from idf_component_tools.messages import warn
+from idf_component_tools.path_filter import (
+    GlobAutomaton,
+    UnsupportedPatternError,
+    compile_glob,
+    walk_filtered,
+)
 
 DEFAULT_EXCLUDE = [
     # Python files
@@ -53,6 +60,19 @@ UNEXPECTED_FILES = {
     'CMakeCache.txt',
 }
 
+# Files are copied on a thread pool if there are at least this many of them
+PARALLEL_COPY_MIN_FILES = 16
+
+# Size of the chunk copied by a single os.copy_file_range call
+COPY_BLOCK_SIZE = 1 << 30
+
+_COPY_FILE_RANGE_FALLBACK_ERRORS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+}
+
 
 def get_file_extension(path: str) -> t.Optional[str]:
     """Returns file extension with leading dot or None"""
@@ -66,30 +86,6 @@ def get_file_extension(path: str) -> t.Optional[str]:
     return ''.join(extensions)
 
 
-def gitignore_ignored_files(path: t.Union[str, Path]) -> t.Set[Path]:
-    """Returns set of files ignored by .gitignore file"""
-
-    base_path = Path(path)
-    paths = set()
-
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_dir_path = Path(tmp_dir)
-
-        # Create git client instance
-        git_client = GitClient(
-            work_tree=str(base_path.resolve()), git_dir=str(tmp_dir_path.resolve())
-        )
-
-        # Create a new empty repository
-        git_client.init_empty_repository()
-        ignored_files = git_client.ignored_files()
-
-        for file in ignored_files:
-            paths.add(base_path / Path(file))
-
-    return paths
-
-
 def filtered_paths(
     path: t.Union[str, Path],
     use_gitignore: bool = False,
@@ -116,46 +112,51 @@ def filtered_paths(
         exclude = set()
 
     base_path = Path(path)
-    paths: t.Set[Path] = set()
 
-    def include_paths(pattern):
-        paths.update(base_path.glob(pattern))
+    exclude_patterns = list(exclude)
+    if not use_gitignore and exclude_default:
+        exclude_patterns = DEFAULT_EXCLUDE + exclude_patterns
 
-    def exclude_paths(pattern):
-        paths.difference_update(base_path.glob(pattern))
-
-    def exclude_all_directories():
-        for path in list(paths):
-            if path.is_dir():
-                paths.remove(path)
-
-    # First include everything
-    include_paths('**/*')
+    include_globs, include_fallback = _compile_patterns(include)
+    exclude_globs, exclude_fallback = _compile_patterns(exclude_patterns)
 
-    if use_gitignore:
-        # Exclude .gitignore patterns
-        exclude_gitignore = gitignore_ignored_files(base_path)
-        paths.difference_update(exclude_gitignore)
-        exclude_all_directories()
-    else:
-        # Exclude defaults
-        if exclude_default:
-            for pattern in DEFAULT_EXCLUDE:
-                exclude_paths(pattern)
+    # Walk the tree once, pruning directories excluded as a whole.
+    # .gitignore patterns are applied during the same walk
+    paths, included = walk_filtered(
+        base_path,
+        include=GlobAutomaton(include_globs),
+        exclude=GlobAutomaton(exclude_globs),
+        use_gitignore=use_gitignore,
+    )
 
-    # Exclude manifest patterns
-    for pattern in exclude:
-        exclude_paths(pattern)
+    # Patterns that can't be compiled are evaluated by pathlib directly
+    for pattern in exclude_fallback:
+        paths.difference_update(base_path.glob(pattern))
 
-    exclude_all_directories()
+    for pattern in include_fallback:
+        included.update(base_path.glob(pattern))
 
     # Include manifest patterns
-    for pattern in include:
-        include_paths(pattern)
+    paths.update(included)
 
     return paths
 
 
+def _compile_patterns(
+    patterns: t.Iterable[str],
+) -> t.Tuple[t.List[t.Tuple[t.Any, ...]], t.List[str]]:
+    """Split patterns into compiled globs and patterns evaluated by pathlib"""
+    compiled = []
+    fallback = []
+    for pattern in patterns:
+        try:
+            compiled.append(compile_glob(pattern))
+        except UnsupportedPatternError:
+            fallback.append(pattern)
+
+    return compiled, fallback
+
+
 def prepare_empty_directory(directory: t.Union[str, Path]) -> None:
     """Prepare directory empty"""
     directory = Path(directory)
@@ -179,23 +180,57 @@ def copy_directory(source_directory: str, destination_directory: str) -> None:
     copytree(source_directory, destination_directory)
 
 
+def _copy_file_contents(source: str, destination: str) -> None:
+    """Copy file contents, letting the kernel copy data when it's possible"""
+    if hasattr(os, 'copy_file_range') and stat.S_ISREG(os.stat(source).st_mode):
+        try:
+            with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), COPY_BLOCK_SIZE):
+                    pass
+            return
+        except OSError as e:
+            # Not supported by the file system or across file systems
+            if e.errno not in _COPY_FILE_RANGE_FALLBACK_ERRORS:
+                raise
+
+    # Uses sendfile on Linux and fcopyfile on macOS
+    shutil.copyfile(source, destination)
+
+
+def _copy_file(source: str, destination: str) -> None:
+    """Same as shutil.copy2, copies file contents and metadata"""
+    _copy_file_contents(source, destination)
+    shutil.copystat(source, destination)
+
+
 def copy_directories(
     source_directory: str, destination_directory: str, paths: t.Iterable[Path]
 ) -> None:
-    for path in sorted(paths):
-        path = str(path)  # type: ignore # Path backward compatibility
+    directories = set()
+    files: t.List[t.Tuple[str, str]] = []
+    for path in map(str, paths):
         rel_path = os.path.relpath(path, source_directory)
         dest_path = os.path.join(destination_directory, rel_path)
 
         if os.path.isfile(path):
-            dest_dir = os.path.dirname(dest_path)
+            files.append((path, dest_path))
+            directories.add(os.path.dirname(dest_path))
+        else:
+            directories.add(dest_path)
 
-            if not os.path.exists(dest_dir):
-                os.makedirs(dest_dir)
+    # Create all directories first, parents before children
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
 
-            shutil.copy2(path, dest_path)
-        else:
-            os.makedirs(dest_path)
+    if len(files) < PARALLEL_COPY_MIN_FILES:
+        for source, destination in files:
+            _copy_file(source, destination)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as executor:
+        # Consume results to re-raise errors
+        for _ in executor.map(lambda args: _copy_file(*args), files):
+            pass
 
 
 def copy_filtered_directory(
@@ -212,10 +247,25 @@ def copy_filtered_directory(
     copy_directories(source_directory, destination_directory, paths)
 
 
-def check_unexpected_component_files(path: t.Union[str, Path]) -> None:
-    """Create a warning if a directory contains files not expected inside component"""
-    for root, _dirs, files in os.walk(str(path)):
-        unexpected_files = UNEXPECTED_FILES.intersection(files)
+def check_unexpected_component_files(
+    path: t.Union[str, Path], files: t.Optional[t.Iterable[Path]] = None
+) -> None:
+    """Create a warning if a directory contains files not expected inside component
+
+    :param path: Path to the component directory.
+    :param files: Files of the component, if not set all files in the directory are checked.
+    """
+    directories: t.Iterator[t.Tuple[str, t.List[str]]]
+    if files is None:
+        directories = ((root, names) for root, _dirs, names in os.walk(str(path)))
+    else:
+        files_by_directory: t.Dict[str, t.List[str]] = {}
+        for file in files:
+            files_by_directory.setdefault(str(file.parent), []).append(file.name)
+        directories = iter(sorted(files_by_directory.items()))
+
+    for root, names in directories:
+        unexpected_files = UNEXPECTED_FILES.intersection(names)
         if unexpected_files:
             warn(
                 'Unexpected files "{files}" found in the component directory "{path}". '
@@ -178,28 +178,6 @@ class GitClient:
         except GitCommandError:
             return False
 
-    @_git_cmd
-    def init_empty_repository(self) -> None:
-        """Initializes a new empty git repository"""
-
-        self.run(['init', '-q'], use_predefined_options=True)
-
-    @_git_cmd
-    def ignored_files(self) -> t.List[str]:
-        """Returns a list of untracked and ignored files by .gitignore separated with newlines"""
-
-        output = self.run(
-            [
-                'ls-files',
-                '--others',
-                '--exclude-standard',
-                '--ignored',
-            ],
-            use_predefined_options=True,
-        )
-
-        return output.splitlines()
-
     @_git_cmd
     @_bare_repo
     def prepare_ref(
@@ -1,5 +1,6 @@
 # SPDX-FileCopyrightText: 2022-2025 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
+import hashlib
 import os
 import typing as t
 from io import StringIO
@@ -10,7 +11,9 @@ from ruamel.yaml import YAML, YAMLError
 
 from idf_component_tools.build_system_tools import get_env_idf_target, get_idf_version
 from idf_component_tools.errors import LockError
+from idf_component_tools.file_cache import FileCache
 from idf_component_tools.manifest import SolvedComponent, SolvedManifest
+from idf_component_tools.manifest_cache import get_manifest_cache
 from idf_component_tools.messages import notice
 from idf_component_tools.sources import IDFSource
 from idf_component_tools.utils import ComponentVersion
@@ -25,6 +28,10 @@ class LockFile(SolvedManifest):
 EMPTY_LOCK: t.Dict[str, t.Any] = {}
 
 
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
 class LockManager:
     def __init__(self, path):
         self._path = path
@@ -32,9 +39,39 @@ class LockManager:
         self._yaml.default_flow_style = False
         self._yaml.width = 2048  # Prevent wrapping long strings (hashes...)
 
+        # hash of the lock file content, as it was loaded or dumped by this manager,
+        # valid while the size and mtime of the file are the same
+        self._content_hash: t.Optional[str] = None
+        self._content_stat: t.Optional[t.Tuple[int, int]] = None
+
     def exists(self):
         return os.path.isfile(self._path)
 
+    def _file_stat(self) -> t.Optional[t.Tuple[int, int]]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+
+        return stat.st_size, stat.st_mtime_ns
+
+    def _set_content_hash(self, content: str) -> None:
+        self._content_hash = _content_hash(content)
+        self._content_stat = self._file_stat()
+
+    def _current_content_hash(self) -> t.Optional[str]:
+        """Hash of the lock file content, None if it doesn't exist"""
+        if not self.exists():
+            return None
+
+        if self._content_hash is not None and self._content_stat == self._file_stat():
+            return self._content_hash
+
+        with open(self._path, encoding='utf-8') as f:
+            self._set_content_hash(f.read())
+
+        return self._content_hash
+
     def dump(self, solution: SolvedManifest) -> bool:
         """
         Writes updated lockfile to disk. Won't write if lockfile is already up to date.
@@ -55,36 +92,32 @@ class LockManager:
         else:
             solution.dependencies.append(current_idf)
 
-        try:
-            with StringIO() as new_lock:
-                # Local source path in dependencies lock file should be relative to the lock file path
-                context = {
-                    'lock_path': Path(self._path).parent,
-                    'use_relative_path': True,
-                }
-
-                # Inject lock file version and current target
-                lock = LockFile(**solution.model_dump(context=context))
-                lock.target = get_env_idf_target()
-
-                self._yaml.dump(
-                    data=lock.model_dump(context=context),
-                    stream=new_lock,
-                )
-                new_lock.seek(0)
-                new_lock_content = new_lock.read()
-        except ValidationError as e:
-            raise LockError(f'Lock format is not valid:\n{e}')
-
-        # create it when string is different
-        if (
-            not self.exists()
-            or new_lock_content != open(self._path, mode='r', encoding='utf-8').read()
-        ):
+        with StringIO() as new_lock:
+            # Local source path in dependencies lock file should be relative to the lock file path
+            context = {
+                'lock_path': Path(self._path).parent,
+                'use_relative_path': True,
+            }
+
+            # The solution is already validated, inject lock file version and current target
+            lock_dict = solution.model_dump(context=context)
+            lock_dict['version'] = FORMAT_VERSION
+            lock_dict['target'] = get_env_idf_target()
+
+            self._yaml.dump(
+                data=lock_dict,
+                stream=new_lock,
+            )
+            new_lock_content = new_lock.getvalue()
+
+        # create it when it doesn't exist or its content is different
+        if _content_hash(new_lock_content) != self._current_content_hash():
             with open(self._path, mode='w', encoding='utf-8') as fw:
                 fw.write(new_lock_content)
                 notice('Updating lock file at {}'.format(self._path))
-                return True
+
+            self._set_content_hash(new_lock_content)
+            return True
 
         return False
 
@@ -92,9 +125,22 @@ class LockManager:
         if not self.exists():
             return SolvedManifest.fromdict(EMPTY_LOCK)
 
+        with open(self._path, encoding='utf-8') as f:
+            content = f.read()
+
+        self._set_content_hash(content)
+
+        # Lock files loaded in previous runs of CMake are not validated again
+        cache = get_manifest_cache()
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.key(content, os.path.abspath(self._path), FileCache().path())
+            solution = cache.get(cache_key)
+            if solution is not None:
+                return solution
+
         try:
-            with open(self._path, encoding='utf-8') as f:
-                yaml_dict = self._yaml.load(f)
+            yaml_dict = self._yaml.load(content)
 
             if not yaml_dict:
                 lock = LockFile.fromdict(EMPTY_LOCK)
@@ -110,7 +156,7 @@ class LockManager:
                     f'Recreating lock file with the current version.'
                 )
 
-            return SolvedManifest.fromdict(lock_dict)
+            solution = SolvedManifest.fromdict(lock_dict)
         except (YAMLError, ValidationError):
             raise LockError(
                 'Cannot parse components lock file. '
@@ -118,3 +164,8 @@ class LockManager:
                 'You can delete corrupted lock file and it will be recreated on next run. '
                 'Some components may be updated in this case.'
             )
+
+        if cache is not None and cache_key is not None and version == FORMAT_VERSION:
+            cache.set(cache_key, solution)
+
+        return solution
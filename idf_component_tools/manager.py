@@ -1,14 +1,18 @@
 # SPDX-FileCopyrightText: 2022-2025 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 import enum
+import io
 import os
+import time
 import typing as t
+from collections import OrderedDict
 from pathlib import Path
 
-from ruamel.yaml import YAML, CommentedMap, YAMLError
+from ruamel.yaml import YAML, YAMLError
 
 from .constants import MANIFEST_FILENAME
 from .errors import ManifestError
+from .manifest_cache import get_manifest_cache
 
 if t.TYPE_CHECKING:
     from .manifest.models import Manifest
@@ -20,6 +24,19 @@ class UploadMode(str, enum.Enum):
     example = 'example'
 
 
+# Validated manifests of the process, keyed by the manifest file state and the validation options
+_MANIFEST_CACHE: 'OrderedDict[t.Tuple[t.Any, ...], Manifest]' = OrderedDict()
+MANIFEST_CACHE_SIZE = 1024
+
+# Files modified more recently may change again without changing their mtime,
+# as mtime is updated with the granularity of the filesystem clock
+MANIFEST_CACHE_MIN_AGE_NS = 2_000_000_000
+
+
+def clear_manifest_cache() -> None:
+    _MANIFEST_CACHE.clear()
+
+
 class ManifestManager:
     """
     Parser for manifest files in the project.
@@ -56,28 +73,88 @@ class ManifestManager:
         # validation attrs
         self._validation_errors: t.List[str] = None  # type: ignore
 
+        # round-trip YAML, only used to dump the manifest
         self._yaml = YAML()
 
-    def validate(self) -> 'ManifestManager':
-        from .manifest.models import (
-            Manifest,
-            RepositoryInfoField,
+    def _cache_key(self) -> t.Optional[t.Tuple[t.Any, ...]]:
+        """
+        Key of the validated manifest in the cache.
+        Manifests validated in upload mode are not cached, as they are validated only once.
+        """
+        if self.upload_mode != UploadMode.false:
+            return None
+
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+
+        return (
+            os.path.abspath(self.path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            self.name,
+            self._version,
         )
 
+    def _load_cached(self, key: t.Tuple[t.Any, ...]) -> bool:
+        cached = _MANIFEST_CACHE.get(key)
+        if cached is None:
+            return False
+
+        self._manifest = cached.model_copy(deep=True)
+        self._manifest._manifest_manager = self
+        self._validation_errors = []
+        return True
+
+    def _store_cached(self, key: t.Optional[t.Tuple[t.Any, ...]]) -> None:
+        if key is None or time.time_ns() - key[1] < MANIFEST_CACHE_MIN_AGE_NS:
+            return
+
+        manifest = self._manifest.model_copy()
+        manifest._manifest_manager = None
+        _MANIFEST_CACHE[key] = manifest.model_copy(deep=True)
+        if len(_MANIFEST_CACHE) > MANIFEST_CACHE_SIZE:
+            _MANIFEST_CACHE.popitem(last=False)
+
+    def validate(self) -> 'ManifestManager':
+        from .manifest.models import Manifest
+
         # avoid circular dependency
-        from .utils import ComponentVersion, validation_context
+        from .utils import validation_context
 
         if self._manifest:
             return self
 
+        cache_key = self._cache_key()
+        if cache_key is not None and self._load_cached(cache_key):
+            self._override_fields()
+            return self
+
+        manifest_cache = get_manifest_cache() if cache_key is not None else None
+        manifest_cache_key = None
+
         if not self.path.exists():
             manifest_dict: t.Dict[str, t.Any] = {}
         # validate manifest
         else:
-            try:
-                manifest_dict = (
-                    self._yaml.load(self.path.read_text(encoding='utf-8')) or CommentedMap()
+            content = self.path.read_text(encoding='utf-8')
+            if manifest_cache is not None:
+                manifest_cache_key = manifest_cache.key(
+                    content, os.path.abspath(self.path), self.name, self._version
                 )
+                cached = manifest_cache.get(manifest_cache_key)
+                if cached is not None:
+                    self._manifest = cached
+                    self._manifest._manifest_manager = self
+                    self._validation_errors = []
+                    self._store_cached(cache_key)
+                    self._override_fields()
+                    return self
+
+            try:
+                # the manifest is only read here, no need to keep comments and formatting
+                manifest_dict = YAML(typ='safe', pure=True).load(content) or {}
             except YAMLError:
                 self._validation_errors = [
                     'Cannot parse the manifest file. Please check that\n'
@@ -109,21 +186,34 @@ class ManifestManager:
             )
 
         if self._manifest:
-            # override fields defined in manifest manager
-            if self._version is not None:
-                self._manifest.version = ComponentVersion(self._version)
+            self._store_cached(cache_key)
 
-            if self._repository is not None:
-                self._manifest.repository = self._repository
+            if manifest_cache is not None and manifest_cache_key is not None:
+                manifest_cache.set(manifest_cache_key, self._manifest)
 
-            if self._commit_sha is not None:
-                self._manifest.repository_info = RepositoryInfoField.fromdict({
-                    'commit_sha': self._commit_sha,
-                    'path': self._repository_path,
-                })
+            self._override_fields()
 
         return self
 
+    def _override_fields(self) -> None:
+        """Override fields defined in manifest manager"""
+        from .manifest.models import RepositoryInfoField
+
+        # avoid circular dependency
+        from .utils import ComponentVersion
+
+        if self._version is not None:
+            self._manifest.version = ComponentVersion(self._version)
+
+        if self._repository is not None:
+            self._manifest.repository = self._repository
+
+        if self._commit_sha is not None:
+            self._manifest.repository_info = RepositoryInfoField.fromdict({
+                'commit_sha': self._commit_sha,
+                'path': self._repository_path,
+            })
+
     @property
     def manifest(self) -> 'Manifest':
         if self._manifest is None:
@@ -179,3 +269,11 @@ class ManifestManager:
                 self.manifest_tree,
                 fw,
             )
+
+    def dumps(self) -> str:
+        """
+        Returns the content of the manifest file as it would be written by ``dump``.
+        """
+        stream = io.StringIO()
+        self._yaml.dump(self.manifest_tree, stream)
+        return stream.getvalue()
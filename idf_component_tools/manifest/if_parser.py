@@ -3,6 +3,7 @@
 
 import typing as t
 from ast import literal_eval
+from functools import cached_property, lru_cache
 
 from pydantic import GetCoreSchemaHandler
 from pydantic_core import core_schema
@@ -111,9 +112,12 @@ class Stmt:
 class LeftValue(Stmt):
     def __init__(self, stmt: str) -> None:
         self.stmt = stmt
+        self._stripped = stmt.strip()
+        match_s = KCONFIG_VAR_REGEX.match(self._stripped)
+        self._kconfig_key = match_s.group(1) if match_s else None
 
     def get_value(self) -> _value_type:
-        _s = self.stmt.strip()
+        _s = self._stripped
         if _s == 'idf_version':
             try:
                 return Version(get_idf_version())
@@ -129,9 +133,8 @@ class LeftValue(Stmt):
                 return 'unknown'
 
         # consider it as a kconfig
-        match_s = KCONFIG_VAR_REGEX.match(_s)
-        if match_s:
-            key = match_s.group(1)
+        if self._kconfig_key is not None:
+            key = self._kconfig_key
             kconfig_ctx = KCONFIG_CONTEXT.get()
             if key in kconfig_ctx.sdkconfig:
                 return kconfig_ctx.sdkconfig[key]
@@ -157,6 +160,47 @@ class List(Stmt):
         return self.eval_list(self.stmt)
 
 
+class _RightValue:
+    """Right value of an if clause, converted to the type of the left value once"""
+
+    def __init__(self, stmt: str, op: str) -> None:
+        self.stmt = stmt
+        self.op = op
+
+    @cached_property
+    def as_bool(self) -> bool:
+        return Stmt.eval_bool(self.stmt)
+
+    @cached_property
+    def as_int(self) -> int:
+        return Stmt.eval_int(self.stmt)
+
+    @cached_property
+    def as_str(self) -> str:
+        return Stmt.eval_str(self.stmt)
+
+    @cached_property
+    def as_list(self) -> t.List[_value_type]:
+        return Stmt.eval_list(self.stmt)
+
+    @cached_property
+    def spec(self) -> t.Optional[SimpleSpec]:
+        """Version spec, or None if the value is not a version"""
+        try:
+            return IfClause.eval_spec(self.op, self.stmt)
+        except ValueError:
+            return None
+
+    @cached_property
+    def version_spec(self) -> SimpleSpec:
+        stmt = self.stmt
+        if stmt[0] == stmt[-1] == '"':
+            # this is to keep the backward compatibility
+            stmt = stmt[1:-1]
+
+        return IfClause.eval_spec(self.op, stmt)
+
+
 class IfClause(Stmt):
     _OP_LAMBDA_MAP = {
         '<=': lambda x, y: x <= y,
@@ -175,6 +219,7 @@ class IfClause(Stmt):
         self.left: LeftValue = left
         self.op = op
         self.right: t.Union[Single, List] = right
+        self._evaluate: t.Optional[t.Callable[[], bool]] = None
 
     @property
     def stmt(self):
@@ -190,53 +235,80 @@ class IfClause(Stmt):
 
         return spec
 
+    def raise_invalid_type_error(self) -> t.NoReturn:
+        raise ValueError(
+            f'Invalid operator "{self.op}" for comparing "{self.left}" and "{self.right}". \n'
+            f'Please check documentation https://docs.espressif.com/projects/idf-component-manager/en/latest/reference/manifest_file.html#conditional-dependencies'
+        )
+
     def get_value(self) -> bool:  # type: ignore
-        def raise_invalid_type_error() -> None:
-            raise ValueError(
-                f'Invalid operator "{self.op}" for comparing "{self.left}" and "{self.right}". \n'
-                f'Please check documentation https://docs.espressif.com/projects/idf-component-manager/en/latest/reference/manifest_file.html#conditional-dependencies'
-            )
-
-        _l = self.left.get_value()
-        _r_stmt = subst_vars_in_str(self.right.stmt)
-
-        # idf_version compare with version spec
-        if isinstance(_l, Version):
-            if _r_stmt[0] == _r_stmt[-1] == '"':
-                # this is to keep the backward compatibility
-                _r_stmt = _r_stmt[1:-1]
-            _spec = self.eval_spec(self.op, _r_stmt)
-            return _spec.match(_l)
+        if self._evaluate is None:
+            self._evaluate = self._compile()
+
+        return self._evaluate()
+
+    def _compile(self) -> t.Callable[[], bool]:
+        """
+        Build the function evaluating the clause. Only values of the environment,
+        like the target or sdkconfig options, are read on each call.
+        """
+        op = self.op
+        op_func = self._OP_LAMBDA_MAP.get(op)
+        left_stmt = self.left.stmt.strip()
+
+        # Right value without environment variables is converted to each type only once
+        right_stmt = self.right.stmt
+        if '$' in right_stmt:
+
+            def right() -> _RightValue:
+                return _RightValue(subst_vars_in_str(right_stmt), op)
+
+        else:
+            static_right = _RightValue(right_stmt, op)
+
+            def right() -> _RightValue:
+                return static_right
 
         # target only support !=, ==, in, not in
-        if self.left.stmt.strip() == 'target':
-            if self.op in ['==', '!=']:
-                return self._OP_LAMBDA_MAP[self.op](_l, self.eval_str(self.right.stmt))
-            elif self.op in self._LIST_OPS:
-                return self._OP_LAMBDA_MAP[self.op](_l, self.eval_list(self.right.stmt))
-            else:
-                raise_invalid_type_error()
+        if left_stmt == 'target':
+            # environment variables are not expanded in the target value
+            target_right = _RightValue(right_stmt, op)
+            if op_func is None or op not in ['==', '!=', *self._LIST_OPS]:
+                return self.raise_invalid_type_error
 
-        # env var, kconfig, string, compare with string, int, bool, as the left value
-        try:
-            if self.op in self._LIST_OPS:
-                return self._OP_LAMBDA_MAP[self.op](str(_l), self.eval_list(_r_stmt))
+            if op in self._LIST_OPS:
+                return lambda: op_func(self.left.get_value(), target_right.as_list)
+
+            return lambda: op_func(self.left.get_value(), target_right.as_str)
+
+        def evaluate() -> bool:
+            _l = self.left.get_value()
+
+            # idf_version compare with version spec
+            if isinstance(_l, Version):
+                return right().version_spec.match(_l)
+
+            # env var, kconfig, string, compare with string, int, bool, as the left value
+            if op_func is None:
+                self.raise_invalid_type_error()
+
+            _r = right()
+            if op in self._LIST_OPS:
+                return op_func(str(_l), _r.as_list)
             elif isinstance(_l, bool):
-                return self._OP_LAMBDA_MAP[self.op](_l, self.eval_bool(_r_stmt))
+                return op_func(_l, _r.as_bool)
             elif isinstance(_l, int):
-                return self._OP_LAMBDA_MAP[self.op](_l, self.eval_int(_r_stmt))
+                return op_func(_l, _r.as_int)
             elif isinstance(_l, str):
                 # compare with Version?
-                try:
-                    _spec = self.eval_spec(self.op, _r_stmt)
-                except ValueError:
-                    return self._OP_LAMBDA_MAP[self.op](_l, self.eval_str(_r_stmt))
-                else:
-                    return _spec.match(Version(_l))
-            else:
-                raise_invalid_type_error()
-        except KeyError:
-            raise_invalid_type_error()
+                if _r.spec is None:
+                    return op_func(_l, _r.as_str)
+
+                return _r.spec.match(Version(_l))
+
+            self.raise_invalid_type_error()
+
+        return evaluate
 
     @classmethod
     def __get_pydantic_core_schema__(
@@ -331,5 +403,7 @@ BOOL_EXPR = infix_notation(
 )
 
 
+@lru_cache(maxsize=4096)
 def parse_if_clause(s):  # type: (str) -> IfClause
+    """Parse the if clause, parsed clauses are shared and must not be modified"""
     return BOOL_EXPR.parseString(s, parseAll=True)[0]
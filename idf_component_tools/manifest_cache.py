@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Validated manifests and lock files kept in the build directory between runs"""
+
+import hashlib
+import os
+import pickle  # noqa: S403
+import sys
+import tempfile
+import typing as t
+
+import pydantic
+
+from idf_component_tools.__version__ import __version__
+from idf_component_tools.messages import debug
+
+if t.TYPE_CHECKING:
+    from idf_component_tools.utils import BaseModel
+
+MANIFEST_CACHE_FILENAME = 'component_manager_manifests.pickle'
+MANIFEST_CACHE_SIZE = 1024
+
+# Pickled models can only be loaded by the same versions of the classes
+CACHE_VERSION = '{}:{}:{}.{}'.format(__version__, pydantic.VERSION, *sys.version_info[:2])
+
+
+def manifest_cache_path(build_dir: t.Union[str, os.PathLike]) -> str:
+    return os.path.join(build_dir, MANIFEST_CACHE_FILENAME)
+
+
+class ManifestCache:
+    """
+    Validated manifests and lock files stored in the build directory.
+
+    CMake runs the Component Manager several times during one configuration
+    (``prepare_dependencies``, possibly repeated for missing Kconfig options,
+    then ``inject_requirements``). Each run loads the same manifests and lock file,
+    so validated models are stored pickled, keyed by the content of the file,
+    and loaded without parsing and validating them again.
+
+    The cache is dropped when the version of the Component Manager, pydantic or
+    Python changes. As other files of the build directory, it's trusted.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._entries: t.Dict[str, bytes] = {}
+        self._used: t.Dict[str, bytes] = {}
+        self._changed = False
+
+    @staticmethod
+    def key(content: str, *context: t.Optional[str]) -> str:
+        """
+        Key of the file content, and of the context the file was validated in.
+        For example, the path of the file is a part of the context,
+        as dependencies with a local path are resolved relative to it.
+        """
+        return hashlib.sha256(
+            '\0'.join([content, *(value or '' for value in context)]).encode('utf-8')
+        ).hexdigest()
+
+    def load(self) -> None:
+        try:
+            with open(self._path, 'rb') as f:
+                data = pickle.load(f)  # noqa: S301
+            if data['version'] == CACHE_VERSION:
+                self._entries = dict(data['entries'])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            debug('Ignoring unreadable manifest cache %s: %s', self._path, e)
+
+    def get(self, key: str) -> t.Any:
+        """The validated model, or None if it's not cached"""
+        data = self._entries.get(key)
+        if data is None:
+            return None
+
+        try:
+            model = pickle.loads(data)  # noqa: S301
+        except Exception as e:
+            debug('Ignoring unreadable cached model: %s', e)
+            return None
+
+        self._used[key] = data
+        return model
+
+    def set(self, key: str, model: 'BaseModel') -> None:
+        """Store the validated model, detached from its manifest manager"""
+        model = model.model_copy()
+        model._manifest_manager = None
+        self._used[key] = self._entries[key] = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the cache if new manifests were validated, keeping manifests used in this run"""
+        if not self._changed:
+            return
+
+        entries = dict(self._used)
+        for key, data in self._entries.items():
+            if len(entries) >= MANIFEST_CACHE_SIZE:
+                break
+            entries.setdefault(key, data)
+
+        directory = os.path.dirname(self._path)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(
+                        {'version': CACHE_VERSION, 'entries': entries},
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            debug('Cannot save manifest cache %s: %s', self._path, e)
+            return
+
+        self._changed = False
+
+
+_manifest_cache: t.Optional[ManifestCache] = None
+
+
+def get_manifest_cache() -> t.Optional[ManifestCache]:
+    return _manifest_cache
+
+
+def set_manifest_cache(cache: t.Optional[ManifestCache]) -> None:
+    """
+    Use the cache for manifests and lock files loaded by ``ManifestManager`` and ``LockManager``.
+    Pass None to stop using the cache.
+    """
+    global _manifest_cache
+    _manifest_cache = cache
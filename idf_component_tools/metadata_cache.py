@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Persistent cache of component metadata confirmed by the Component Registry"""
+
+import json
+import os
+import tempfile
+import time
+import typing as t
+
+from idf_component_tools import ComponentManagerSettings
+from idf_component_tools.file_cache import FileCache
+from idf_component_tools.messages import debug
+
+if t.TYPE_CHECKING:
+    from idf_component_tools.sources import BaseSource
+
+METADATA_CACHE_DIR = 'metadata'
+VERIFIED_VERSIONS_FILENAME = 'verified_versions.json'
+
+
+def dump_json_atomic(path: str, data: t.Any) -> None:
+    """Write JSON to the file, readers never see a partially written file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class VerifiedVersionsCache:
+    """
+    Hashes of component versions that were confirmed by the registry.
+
+    Entries are kept per source and expire after ``IDF_COMPONENT_METADATA_CACHE_TTL``
+    seconds. The cache is disabled if the TTL is 0.
+    """
+
+    def __init__(self, path: t.Optional[str] = None, ttl: t.Optional[int] = None) -> None:
+        self.ttl = ComponentManagerSettings().METADATA_CACHE_TTL if ttl is None else ttl
+        self.enabled = self.ttl > 0
+        self._path = path
+        self._entries: t.Optional[t.Dict[str, t.Dict[str, t.Tuple[str, float]]]] = None
+        self._updated: t.Dict[str, t.Dict[str, t.Tuple[str, float]]] = {}
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(
+                FileCache().path(), METADATA_CACHE_DIR, VERIFIED_VERSIONS_FILENAME
+            )
+
+        return self._path
+
+    @staticmethod
+    def _key(name: str, version: str) -> str:
+        return f'{name}@{version}'
+
+    def _read(self) -> t.Dict[str, t.Dict[str, t.Tuple[str, float]]]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                debug('Ignoring unreadable metadata cache %s: %s', self.path, e)
+            return {}
+
+        if not isinstance(data, dict):
+            return {}
+
+        now = time.time()
+        return {
+            source: {
+                key: (entry[0], entry[1])
+                for key, entry in entries.items()
+                if isinstance(entry, list) and len(entry) == 2 and now - entry[1] < self.ttl
+            }
+            for source, entries in data.items()
+            if isinstance(entries, dict)
+        }
+
+    def get(self, source: 'BaseSource', name: str, version: str) -> t.Optional[str]:
+        """Return the component hash if the version was verified recently"""
+        if not self.enabled:
+            return None
+
+        if self._entries is None:
+            self._entries = self._read()
+
+        entry = self._entries.get(source.hash_key, {}).get(self._key(name, version))
+        return entry[0] if entry else None
+
+    def add(self, source: 'BaseSource', name: str, version: str, component_hash: str) -> None:
+        """Record a component hash confirmed by the registry, written by ``save``"""
+        if not self.enabled:
+            return
+
+        self._updated.setdefault(source.hash_key, {})[self._key(name, version)] = (
+            component_hash,
+            time.time(),
+        )
+
+    def save(self) -> None:
+        """Merge recorded entries into the cache file, dropping expired ones"""
+        if not self._updated:
+            return
+
+        # Re-read to keep entries written by other processes in the meantime
+        data = self._read()
+        for source, entries in self._updated.items():
+            data.setdefault(source, {}).update(entries)
+
+        try:
+            dump_json_atomic(self.path, data)
+        except OSError as e:
+            debug('Cannot write metadata cache %s: %s', self.path, e)
+            return
+
+        self._entries = data
+        self._updated = {}
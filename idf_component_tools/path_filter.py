@@ -0,0 +1,537 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+"""Single-pass path filtering with glob patterns compiled into one automaton.
+
+Patterns follow ``pathlib.Path.glob`` semantics:
+
+- ``*``, ``?`` and ``[...]`` match within a single path component, hidden files included
+- ``**`` matches zero or more directories, without descending into symlinked directories
+- any other component matches an entry by name, following symlinks for intermediate components
+
+All patterns of the same kind (include or exclude) are merged into a single
+non-deterministic automaton over path components. The directory tree is walked once,
+and each entry advances the set of active states of every pattern at the same time.
+Transitions are cached by entry name and kind, so repeated names (``CMakeLists.txt``,
+``include``, ``src``, ...) are matched only once per state set.
+"""
+
+import codecs
+import fnmatch
+import os
+import re
+import sys
+import typing as t
+from functools import lru_cache
+from pathlib import Path, PurePath
+
+# Entry kinds used by the automaton, directories go last
+FILE = 0
+BROKEN_SYMLINK = 1
+SYMLINK_DIR = 2
+DIR = 3
+
+# Marker for the recursive `**` pattern segment
+_RECURSIVE = None
+
+_IGNORECASE = os.path.normcase('Aa') != 'Aa'
+
+# Before Python 3.12 pattern components without wildcards match only existing paths
+_LITERAL_REQUIRES_EXISTENCE = sys.version_info < (3, 12)
+
+
+class _Segment(t.NamedTuple):
+    match: t.Callable[[str], t.Any]
+    literal: bool
+
+
+_SegmentMatcher = t.Optional[_Segment]
+
+
+class UnsupportedPatternError(ValueError):
+    """Pattern can't be compiled and has to be evaluated by ``Path.glob``"""
+
+
+def compile_glob(pattern: str) -> t.Tuple[_SegmentMatcher, ...]:
+    """Compile glob pattern into a tuple of segment matchers.
+
+    ``None`` in the result stands for the recursive ``**`` segment.
+    Raises UnsupportedPatternError for patterns with semantics that differ
+    between Python versions (trailing ``**`` or separator, ``..``, absolute paths).
+    """
+
+    if not pattern or pattern[-1] in (os.sep, os.altsep):
+        raise UnsupportedPatternError(pattern)
+
+    pure = PurePath(pattern)
+    if pure.anchor:
+        raise UnsupportedPatternError(pattern)
+
+    parts = pure.parts
+    if not parts or parts[-1] == '**':
+        raise UnsupportedPatternError(pattern)
+
+    flags = re.IGNORECASE if _IGNORECASE else 0
+    segments: t.List[_SegmentMatcher] = []
+    for part in parts:
+        if part == '**':
+            segments.append(_RECURSIVE)
+        elif part == '..' or '**' in part:
+            raise UnsupportedPatternError(pattern)
+        else:
+            segments.append(
+                _Segment(
+                    match=re.compile(fnmatch.translate(part), flags).match,
+                    literal=not any(char in part for char in '*?['),
+                )
+            )
+
+    return tuple(segments)
+
+
+def _is_universal(segments: t.Sequence[_SegmentMatcher], position: int) -> bool:
+    """Returns True if the pattern tail matches every path below the current directory"""
+    tail = segments[position:]
+    return (
+        len(tail) > 1
+        and all(segment is _RECURSIVE for segment in tail[:-1])
+        and tail[-1] is not _RECURSIVE
+        and tail[-1].match('') is not None  # only `*` matches an empty name
+    )
+
+
+class GlobAutomaton:
+    """Automaton matching paths against any of the given glob patterns.
+
+    States are represented by integer ids of sets of (pattern, position) pairs.
+    """
+
+    def __init__(self, patterns: t.Iterable[t.Tuple[_SegmentMatcher, ...]]) -> None:
+        self._patterns = list(patterns)
+
+        self._state_ids: t.Dict[t.FrozenSet[t.Tuple[int, int]], int] = {}
+        self._states: t.List[t.FrozenSet[t.Tuple[int, int]]] = []
+        self._universal: t.List[bool] = []
+        self._transitions: t.Dict[t.Tuple[int, str, int], t.Tuple[int, bool]] = {}
+
+        self.dead = self._intern(frozenset())
+        self.start = self._intern(self._closure((index, 0) for index in range(len(self._patterns))))
+
+    def _closure(self, states: t.Iterable[t.Tuple[int, int]]) -> t.FrozenSet[t.Tuple[int, int]]:
+        result = set()
+        for index, position in states:
+            segments = self._patterns[index]
+            result.add((index, position))
+            # `**` may match zero directories
+            while position < len(segments) and segments[position] is _RECURSIVE:
+                position += 1
+                result.add((index, position))
+
+        return frozenset(result)
+
+    def _intern(self, states: t.FrozenSet[t.Tuple[int, int]]) -> int:
+        state_id = self._state_ids.get(states)
+        if state_id is None:
+            state_id = len(self._states)
+            self._state_ids[states] = state_id
+            self._states.append(states)
+            self._universal.append(
+                any(_is_universal(self._patterns[index], position) for index, position in states)
+            )
+
+        return state_id
+
+    def is_universal(self, state: int) -> bool:
+        """Returns True if all paths below the directory in this state match"""
+        return self._universal[state]
+
+    def step(self, state: int, name: str, kind: int) -> t.Tuple[int, bool]:
+        """Advance automaton by one path component.
+
+        Returns the next state and whether the path ending with this component matches.
+        """
+        if state == self.dead:
+            return state, False
+
+        key = (state, name, kind)
+        cached = self._transitions.get(key)
+        if cached is not None:
+            return cached
+
+        next_states = []
+        matched = False
+        for index, position in self._states[state]:
+            segments = self._patterns[index]
+            if position == len(segments):
+                continue
+
+            segment = segments[position]
+            if segment is _RECURSIVE:
+                # `**` doesn't descend into symlinked directories
+                if kind == DIR:
+                    next_states.append((index, position))
+            elif segment.match(name) is not None:
+                if position + 1 == len(segments):
+                    if not (
+                        kind == BROKEN_SYMLINK and segment.literal and _LITERAL_REQUIRES_EXISTENCE
+                    ):
+                        matched = True
+                elif kind >= SYMLINK_DIR:
+                    next_states.append((index, position + 1))
+
+        result = (self._intern(self._closure(next_states)), matched)
+        self._transitions[key] = result
+        return result
+
+
+def _entry_kind(entry: os.DirEntry) -> int:
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            return DIR
+
+        if entry.is_symlink():
+            if entry.is_dir():
+                return SYMLINK_DIR
+
+            if not os.path.exists(entry.path):
+                return BROKEN_SYMLINK
+    except OSError:
+        pass
+
+    return FILE
+
+
+GITIGNORE_FILENAME = '.gitignore'
+
+# Git initializes `core.ignorecase` by probing the file system, it's true on Windows and macOS
+_GITIGNORE_IGNORECASE = _IGNORECASE or sys.platform == 'darwin'
+
+_POSIX_CHARACTER_CLASSES = {
+    'alnum': 'a-zA-Z0-9',
+    'alpha': 'a-zA-Z',
+    'blank': ' \\t',
+    'cntrl': '\\x00-\\x1f\\x7f',
+    'digit': '0-9',
+    'graph': '\\x21-\\x7e',
+    'lower': 'a-z',
+    'print': '\\x20-\\x7e',
+    'punct': '!-/:-@\\[-`{-~',
+    'space': ' \\t\\n\\r\\f\\v',
+    'upper': 'A-Z',
+    'xdigit': '0-9A-Fa-f',
+}
+
+
+class GitignoreRule(t.NamedTuple):
+    match: t.Callable[[str], t.Any]
+    negated: bool
+    # Pattern ends with a slash and matches only directories
+    dir_only: bool
+    # Pattern without a slash is matched against the name of a file at any level
+    basename: bool
+
+
+def _translate_bracket(pattern: str, start: int) -> t.Optional[t.Tuple[str, int]]:
+    """Translate bracket expression starting at `start` to a regex.
+
+    Returns the regex and the position after the expression,
+    or None if the expression is invalid and the pattern never matches.
+    """
+    i = start + 1
+    negated = i < len(pattern) and pattern[i] in '!^'
+    if negated:
+        i += 1
+
+    items = []
+    first = True
+    while i < len(pattern) and (first or pattern[i] != ']'):
+        first = False
+        char = pattern[i]
+        if char == '[' and pattern.startswith('[:', i):
+            end = pattern.find(':]', i + 2)
+            if end != -1:
+                character_class = _POSIX_CHARACTER_CLASSES.get(pattern[i + 2 : end])
+                if character_class is None:
+                    return None
+                items.append(character_class)
+                i = end + 2
+                continue
+
+        if char == '\\':
+            i += 1
+            if i == len(pattern):
+                return None
+            char = pattern[i]
+
+        i += 1
+        if i + 1 < len(pattern) and pattern[i] == '-' and pattern[i + 1] != ']':
+            range_end = pattern[i + 1]
+            i += 2
+            if range_end == '\\':
+                if i == len(pattern):
+                    return None
+                range_end = pattern[i]
+                i += 1
+            if char <= range_end:
+                items.append(f'{re.escape(char)}-{re.escape(range_end)}')
+        else:
+            items.append(re.escape(char))
+
+    if i == len(pattern):
+        return None
+
+    # Bracket expressions never match the directory separator
+    if negated:
+        return '[^/{}]'.format(''.join(items)), i + 1
+
+    if not items:
+        return '(?!)', i + 1
+
+    return '(?!/)[{}]'.format(''.join(items)), i + 1
+
+
+def _translate_gitignore_pattern(pattern: str) -> t.Optional[str]:
+    """Translate gitignore pattern to a regex, following git's wildmatch rules"""
+    result = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 1
+            if i == len(pattern):
+                return None
+            result.append(re.escape(pattern[i]))
+            i += 1
+        elif char == '*':
+            end = i
+            while end < len(pattern) and pattern[end] == '*':
+                end += 1
+
+            # `**` is special only as a whole path component
+            if end - i > 1 and (i == 0 or pattern[i - 1] == '/'):
+                if end == len(pattern):
+                    result.append('.*')
+                elif pattern[end] == '/':
+                    result.append('(?:.*/)?')
+                    end += 1
+                else:
+                    result.append('[^/]*')
+            else:
+                result.append('[^/]*')
+            i = end
+        elif char == '?':
+            result.append('[^/]')
+            i += 1
+        elif char == '[':
+            bracket = _translate_bracket(pattern, i)
+            if bracket is None:
+                return None
+            expression, i = bracket
+            result.append(expression)
+        else:
+            result.append(re.escape(char))
+            i += 1
+
+    return ''.join(result)
+
+
+def _trim_trailing_spaces(line: str) -> str:
+    end = len(line)
+    while end and line[end - 1] == ' ':
+        backslashes = 0
+        while end - backslashes - 2 >= 0 and line[end - backslashes - 2] == '\\':
+            backslashes += 1
+        # Escaped space is kept
+        if backslashes % 2:
+            break
+        end -= 1
+
+    return line[:end]
+
+
+def parse_gitignore(lines: t.Iterable[str]) -> t.Tuple[GitignoreRule, ...]:
+    """Parse lines of a .gitignore file"""
+    flags = re.IGNORECASE if _GITIGNORE_IGNORECASE else 0
+    rules = []
+    for line in lines:
+        if line.endswith('\r'):
+            line = line[:-1]
+
+        line = _trim_trailing_spaces(line)
+        if not line or line.startswith('#'):
+            continue
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        if dir_only:
+            line = line[:-1]
+
+        basename = '/' not in line
+        if line.startswith('/'):
+            line = line[1:]
+
+        regex = _translate_gitignore_pattern(line)
+        if not line or regex is None:
+            continue
+
+        rules.append(
+            GitignoreRule(
+                match=re.compile(regex, flags | re.DOTALL).fullmatch,
+                negated=negated,
+                dir_only=dir_only,
+                basename=basename,
+            )
+        )
+
+    return tuple(rules)
+
+
+@lru_cache(maxsize=256)
+def _load_gitignore(path: str, mtime_ns: int, size: int) -> t.Tuple[GitignoreRule, ...]:  # noqa: ARG001
+    """Parse .gitignore file, cached by its path, modification time and size"""
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    if content.startswith(codecs.BOM_UTF8):
+        content = content[len(codecs.BOM_UTF8) :]
+
+    return parse_gitignore(os.fsdecode(content).split('\n'))
+
+
+def _gitignore_rules(entries: t.Iterable[os.DirEntry]) -> t.Tuple[GitignoreRule, ...]:
+    for entry in entries:
+        if entry.name != GITIGNORE_FILENAME:
+            continue
+
+        try:
+            # Like git, don't follow symbolic links
+            if not entry.is_file(follow_symlinks=False):
+                break
+
+            stat = entry.stat(follow_symlinks=False)
+            return _load_gitignore(entry.path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            break
+
+    return ()
+
+
+def _is_gitignored(
+    gitignores: t.Tuple[t.Tuple[str, t.Tuple[GitignoreRule, ...]], ...],
+    rel_path: str,
+    name: str,
+    is_dir: bool,
+) -> bool:
+    # .gitignore files in deeper directories take precedence, and the last matching rule wins
+    for rel_dir, rules in reversed(gitignores):
+        subpath = rel_path[len(rel_dir) + 1 :] if rel_dir else rel_path
+        for rule in reversed(rules):
+            if rule.dir_only and not is_dir:
+                continue
+
+            if rule.match(name if rule.basename else subpath):
+                return not rule.negated
+
+    return False
+
+
+def walk_filtered(
+    path: t.Union[str, Path],
+    include: GlobAutomaton,
+    exclude: GlobAutomaton,
+    use_gitignore: bool = False,
+) -> t.Tuple[t.Set[Path], t.Set[Path]]:
+    """Walk the directory tree once and apply include and exclude patterns.
+
+    Returns a tuple of:
+
+    - files (not directories) under the path, not matched by exclude patterns
+      and not ignored by .gitignore files if `use_gitignore` is True
+    - paths matched by include patterns, including directories
+
+    Directories whose whole content is excluded are not descended into,
+    unless some include pattern may still match paths inside of them.
+
+    .gitignore files are evaluated the same way as `git ls-files --others --ignored`
+    does for an empty repository with the work tree at the path.
+    Like in git, entries named `.git` are never ignored.
+    """
+    kept: t.Set[Path] = set()
+    included: t.Set[Path] = set()
+
+    if not os.path.isdir(path):
+        return kept, included
+
+    # .gitignore files of the directory and its parents, as (relative path, rules) pairs
+    gitignores: t.Optional[t.Tuple[t.Tuple[str, t.Tuple[GitignoreRule, ...]], ...]]
+    gitignores = () if use_gitignore else None
+
+    # (directory, relative path, collect files, exclude state, include state, gitignores)
+    stack: t.List[
+        t.Tuple[
+            str,
+            str,
+            bool,
+            int,
+            int,
+            t.Optional[t.Tuple[t.Tuple[str, t.Tuple[GitignoreRule, ...]], ...]],
+        ]
+    ] = [(str(path), '', True, exclude.start, include.start, gitignores)]
+    while stack:
+        directory, rel_dir, collect, exclude_state, include_state, gitignores = stack.pop()
+
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except PermissionError:
+            continue
+
+        if collect and gitignores is not None:
+            rules = _gitignore_rules(entries)
+            if rules:
+                gitignores += ((rel_dir, rules),)
+
+        for entry in entries:
+            name = entry.name
+            kind = _entry_kind(entry)
+            entry_path = os.path.join(directory, name)
+            rel_path = f'{rel_dir}/{name}' if rel_dir else name
+
+            next_include, include_matched = include.step(include_state, name, kind)
+            if include_matched:
+                included.add(Path(entry_path))
+
+            next_exclude = exclude.dead
+            child_collect = False
+            child_gitignores = None
+            if collect:
+                next_exclude, excluded = exclude.step(exclude_state, name, kind)
+
+                ignored = False
+                if gitignores is not None and name != '.git':
+                    child_gitignores = gitignores
+                    ignored = _is_gitignored(gitignores, rel_path, name, kind == DIR)
+
+                if kind < SYMLINK_DIR:
+                    if not (excluded or ignored):
+                        kept.add(Path(entry_path))
+                else:
+                    # Content of symlinked directories is not a part of the tree,
+                    # and files in ignored directories can't be re-included by .gitignore
+                    child_collect = kind == DIR and not (
+                        ignored or exclude.is_universal(next_exclude)
+                    )
+
+            if kind >= SYMLINK_DIR and (child_collect or next_include != include.dead):
+                stack.append((
+                    entry_path,
+                    rel_path,
+                    child_collect,
+                    next_exclude,
+                    next_include,
+                    child_gitignores,
+                ))
+
+    return kept, included
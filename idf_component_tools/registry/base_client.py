@@ -119,24 +119,23 @@ class BaseClient:
 
         component_response = ComponentResponse(**request('get', ['components', component_name]))
 
+        component_response.versions = sorted(
+            component_response.versions, key=_response_version, reverse=True
+        )
+
         # here we don't use filter_versions because we don't need to
         # filter by target
         # filter yanked versions
         if spec != '*':
-            versions = []
-            required_spec = SimpleSpec(spec)
-            for version in component_response.versions:
-                if not required_spec.match(Version(version.version)):
-                    continue
-                versions.append(version)
+            component_response.versions = SimpleSpec.intern(spec).filter_many(
+                component_response.versions, key=_response_version, reverse=True
+            )
 
-            component_response.versions = versions
+        return component_response
 
-        component_response.versions = sorted(
-            component_response.versions, key=lambda v: Version(v.version), reverse=True
-        )
 
-        return component_response
+def _response_version(version: VersionResponse) -> Version:
+    return Version.intern(version.version)
 
 
 def filter_versions(
@@ -144,13 +143,17 @@ def filter_versions(
     spec: t.Optional[str],
     component_name: str,
 ) -> t.List[VersionResponse]:
+    """
+    Filter versions by spec, versions must be sorted by semver, descending,
+    as returned by get_component_response.
+    """
     component_name = component_name.lower()
     filtered_versions = []
     yanked_versions = []
 
     # filter by spec
-    required_spec = SimpleSpec(str(spec or '*'))
-    versions = [version for version in versions if required_spec.match(Version(version.version))]
+    required_spec = SimpleSpec.intern(spec or '*')
+    versions = required_spec.filter_many(versions, key=_response_version, reverse=True)
 
     # divide versions into yanked and not yanked
     for version in versions:
@@ -220,7 +220,7 @@ class MultiStorageClient:
                     # to make sure the spec is solvable
                     prerelease_versions, stable_versions = [], []
                     for version in new_res.versions:
-                        if Version(version.version).prerelease:
+                        if Version.intern(version.version).prerelease:
                             prerelease_versions.append(version)
                         else:
                             stable_versions.append(version)
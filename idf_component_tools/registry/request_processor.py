@@ -30,6 +30,22 @@ DEFAULT_REQUEST_TIMEOUT = (
 # Storage for caching requests
 _request_cache: t.Dict[t.Tuple[t.Any], Response] = {}
 
+# JSON responses of GET requests by endpoint, shared with other processes of the same build
+_response_snapshot: t.Optional[t.Dict[str, t.Any]] = None
+
+
+def get_response_snapshot() -> t.Optional[t.Dict[str, t.Any]]:
+    return _response_snapshot
+
+
+def set_response_snapshot(snapshot: t.Optional[t.Dict[str, t.Any]]) -> None:
+    """
+    Serve GET requests from the snapshot and record new responses to it.
+    Pass None to stop using the snapshot.
+    """
+    global _response_snapshot
+    _response_snapshot = snapshot
+
 
 def join_url(*args) -> str:
     """
@@ -238,6 +254,14 @@ def base_request(
 ) -> t.Dict:
     endpoint = join_url(url, *path)
 
+    snapshot = _response_snapshot if method.lower() == 'get' and not do_not_cache else None
+    if snapshot is not None and endpoint in snapshot:
+        debug(f'HTTP request: {method.upper()} {endpoint} (from the snapshot)')
+        # responses from the snapshot are validated as well, the schema is not a part of the key
+        response_json = deepcopy(snapshot[endpoint])
+        _validate_response(response_json, endpoint, schema)
+        return response_json
+
     request_timeout: t.Optional[t.Union[float, t.Tuple[float, float]]] = (
         ComponentManagerSettings().API_TIMEOUT or timeout
     )
@@ -256,9 +280,20 @@ def base_request(
         do_not_cache=do_not_cache,
     )
     response_json = handle_response_errors(response, endpoint, use_storage)
+    _validate_response(response_json, endpoint, schema)
+
+    # only valid responses are shared with the next runs
+    if snapshot is not None:
+        snapshot[endpoint] = deepcopy(response_json)
+
+    return response_json
 
+
+def _validate_response(
+    response_json: t.Dict, endpoint: str, schema: t.Optional[ApiBaseModel] = None
+) -> None:
     if schema is None:
-        return response_json
+        return
 
     try:
         # model validation will modify the response_json, so we need to deepcopy it
@@ -273,5 +308,3 @@ def base_request(
         )
     except (ValueError, KeyError, IndexError):
         raise APIClientError('Unexpected component server response', endpoint=endpoint)
-
-    return response_json
@@ -3,78 +3,70 @@
 # SPDX-FileContributor: 2022-2025 Espressif Systems (Shanghai) CO LTD
 from __future__ import annotations
 
+import bisect
 import functools
 import re
 import typing as t
 
+# Number of distinct strings kept by the interning caches
+INTERN_CACHE_SIZE = 8192
+
 
 def _has_leading_zero(value):
     return value and value[0] == '0' and value.isdigit() and value != '0'
 
 
-class MaxIdentifier:
-    __slots__: t.List[str] = []
-
-    def __repr__(self):
-        return 'MaxIdentifier()'
-
-    def __eq__(self, other):
-        return isinstance(other, self.__class__)
+@functools.lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _parse_version(version_string):
+    return Version.parse(version_string)
 
 
-@functools.total_ordering
-class NumericIdentifier:
-    __slots__ = ['value']
+@functools.lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _intern_version(version_string):
+    return Version(version_string)
 
-    def __init__(self, value):
-        self.value = int(value)
 
-    def __repr__(self):
-        return f'NumericIdentifier({self.value!r})'
+@functools.lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _parse_simple_spec(expression):
+    return SimpleSpec.Parser.parse(expression)
 
-    def __eq__(self, other):
-        if isinstance(other, NumericIdentifier):
-            return self.value == other.value
-        return NotImplemented
 
-    def __lt__(self, other):
-        if isinstance(other, MaxIdentifier):
-            return True
-        elif isinstance(other, AlphaIdentifier):
-            return True
-        elif isinstance(other, NumericIdentifier):
-            return self.value < other.value
-        else:
-            return NotImplemented
+@functools.lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _intern_simple_spec(expression):
+    return SimpleSpec(expression)
 
 
-@functools.total_ordering
-class AlphaIdentifier:
-    __slots__ = ['value']
+# Precedence key of the release part, it is higher than any prerelease key
+_RELEASE_KEY = (1,)
+# Precedence key lower than any prerelease key
+_LOWEST_PRERELEASE_KEY = (0, ())
 
-    def __init__(self, value):
-        self.value = value.encode('ascii')
 
-    def __repr__(self):
-        return f'AlphaIdentifier({self.value!r})'
+def _precedence_key(major, minor, patch, revision, prerelease):
+    """Key of the version precedence made of plain tuples of ints and strings.
 
-    def __eq__(self, other):
-        if isinstance(other, AlphaIdentifier):
-            return self.value == other.value
-        return NotImplemented
+    Numeric prerelease identifiers are lower than alphanumeric ones,
+    and a release is higher than any of its prereleases.
+    """
+    if prerelease:
+        prerelease_key = (
+            0,
+            tuple(
+                (0, int(part)) if part.isdigit() and part.isascii() else (1, part)
+                for part in prerelease
+            ),
+        )
+    else:
+        prerelease_key = _RELEASE_KEY
 
-    def __lt__(self, other):
-        if isinstance(other, MaxIdentifier):
-            return True
-        elif isinstance(other, NumericIdentifier):
-            return False
-        elif isinstance(other, AlphaIdentifier):
-            return self.value < other.value
-        else:
-            return NotImplemented
+    return major, minor, patch, revision, prerelease_key
 
 
 class Version:
+    # Numeric parts are only stored in the precedence key to keep instances small.
+    # Instances are immutable, as the interned ones are shared.
+    __slots__ = ('_key', '_hash', '_prerelease', '_build')
+
     version_re = re.compile(
         r'^(\d+)\.(\d+)\.(\d+)(?:~(\d+))?(?:-([0-9a-zA-Z.-]+))?(?:\+([0-9a-zA-Z.-]+))?$'
     )
@@ -95,7 +87,12 @@ class Version:
             raise ValueError("Call either Version('1.2.3') or Version(major=1, ...).")
 
         if has_text:
-            major, minor, patch, revision, prerelease, build = self.parse(version_string)
+            # Parsed components are immutable, so they are shared between equal strings
+            if type(version_string) is str:
+                parsed = _parse_version(version_string)
+            else:
+                parsed = self.parse(version_string)
+            major, minor, patch, revision, prerelease, build = parsed
         else:
             revision = revision or 0
             # Convenience: allow to omit prerelease/build.
@@ -103,12 +100,40 @@ class Version:
             build = tuple(build or ())
             self._validate_kwargs(major, minor, patch, revision, prerelease, build)
 
-        self.major = major
-        self.minor = minor
-        self.patch = patch
-        self.revision = revision
-        self.prerelease = prerelease
-        self.build = build
+        self._prerelease = prerelease
+        self._build = build
+        # Versions are compared and hashed a lot while solving, so both are computed once
+        self._key = _precedence_key(major, minor, patch, revision, prerelease)
+        self._hash = hash((self._key, build))
+
+    @property
+    def major(self):
+        return self._key[0]
+
+    @property
+    def minor(self):
+        return self._key[1]
+
+    @property
+    def patch(self):
+        return self._key[2]
+
+    @property
+    def revision(self):
+        return self._key[3]
+
+    @property
+    def prerelease(self):
+        return self._prerelease
+
+    @property
+    def build(self):
+        return self._build
+
+    @classmethod
+    def intern(cls, version_string: str) -> Version:
+        """Return a shared instance for the version string, it must not be modified."""
+        return _intern_version(str(version_string))
 
     @classmethod
     def _coerce(cls, value, allow_none=False):
@@ -361,32 +386,11 @@ class Version:
         )
 
     def __hash__(self):
-        return hash((
-            self.major,
-            self.minor,
-            self.patch,
-            self.revision,
-            self.prerelease,
-            self.build,
-        ))
+        return self._hash
 
     @property
     def precedence_key(self):
-        if self.prerelease:
-            prerelease_key = tuple(
-                NumericIdentifier(part) if re.match(r'^[0-9]+$', part) else AlphaIdentifier(part)
-                for part in self.prerelease
-            )
-        else:
-            prerelease_key = (MaxIdentifier(),)
-
-        return (
-            self.major,
-            self.minor,
-            self.patch,
-            self.revision,
-            prerelease_key,
-        )
+        return self._key
 
     def __cmp__(self, other):
         if not isinstance(other, self.__class__):
@@ -403,39 +407,32 @@ class Version:
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return (
-            self.major == other.major
-            and self.minor == other.minor
-            and self.patch == other.patch
-            and (self.revision == other.revision)
-            and (self.prerelease or ()) == (other.prerelease or ())
-            and (self.build or ()) == (other.build or ())
-        )
+        return self._key == other._key and self._build == other._build
 
     def __ne__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return tuple(self) != tuple(other)
+        return self._key != other._key or self._build != other._build
 
     def __lt__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return self.precedence_key < other.precedence_key
+        return self._key < other._key
 
     def __le__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return self.precedence_key <= other.precedence_key
+        return self._key <= other._key
 
     def __gt__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return self.precedence_key > other.precedence_key
+        return self._key > other._key
 
     def __ge__(self, other):
         if not isinstance(other, self.__class__):
             return NotImplemented
-        return self.precedence_key >= other.precedence_key
+        return self._key >= other._key
 
 
 def compare(v1, v2):
@@ -470,10 +467,21 @@ class BaseSpec:
     )
     """
 
+    # Instances are immutable, as the interned ones are shared
+    __slots__ = ('_expression', '_clause')
+
     def __init__(self, expression):
         super().__init__()
-        self.expression = expression
-        self.clause = self._parse_to_clause(expression)
+        self._expression = expression
+        self._clause = self._parse_to_clause(expression)
+
+    @property
+    def expression(self):
+        return self._expression
+
+    @property
+    def clause(self):
+        return self._clause
 
     @classmethod
     def parse(cls, expression):
@@ -495,6 +503,46 @@ class BaseSpec:
         """Check whether a Version satisfies the Spec."""
         return self.clause.match(version)
 
+    def filter_many(self, versions, key=None, reverse=False):
+        """Return the list of versions satisfying the Spec, keeping their order.
+
+        The versions must be sorted, ascending or descending if ``reverse`` is set.
+        The matching slice is found by bisecting on the bounds of the Spec, only
+        versions in that slice are matched one by one, if the Spec has clauses
+        without bounds or excluding pre-releases inside of the bounds.
+
+        Args:
+            versions: sorted sequence of versions, or of objects converted by ``key``
+            key: function returning the Version of an item
+            reverse: whether the versions are sorted in descending order
+        """
+        items = list(reversed(versions)) if reverse else list(versions)
+        if key is None:
+            get_version = None
+
+            def precedence_key(item):
+                return item._key
+
+        else:
+            get_version = key
+
+            def precedence_key(item):
+                return key(item)._key
+
+        lo, hi, exact = self.clause.bounds(items, precedence_key)
+        matching = items[lo:hi]
+        if not exact:
+            matching = [
+                item
+                for item in matching
+                if self.clause.match(item if get_version is None else get_version(item))
+            ]
+
+        if reverse:
+            matching.reverse()
+
+        return matching
+
     def select(self, versions):
         """Select the best compatible version among an iterable of options."""
         options = list(self.filter(versions))
@@ -570,6 +618,15 @@ class Clause:
     def simplify(self):
         return self
 
+    def bounds(self, versions, key):  # noqa: ARG002
+        """Find the slice of sorted versions which may satisfy the clause.
+
+        Returns:
+            A tuple of the slice start, end, and whether all versions in the slice
+            satisfy the clause.
+        """
+        return 0, len(versions), False
+
 
 class AnyOf(Clause):
     __slots__ = ['clauses']
@@ -644,6 +701,14 @@ class AllOf(Clause):
     def match(self, version):
         return all(clause.match(version) for clause in self.clauses)
 
+    def bounds(self, versions, key):
+        lo, hi, exact = 0, len(versions), True
+        for clause in self.clauses:
+            clause_lo, clause_hi, clause_exact = clause.bounds(versions, key)
+            lo, hi, exact = max(lo, clause_lo), min(hi, clause_hi), exact and clause_exact
+
+        return lo, max(lo, hi), exact
+
     def simplify(self):
         subclauses = set()
         for clause in self.clauses:
@@ -725,6 +790,9 @@ class Never(Matcher):
     def match(self, version):  # noqa: ARG002
         return False
 
+    def bounds(self, versions, key):  # noqa: ARG002
+        return 0, 0, True
+
     def __hash__(self):
         return hash((Never,))
 
@@ -747,6 +815,9 @@ class Always(Matcher):
     def match(self, version):  # noqa: ARG002
         return True
 
+    def bounds(self, versions, key):  # noqa: ARG002
+        return 0, len(versions), True
+
     def __hash__(self):
         return hash((Always,))
 
@@ -845,6 +916,36 @@ class Range(Matcher):
                 return False
             return version != self.target
 
+    def bounds(self, versions, key):
+        target = self.target._key
+        # Pre-releases of other patches are excluded inside of the bounds
+        exact = self.prerelease_policy != self.PRERELEASE_SAMEPATCH
+
+        if self.operator == self.OP_EQ:
+            return (
+                bisect.bisect_left(versions, target, key=key),
+                bisect.bisect_right(versions, target, key=key),
+                exact and self.build_policy != self.BUILD_STRICT,
+            )
+        elif self.operator == self.OP_GT:
+            return bisect.bisect_right(versions, target, key=key), len(versions), exact
+        elif self.operator == self.OP_GTE:
+            return bisect.bisect_left(versions, target, key=key), len(versions), exact
+        elif self.operator == self.OP_LT:
+            if self.prerelease_policy == self.PRERELEASE_NATURAL and not self.target.prerelease:
+                if self.target.revision:
+                    # <1.2.3~1 doesn't match 1.2.3-a1, but matches 1.2.3
+                    exact = False
+                else:
+                    # <1.2.3 doesn't match 1.2.3-a1, the bound is below pre-releases of 1.2.3
+                    target = (*target[:4], _LOWEST_PRERELEASE_KEY)
+
+            return 0, bisect.bisect_left(versions, target, key=key), exact
+        elif self.operator == self.OP_LTE:
+            return 0, bisect.bisect_right(versions, target, key=key), exact
+
+        return super().bounds(versions, key)
+
     def __hash__(self):
         return hash((Range, self.operator, self.target, self.prerelease_policy))
 
@@ -873,10 +974,20 @@ class Range(Matcher):
 
 
 class SimpleSpec(BaseSpec):
+    __slots__ = ()
+
     @classmethod
     def _parse_to_clause(cls, expression):
+        # Clauses are immutable, so they are shared between equal expressions
+        if type(expression) is str:
+            return _parse_simple_spec(expression)
         return cls.Parser.parse(expression)
 
+    @classmethod
+    def intern(cls, expression: str) -> SimpleSpec:
+        """Return a shared instance for the expression, it must not be modified."""
+        return _intern_simple_spec(str(expression))
+
     @classmethod
     def regex_str(cls):
         naive_spec_string = cls.Parser.NAIVE_SPEC.pattern
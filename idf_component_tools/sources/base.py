@@ -28,6 +28,9 @@ class BaseSource(BaseModel):
 
         self._hash_key = None
 
+        # Downloaded directories already verified against the expected hashes
+        self._verified_downloads: t.Set[str] = set()
+
         self._system_cache_path = (
             FileCache().path() if system_cache_path is None else system_cache_path
         )
@@ -92,6 +95,13 @@ class BaseSource(BaseModel):
         """
         return False
 
+    def is_download_verified(self, download_path: str) -> bool:
+        """
+        Returns True if the component was verified while it was downloaded to the path,
+        so it doesn't have to be validated again.
+        """
+        return os.path.abspath(download_path) in self._verified_downloads
+
     def normalized_name(self, name: str) -> str:
         return name
 
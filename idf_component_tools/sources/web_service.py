@@ -15,6 +15,8 @@ from pydantic import AliasChoices, Field, field_validator
 
 from idf_component_tools import debug, hint
 from idf_component_tools.archive_tools import (
+    ArchiveUnverifiableError,
+    ArchiveVerificationError,
     get_archive_extension,
     unpack_archive,
 )
@@ -200,16 +202,13 @@ class WebServiceSource(BaseSource):
         pre_release_versions = []
         newer_component_manager_versions = []
 
+        skip_pre_releases = not self.pre_release and not SimpleSpec.intern(spec).contains_prerelease
         for version in cmp_with_versions.versions:
             if target and version.targets and target not in version.targets:
                 other_targets_versions.append(version)
                 continue
 
-            if (
-                not self.pre_release
-                and version.semver.prerelease
-                and not SimpleSpec(spec).contains_prerelease
-            ):
+            if skip_pre_releases and version.semver.prerelease:
                 pre_release_versions.append(str(version))
                 continue
 
@@ -306,6 +305,7 @@ class WebServiceSource(BaseSource):
             try:
                 validate_hash_eq_hashdir(component_cache_path, component.component_hash)
                 copy_directory(component_cache_path, download_path)
+                self._verified_downloads.add(os.path.abspath(download_path))
                 return download_path
             except ValidatingHashError:
                 pass
@@ -330,10 +330,7 @@ class WebServiceSource(BaseSource):
                 url,
             )
 
-            # Download archive, unpack to the cache directory and copy to the download directory
             archive_path = download_archive(url, tempdir)
-            unpack_archive(archive_path, component_cache_path)
-            copy_directory(component_cache_path, download_path)
 
             debug(
                 'Downloading checksums for component %s@%s from %s',
@@ -342,11 +339,43 @@ class WebServiceSource(BaseSource):
                 checksums_url,
             )
 
-            # Download file hashes and copy to cache and download directories
             checksums_path = download_file(checksums_url, tempdir, filename=CHECKSUMS_FILENAME)
+            expected_checksums: t.Optional[ChecksumsModel] = None
+            try:
+                expected_checksums = ChecksumsManager(Path(tempdir)).load()
+            except ChecksumsParseError as e:
+                # The component is validated after the download anyway
+                debug('Cannot parse checksums, unpacking without verification: %s', str(e))
+
+            # Unpack archive to the cache directory, checking every file against the checksums,
+            # and copy to the download directory
+            verified = False
+            if expected_checksums and expected_checksums.files:
+                try:
+                    unpack_archive(
+                        archive_path,
+                        component_cache_path,
+                        expected_checksums=expected_checksums,
+                    )
+                    verified = True
+                except ArchiveUnverifiableError as e:
+                    # For example, the archive has files not listed in the checksums.
+                    # The component is validated after the download anyway.
+                    # Files not matching the checksums fail the download.
+                    debug('Cannot verify archive, unpacking without verification: %s', str(e))
+
+            if not verified:
+                unpack_archive(archive_path, component_cache_path)
+
+            copy_directory(component_cache_path, download_path)
+
+            # Copy file hashes to cache and download directories
             shutil.copy2(checksums_path, component_cache_path)
             shutil.copy2(checksums_path, download_path)
-        except (KeyError, FetchingError) as e:
+
+            if verified:
+                self._verified_downloads.add(os.path.abspath(download_path))
+        except (KeyError, FetchingError, ArchiveVerificationError) as e:
             hint(
                 'The download failure may be caused by corrupted local storage. Please check manually.'
             )
@@ -328,7 +328,7 @@ class ComponentVersion(str):
 
         # Checking format
         if not (self.is_any or self.is_commit_id):
-            self._semver = Version(self._version_string)
+            self._semver = Version.intern(self._version_string)
             self.is_semver = True
             self._version_string = str(self._semver)
 
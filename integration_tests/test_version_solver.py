@@ -425,6 +425,7 @@ def test_version_is_not_updated_when_not_necessary(project):
 def test_check_for_newer_component_versions(project, tmp_path, monkeypatch, fixtures_path):
     monkeypatch.setenv('IDF_COMPONENT_STORAGE_URL', 'file://' + str(tmp_path))
     monkeypatch.setenv('IDF_COMPONENT_CHECK_NEW_VERSION', '1')
+    monkeypatch.setenv('IDF_COMPONENT_CHECK_NEW_VERSION_INTERVAL', '0')
 
     tmp_dir = tmp_path / 'components' / 'example'
     os.makedirs(str(tmp_dir))
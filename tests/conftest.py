@@ -154,6 +154,15 @@ def monkeypatch_disable_request_cache(request, monkeypatch):
     monkeypatch.setenv('IDF_COMPONENT_CACHE_HTTP_REQUESTS', '0')
 
 
+@pytest.fixture(autouse=True)
+def monkeypatch_disable_disk_cache(request, monkeypatch):
+    if 'enable_disk_cache' in request.keywords:
+        return
+    monkeypatch.setenv('IDF_COMPONENT_METADATA_CACHE_TTL', '0')
+    monkeypatch.setenv('IDF_COMPONENT_CHECK_NEW_VERSION_INTERVAL', '0')
+    monkeypatch.setenv('IDF_COMPONENT_CACHE_RESPONSES_BETWEEN_RUNS', '0')
+
+
 @pytest.fixture()
 def valid_manifest():
     return {
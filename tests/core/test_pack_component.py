@@ -1,7 +1,9 @@
 # SPDX-FileCopyrightText: 2024-2025 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 import os
+import re
 import shutil
+import tarfile
 import tempfile
 from pathlib import Path
 
@@ -300,7 +302,7 @@ def test_pack_component_with_example_defined_in_manifest(tmp_path, cmp_with_exam
     ]
     manifest_manager.dump(str(project_path))
 
-    component_manager.pack_component('cmp', '2.3.4')
+    component_manager.pack_component('cmp', '2.3.4', staged=True)
 
     assert (
         Path(component_manager.default_dist_path) / 'cmp_2.3.4' / 'examples' / 'cmp_ex'
@@ -336,8 +338,8 @@ def test_pack_component_with_no_duplicates_in_the_dist(tmp_path, cmp_with_exampl
     ]
     manifest_manager.dump(str(project_path))
 
-    component_manager.pack_component('cmp', '2.3.4')
-    component_manager.pack_component('cmp', '2.3.4')
+    component_manager.pack_component('cmp', '2.3.4', staged=True)
+    component_manager.pack_component('cmp', '2.3.4', staged=True)
 
     assert (
         len([
@@ -347,3 +349,42 @@ def test_pack_component_with_no_duplicates_in_the_dist(tmp_path, cmp_with_exampl
         ])
         == 1
     )
+
+
+def archive_content(archive_path):
+    with tarfile.open(archive_path) as archive:
+        return {
+            # Random directory names of examples are replaced
+            re.sub(r'^\./[0-9a-f]{8}(?=/|$)', './example', member.name): (
+                member.type,
+                archive.extractfile(member).read() if member.isfile() else None,
+            )
+            for member in archive.getmembers()
+        }
+
+
+def test_pack_component_same_as_staged(tmp_path, cmp_with_example):
+    project_path = tmp_path / 'cmp'
+    shutil.copytree(cmp_with_example, project_path)
+    shutil.copytree(
+        Path(cmp_with_example) / 'examples' / 'cmp_ex', project_path / 'custom_example_path'
+    )
+    (project_path / 'empty_dir').mkdir()
+    (project_path / 'build').mkdir()
+    (project_path / 'build' / 'CMakeCache.txt').write_text('cache')
+
+    manifest_manager = ManifestManager(project_path, 'cmp')
+    manifest_manager.manifest.examples = [{'path': './custom_example_path'}]
+    manifest_manager.dump(str(project_path))
+    with open(project_path / MANIFEST_FILENAME, 'a') as f:
+        f.write('files:\n  include:\n    - empty_dir\n')
+
+    component_manager = ComponentManager(path=str(project_path))
+    staged = component_manager.pack_component('cmp', '2.3.4', staged=True)
+    streamed = component_manager.pack_component('cmp', '2.3.4', dest_dir='streamed')
+
+    assert archive_content(streamed[0]) == archive_content(staged[0])
+    assert archive_content(streamed[1]) == archive_content(staged[1])
+    assert './empty_dir' in archive_content(streamed[0])
+    assert not (project_path / 'streamed' / 'cmp_2.3.4').exists()
+    assert not (project_path / 'streamed' / 'cmp_2.3.4_examples').exists()
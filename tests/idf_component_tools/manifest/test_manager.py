@@ -9,7 +9,8 @@ from ruamel.yaml import YAML
 
 from idf_component_manager.core import get_validated_manifest
 from idf_component_tools.errors import ManifestError, RunningEnvironmentError
-from idf_component_tools.manager import ManifestManager, UploadMode
+from idf_component_tools.manager import ManifestManager, UploadMode, clear_manifest_cache
+from idf_component_tools.manifest import Manifest
 
 
 def test_check_filename(tmp_path):
@@ -150,3 +151,38 @@ def test_env_not_expanded_with_example_manifest(valid_manifest, tmp_path):
         ManifestManager(manifest_path, name='test', upload_mode=UploadMode.component).load()
 
     ManifestManager(manifest_path, name='test', upload_mode=UploadMode.example).load()
+
+
+def test_load_cached(monkeypatch, tmp_path):
+    clear_manifest_cache()
+    manifest_path = tmp_path / 'idf_component.yml'
+    manifest_path.write_text('version: 1.0.0\ndependencies:\n  test/cmp: "*"\n')
+    # recently modified files are not cached
+    ManifestManager(manifest_path, name='test').load()
+    os.utime(manifest_path, (0, 0))
+    ManifestManager(manifest_path, name='test').load()
+
+    def validate_manifest(*args, **kwargs):
+        pytest.fail('validated again')
+
+    with monkeypatch.context() as m:
+        m.setattr(Manifest, 'validate_manifest', validate_manifest)
+        manager = ManifestManager(manifest_path, name='test', repository='https://a.com/b.git')
+        manifest = manager.load()
+
+    assert manifest.manifest_manager is manager
+    assert manifest.raw_requirements[0]._manifest_manager is manager
+    assert manifest.repository == 'https://a.com/b.git'
+    assert ManifestManager(manifest_path, name='test').load().repository is None
+
+    manifest_path.write_text('version: 2.0.0\n')
+    os.utime(manifest_path, (1, 1))
+    assert ManifestManager(manifest_path, name='test').load().version == '2.0.0'
+
+
+def test_load_yaml_1_2(tmp_path):
+    manifest_path = tmp_path / 'idf_component.yml'
+    manifest_path.write_text('version: 1.0.0\ndescription: on\n')
+
+    # YAML 1.1 booleans are strings in YAML 1.2, with or without the C extension
+    assert ManifestManager(manifest_path, name='test').load().description == 'on'
@@ -1,15 +1,26 @@
 # SPDX-FileCopyrightText: 2024 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import typing as t
+
 import pytest
 
+from idf_component_tools.registry import request_processor
+from idf_component_tools.registry.api_models import ApiBaseModel
+from idf_component_tools.registry.client_errors import APIClientError
 from idf_component_tools.registry.request_processor import (
     _request_cache,
+    base_request,
     cache_request,
     cache_to_dict,
+    set_response_snapshot,
 )
 
 
+class Schema(ApiBaseModel):
+    versions: t.List[str]
+
+
 def test_cache_to_dict_basic():
     cache = {}
 
@@ -145,3 +156,44 @@ def test_cache_request_with_do_not_cache(mocker):
     assert result2 == 'response'
     assert mock_func.call_count == 2  # Should be called twice since caching is disabled
     assert len(_request_cache) == 0  # Cache should remain empty
+
+
+def test_base_request_with_response_snapshot(mocker):
+    response = mocker.Mock(status_code=200)
+    response.json.return_value = {'versions': []}
+    make_request = mocker.patch.object(request_processor, 'make_request', return_value=response)
+
+    snapshot = {'http://example.com/components/old': {'versions': ['1.0.0']}}
+    set_response_snapshot(snapshot)
+    try:
+        assert base_request('http://example.com', None, 'get', ['components', 'old']) == {
+            'versions': ['1.0.0']
+        }
+        make_request.assert_not_called()
+
+        # New responses are recorded, but are not shared with the caller
+        base_request('http://example.com', None, 'get', ['components', 'new'])['versions'].append(1)
+        base_request('http://example.com', None, 'post', ['components', 'new'])
+        assert make_request.call_count == 2
+        assert snapshot['http://example.com/components/new'] == {'versions': []}
+    finally:
+        set_response_snapshot(None)
+
+
+def test_base_request_with_response_snapshot_validates_responses(mocker):
+    response = mocker.Mock(status_code=200)
+    response.json.return_value = {'versions': 'invalid'}
+    mocker.patch.object(request_processor, 'make_request', return_value=response)
+
+    snapshot = {'http://example.com/components/old': {'versions': 'invalid'}}
+    set_response_snapshot(snapshot)
+    try:
+        with pytest.raises(APIClientError):
+            base_request('http://example.com', None, 'get', ['components', 'old'], schema=Schema)
+
+        # Invalid responses are not recorded
+        with pytest.raises(APIClientError):
+            base_request('http://example.com', None, 'get', ['components', 'new'], schema=Schema)
+        assert 'http://example.com/components/new' not in snapshot
+    finally:
+        set_response_snapshot(None)
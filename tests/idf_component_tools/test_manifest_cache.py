@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import pickle
+
+import pytest
+
+from idf_component_manager.prepare_components.prepare import manifest_cache
+from idf_component_tools.manager import ManifestManager, clear_manifest_cache
+from idf_component_tools.manifest import Manifest
+from idf_component_tools.manifest_cache import (
+    ManifestCache,
+    get_manifest_cache,
+    manifest_cache_path,
+)
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    clear_manifest_cache()
+    path = tmp_path / 'main' / 'idf_component.yml'
+    path.parent.mkdir()
+    path.write_text('version: 1.0.0\ndependencies:\n  test/cmp: "*"\n')
+    return path
+
+
+def test_manifest_cache_between_runs(monkeypatch, tmp_path, manifest_path):
+    with manifest_cache(tmp_path):
+        assert get_manifest_cache() is not None
+        ManifestManager(manifest_path, name='main').load()
+
+    assert get_manifest_cache() is None
+    assert (tmp_path / 'component_manager_manifests.pickle').is_file()
+
+    clear_manifest_cache()
+    monkeypatch.setattr(
+        Manifest, 'validate_manifest', lambda *args, **kwargs: pytest.fail('validated again')
+    )
+    with manifest_cache(tmp_path):
+        manager = ManifestManager(manifest_path, name='main', version='2.0.0')
+        with pytest.raises(pytest.fail.Exception):
+            manager.load()
+
+        manager = ManifestManager(manifest_path, name='main')
+        manifest = manager.load()
+
+    assert manifest.manifest_manager is manager
+    assert manifest.version == '1.0.0'
+    assert manifest.raw_requirements[0].name == 'test/cmp'
+
+
+def test_manifest_cache_changed_content(tmp_path, manifest_path):
+    with manifest_cache(tmp_path):
+        ManifestManager(manifest_path, name='main').load()
+
+    clear_manifest_cache()
+    manifest_path.write_text('version: 1.0.1\n')
+    with manifest_cache(tmp_path):
+        assert ManifestManager(manifest_path, name='main').load().version == '1.0.1'
+
+    cache = ManifestCache(manifest_cache_path(tmp_path))
+    cache.load()
+    assert len(cache._entries) == 2
+
+
+def test_manifest_cache_other_version(tmp_path, manifest_path):
+    path = manifest_cache_path(tmp_path)
+    with manifest_cache(tmp_path):
+        ManifestManager(manifest_path, name='main').load()
+
+    with open(path, 'rb') as f:
+        data = pickle.load(f)
+    data['version'] = '0.0.0'
+    with open(path, 'wb') as f:
+        pickle.dump(data, f)
+
+    cache = ManifestCache(path)
+    cache.load()
+    assert cache._entries == {}
+
+    with open(path, 'w') as f:
+        f.write('garbage')
+
+    cache.load()
+    assert cache._entries == {}
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import json
+import time
+
+import pytest
+
+from idf_component_tools.metadata_cache import VerifiedVersionsCache
+from idf_component_tools.sources import WebServiceSource
+
+pytestmark = pytest.mark.enable_disk_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_path(monkeypatch, tmp_path):
+    monkeypatch.setenv('IDF_COMPONENT_CACHE_PATH', str(tmp_path))
+
+
+@pytest.fixture
+def source():
+    return WebServiceSource(registry_url='https://repo.example.com')
+
+
+def test_verified_versions_persist(source):
+    cache = VerifiedVersionsCache()
+    cache.add(source, 'example/cmp', '1.0.0', 'a' * 64)
+    # Not visible until saved
+    assert VerifiedVersionsCache().get(source, 'example/cmp', '1.0.0') is None
+    cache.save()
+
+    cache = VerifiedVersionsCache()
+    assert cache.get(source, 'example/cmp', '1.0.0') == 'a' * 64
+    assert cache.get(source, 'example/cmp', '1.0.1') is None
+    assert (
+        cache.get(
+            WebServiceSource(registry_url='https://other.example.com'), 'example/cmp', '1.0.0'
+        )
+        is None
+    )
+
+
+def test_verified_versions_merged_between_instances(source):
+    first = VerifiedVersionsCache()
+    second = VerifiedVersionsCache()
+    first.add(source, 'example/a', '1.0.0', 'a' * 64)
+    second.add(source, 'example/b', '1.0.0', 'b' * 64)
+    first.save()
+    second.save()
+
+    cache = VerifiedVersionsCache()
+    assert cache.get(source, 'example/a', '1.0.0') == 'a' * 64
+    assert cache.get(source, 'example/b', '1.0.0') == 'b' * 64
+
+
+def test_verified_versions_expire(source):
+    cache = VerifiedVersionsCache(ttl=60)
+    cache.add(source, 'example/cmp', '1.0.0', 'a' * 64)
+    cache.save()
+
+    with open(cache.path) as f:
+        data = json.load(f)
+    data[source.hash_key]['example/cmp@1.0.0'][1] = time.time() - 61
+    with open(cache.path, 'w') as f:
+        json.dump(data, f)
+
+    assert VerifiedVersionsCache(ttl=60).get(source, 'example/cmp', '1.0.0') is None
+
+
+def test_verified_versions_disabled(monkeypatch, source):
+    cache = VerifiedVersionsCache()
+    cache.add(source, 'example/cmp', '1.0.0', 'a' * 64)
+    cache.save()
+
+    monkeypatch.setenv('IDF_COMPONENT_METADATA_CACHE_TTL', '0')
+    cache = VerifiedVersionsCache()
+    assert cache.get(source, 'example/cmp', '1.0.0') is None
+
+
+def test_verified_versions_broken_file(source):
+    cache = VerifiedVersionsCache()
+    cache.add(source, 'example/cmp', '1.0.0', 'a' * 64)
+    cache.save()
+
+    with open(cache.path, 'w') as f:
+        f.write('{broken')
+
+    assert VerifiedVersionsCache().get(source, 'example/cmp', '1.0.0') is None
@@ -336,6 +336,23 @@ class TestManifestValidator:
 
         assert parse_if_clause(if_clause).get_value() == bool_value
 
+    def test_parse_if_clause_cached(self, monkeypatch):
+        monkeypatch.setenv('IDF_TARGET', 'esp32')
+        if_clause = 'target in [esp32, esp32s3] && $CONFIG{string_foo} == foo'
+        clause = parse_if_clause(if_clause)
+        assert parse_if_clause(if_clause) is clause
+
+        KCONFIG_CONTEXT.get().sdkconfig['string_foo'] = 'foo'
+        assert clause.get_value() is True
+
+        # The target and sdkconfig values are read on every evaluation
+        monkeypatch.setenv('IDF_TARGET', 'esp32c3')
+        assert clause.get_value() is False
+
+        monkeypatch.setenv('IDF_TARGET', 'esp32s3')
+        KCONFIG_CONTEXT.get().sdkconfig['string_foo'] = 'bar'
+        assert clause.get_value() is False
+
     def test_validate_require_public_fields(self, valid_manifest):
         valid_manifest['dependencies']['test-8']['require'] = 'public'
         errors = Manifest.validate_manifest(valid_manifest)
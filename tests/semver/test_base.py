@@ -4,6 +4,8 @@
 # SPDX-FileContributor: 2022-2025 Espressif Systems (Shanghai) CO LTD
 """Test the various functions from 'base'."""
 
+import copy
+import pickle
 import unittest
 
 from idf_component_tools.semver import base
@@ -174,6 +176,64 @@ class VersionTestCase(unittest.TestCase):
         self.assertEqual(1, len({base.Version('0.1.0'), base.Version('0.1.0~0')}))
         self.assertEqual(1, len({base.Version('0.1.0~2'), base.Version('0.1.0~2')}))
 
+    def test_intern(self):
+        version = base.Version.intern('0.1.0')
+        self.assertIs(version, base.Version.intern('0.1.0'))
+        self.assertIsNot(version, base.Version('0.1.0'))
+        self.assertEqual(version, base.Version('0.1.0'))
+
+        spec = base.SimpleSpec.intern('>=0.1.0,<1.0.0')
+        self.assertIs(spec, base.SimpleSpec.intern('>=0.1.0,<1.0.0'))
+        self.assertEqual(spec, base.SimpleSpec('>=0.1.0,<1.0.0'))
+
+        with self.assertRaises(ValueError):
+            base.Version.intern('0.1')
+
+    def test_immutable(self):
+        version = base.Version.intern('0.1.0-rc.1')
+        with self.assertRaises(AttributeError):
+            version.prerelease = ()
+        with self.assertRaises(AttributeError):
+            version.build = ('1',)
+        self.assertEqual(version.prerelease, ('rc', '1'))
+
+        spec = base.SimpleSpec.intern('>=0.1.0')
+        with self.assertRaises(AttributeError):
+            spec.clause = base.SimpleSpec('<0.1.0').clause
+        with self.assertRaises(AttributeError):
+            spec.expression = '<0.1.0'
+        self.assertEqual(str(spec), '>=0.1.0')
+
+    def test_sort(self):
+        ordered = [
+            '1.0.0-1',
+            '1.0.0-2',
+            '1.0.0-10',
+            '1.0.0-alpha',
+            '1.0.0-alpha.1',
+            '1.0.0-alpha.beta',
+            '1.0.0-beta',
+            '1.0.0-beta.2',
+            '1.0.0-beta.11',
+            '1.0.0-rc.1',
+            '1.0.0',
+            '1.0.0~1-rc.1',
+            '1.0.0~1',
+            '1.0.1',
+            '1.10.0',
+            '2.0.0',
+        ]
+        versions = [base.Version(text) for text in reversed(ordered)]
+        self.assertEqual(ordered, [str(version) for version in sorted(versions)])
+        self.assertEqual('2.0.0', str(max(versions)))
+
+    def test_slots(self):
+        version = base.Version('1.0.0-rc.1+build.5')
+        self.assertFalse(hasattr(version, '__dict__'))
+        self.assertEqual(version, pickle.loads(pickle.dumps(version)))
+        self.assertEqual(hash(version), hash(copy.deepcopy(version)))
+        self.assertNotEqual(version, base.Version('1.0.0-rc.1'))
+
     def test_invalid_comparisons(self):
         v = base.Version('0.1.0')
         with self.assertRaises(TypeError):
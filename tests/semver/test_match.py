@@ -171,6 +171,23 @@ class MatchTestCase(unittest.TestCase):
                     self.assertTrue(spec.match(version), f'{version!r} does not match {spec!r}')
                     self.assertTrue(semver.match(spec_text, version_text))
 
+    def test_filter_many(self):
+        versions = sorted({
+            semver.Version(version_text)
+            for versions in self.matches.values()
+            for version_text in versions
+        })
+        for spec_text in [*self.matches, *self.valid_specs, '!=0.1', '<0.1.2~2', '>0.1.2,<1']:
+            with self.subTest(spec=spec_text):
+                spec = semver.SimpleSpec(spec_text)
+                expected = [version for version in versions if spec.match(version)]
+                self.assertEqual(expected, spec.filter_many(versions))
+                self.assertEqual(expected[::-1], spec.filter_many(versions[::-1], reverse=True))
+                self.assertEqual(
+                    [str(version) for version in expected],
+                    spec.filter_many([str(version) for version in versions], key=semver.Version),
+                )
+
     def test_contains(self):
         spec = semver.SimpleSpec('<=0.1.1')
         self.assertFalse('0.1.0' in spec, f'0.1.0 should not be in {spec!r}')
@@ -7,11 +7,14 @@ import shutil
 
 import pytest
 
+from idf_component_tools.archive_tools import unpack_archive
 from idf_component_tools.errors import FetchingError
 from idf_component_tools.hash_tools.calculate import hash_dir
+from idf_component_tools.hash_tools.checksums import ChecksumsManager
+from idf_component_tools.hash_tools.constants import CHECKSUMS_FILENAME
 from idf_component_tools.manager import ManifestManager
 from idf_component_tools.manifest import SolvedComponent
-from idf_component_tools.sources import WebServiceSource
+from idf_component_tools.sources import WebServiceSource, web_service
 from idf_component_tools.sources.web_service import download_archive
 from idf_component_tools.utils import ComponentVersion
 from tests.network_test_utils import use_vcr_or_real_env
@@ -101,6 +104,58 @@ class TestComponentWebServiceSource:
 
         assert os.path.isfile(os.path.join(local_path, 'idf_component.yml'))
 
+    @pytest.mark.parametrize('case', ['verified', 'unlisted_file', 'modified_file'])
+    def test_download_verified(self, monkeypatch, fixtures_path, tmp_path, case):
+        archive = os.path.join(fixtures_path, 'archives', 'cmp_1.0.0.tar.gz')
+        unpack_archive(archive, str(tmp_path / 'source'))
+        if case == 'unlisted_file':
+            # Files not listed in the checksums are only validated after the download
+            os.remove(tmp_path / 'source' / 'CMakeLists.txt')
+        elif case == 'modified_file':
+            (tmp_path / 'source' / 'CMakeLists.txt').write_text('modified')
+        ChecksumsManager(tmp_path / 'source').dump(tmp_path)
+
+        class StorageClient:
+            def component(self, *args):
+                return {'download_url': 'url', 'checksums_url': 'checksums_url'}
+
+        def download_file(url, download_dir, filename=None, **kwargs):  # noqa: ARG001
+            return shutil.copy(tmp_path / CHECKSUMS_FILENAME, download_dir)
+
+        monkeypatch.setattr(
+            'idf_component_tools.registry.service_details.get_storage_client',
+            lambda *args: StorageClient(),
+        )
+        monkeypatch.setattr(web_service, 'download_file', download_file)
+        monkeypatch.setattr(
+            web_service,
+            'download_archive',
+            lambda url, download_dir: shutil.copy(archive, download_dir),  # noqa: ARG005
+        )
+
+        source = WebServiceSource(
+            registry_url='https://example.com/api', system_cache_path=str(tmp_path / 'cache')
+        )
+        cmp = SolvedComponent(
+            name='cmp',
+            version=ComponentVersion('1.0.0'),
+            source=source,
+            component_hash=self.CMP_HASH,
+        )
+        download_path = str(tmp_path / 'cmp')
+
+        if case == 'modified_file':
+            # Files not matching the checksums are not written anywhere
+            with pytest.raises(FetchingError, match='Size of the file "CMakeLists.txt"'):
+                source.download(cmp, download_path)
+            assert not os.path.exists(download_path)
+            assert not os.path.exists(source.component_cache_path(cmp))
+            return
+
+        assert source.download(cmp, download_path) == download_path
+        assert os.path.isfile(os.path.join(download_path, 'CMakeLists.txt'))
+        assert source.is_download_verified(download_path) is (case == 'verified')
+
     def test_download_local_file(self, fixtures_path, tmp_path):
         source_file = os.path.join(fixtures_path, 'archives', 'cmp_1.0.0.tar.gz')
 
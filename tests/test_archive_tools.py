@@ -1,23 +1,33 @@
 # SPDX-FileCopyrightText: 2022-2025 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import gzip
+import io
 import os
 import shutil
+import sys
 import tarfile
 import tempfile
 from filecmp import dircmp
+from hashlib import sha256
 
 import pytest
 
 from idf_component_tools.archive_tools import (
     ArchiveError,
+    ArchiveUnverifiableError,
+    ArchiveVerificationError,
+    ParallelGzipWriter,
     get_format_from_path,
     is_known_format,
     pack_archive,
     unpack_archive,
     unpack_tar,
+    unpack_tar_zst,
+    unpack_verified,
     unpack_zip,
 )
+from idf_component_tools.hash_tools.checksums import ChecksumsManager, ChecksumsModel, FileField
 
 
 @pytest.fixture
@@ -40,6 +50,8 @@ class TestUtilsArchive:
         assert get_format_from_path('sdf.tgz') == ('gztar', 'tgz', unpack_tar)
         assert get_format_from_path('sdf.tar.gz') == ('gztar', 'tgz', unpack_tar)
         assert get_format_from_path('sdf.zip') == ('zip', 'zip', unpack_zip)
+        assert get_format_from_path('sdf.tar.zst') == ('zstdtar', 'tzst', unpack_tar_zst)
+        assert get_format_from_path('sdf.tzst') == ('zstdtar', 'tzst', unpack_tar_zst)
 
     def test_is_known_format(self):
         assert not is_known_format('sdf')
@@ -94,3 +106,228 @@ class TestUtilsArchive:
         # Verify: no absolute paths, files stored at top-level (relative './')
         assert all(not n.startswith('/') for n in names)
         assert './file.txt' in names
+
+    @pytest.mark.parametrize('threads', [1, 4])
+    @pytest.mark.parametrize('size', [0, 1, 1000, 1024, 1025, 10000])
+    def test_parallel_gzip_writer(self, threads, size, tmp_path):
+        data = os.urandom(size // 2) + b'component' * (size // 18)
+        archive_file = tmp_path / 'data.gz'
+
+        writer = ParallelGzipWriter(archive_file, threads=threads, block_size=1024)
+        # Write in pieces not aligned with blocks
+        for i in range(0, len(data), 300):
+            writer.write(data[i : i + 300])
+        writer.close()
+
+        assert gzip.decompress(archive_file.read_bytes()) == data
+
+    @pytest.mark.parametrize('threads', [1, 4])
+    def test_pack_archive_in_parallel(self, threads, archive_path, tmp_path):
+        unpack_archive(archive_path('tar.gz'), str(tmp_path / 'source'))
+        archive_file = tmp_path / 'archive.tgz'
+
+        pack_archive(tmp_path / 'source', archive_file, threads=threads)
+        unpack_archive(archive_file, str(tmp_path / 'unpacked'))
+
+        assert not dircmp(tmp_path / 'source', tmp_path / 'unpacked').diff_files
+        assert (tmp_path / 'unpacked' / 'include' / 'cmp.h').is_file()
+
+    @pytest.mark.skipif(not is_known_format('zstdtar'), reason='zstd is not available')
+    def test_pack_unpack_zstd_archive(self, archive_path, tmp_path):
+        unpack_archive(archive_path('tar.gz'), str(tmp_path / 'source'))
+        archive_file = tmp_path / 'archive.tar.zst'
+
+        pack_archive(tmp_path / 'source', archive_file)
+        unpack_archive(archive_file, str(tmp_path / 'unpacked'))
+
+        assert (tmp_path / 'unpacked' / 'include' / 'cmp.h').is_file()
+
+    @pytest.mark.skipif(sys.platform == 'win32', reason='symlinks require privileges on Windows')
+    def test_pack_archive_keeps_symlinks(self, tmp_path):
+        source = tmp_path / 'source'
+        source.mkdir()
+        (source / 'file.txt').write_text('content')
+        os.symlink('file.txt', source / 'link.txt')
+        archive_file = tmp_path / 'archive.tgz'
+
+        pack_archive(source, archive_file)
+
+        with tarfile.open(archive_file) as archive:
+            link = archive.getmember('./link.txt')
+            assert link.issym()
+            assert link.linkname == 'file.txt'
+
+    def test_zstd_not_available(self, monkeypatch, tmp_path):
+        # Neither Python 3.14+ compression.zstd nor the zstandard package can be imported
+        monkeypatch.setitem(sys.modules, 'compression', None)
+        monkeypatch.setitem(sys.modules, 'zstandard', None)
+        (tmp_path / 'source').mkdir()
+
+        assert not is_known_format('zstdtar')
+        with pytest.raises(ArchiveError, match='zstandard'):
+            pack_archive(tmp_path / 'source', tmp_path / 'archive.tzst')
+        with pytest.raises(ArchiveError, match='not supported'):
+            unpack_archive(tmp_path / 'archive.tzst', str(tmp_path / 'unpacked'))
+
+
+@pytest.fixture
+def checksums_of(archive_path, tmp_path):
+    def inner(ext):
+        source = tmp_path / 'source'
+        unpack_archive(archive_path(ext), str(source))
+        ChecksumsManager(source).dump(tmp_path)
+        return ChecksumsManager(tmp_path).load()
+
+    return inner
+
+
+def make_tar(path, entries):
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, data in entries:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+class TestUnpackVerified:
+    @pytest.mark.parametrize('ext', ['tar.gz', 'zip'])
+    def test_unpack_verified(self, ext, archive_path, checksums_of, tmp_path):
+        expected_checksums = checksums_of(ext)
+        target = tmp_path / 'cmp'
+        target.mkdir()
+        (target / 'old_file.txt').touch()
+
+        unpack_archive(archive_path(ext), str(target), expected_checksums=expected_checksums)
+
+        assert not (target / 'old_file.txt').exists()
+        assert not dircmp(tmp_path / 'source', target).diff_files
+        assert sorted(os.listdir(tmp_path)) == sorted(['CHECKSUMS.json', 'cmp', 'source'])
+
+    @pytest.mark.parametrize(
+        ['change', 'error'],
+        [
+            ({'hash': '0' * 64}, 'Hash of the file "CMakeLists.txt"'),
+            ({'size': 1}, 'Size of the file "CMakeLists.txt"'),
+            ({'path': 'CMakeLists2.txt'}, 'Unexpected file "CMakeLists.txt"'),
+        ],
+    )
+    def test_unpack_verified_mismatch(self, change, error, archive_path, checksums_of, tmp_path):
+        expected_checksums = checksums_of('tar.gz')
+        expected_checksums.files = [
+            file.model_copy(update=change) if file.path == 'CMakeLists.txt' else file
+            for file in expected_checksums.files
+        ]
+        target = tmp_path / 'cmp'
+        target.mkdir()
+        (target / 'old_file.txt').touch()
+
+        with pytest.raises(ArchiveVerificationError, match=error):
+            unpack_verified(archive_path('tar.gz'), target, expected_checksums)
+
+        # Destination is not touched and nothing is left in the parent directory
+        assert os.listdir(target) == ['old_file.txt']
+        assert sorted(os.listdir(tmp_path)) == sorted(['CHECKSUMS.json', 'cmp', 'source'])
+
+    @pytest.mark.parametrize('ext', ['tar.gz', 'zip'])
+    def test_unpack_verified_missing_file(self, ext, archive_path, checksums_of, tmp_path):
+        expected_checksums = checksums_of(ext)
+        expected_checksums.files.append(FileField(path='missing.txt', size=0, hash='0' * 64))
+
+        with pytest.raises(ArchiveVerificationError, match='missing in the archive: missing.txt'):
+            unpack_verified(archive_path(ext), tmp_path / 'cmp', expected_checksums)
+
+        assert not (tmp_path / 'cmp').exists()
+
+    @pytest.mark.parametrize(
+        ['name', 'error'],
+        [
+            ('../evil.txt', 'points outside'),
+            ('./sub/../../evil.txt', 'points outside'),
+            ('/tmp/evil.txt', 'Absolute path'),
+        ],
+    )
+    def test_unpack_verified_path_traversal(self, name, error, tmp_path):
+        archive_file = tmp_path / 'archive.tgz'
+        make_tar(archive_file, [(name, b'evil')])
+
+        with pytest.raises(ArchiveVerificationError, match=error):
+            unpack_verified(archive_file, tmp_path / 'cmp', ChecksumsModel())
+
+        assert not (tmp_path / 'evil.txt').exists()
+        assert not (tmp_path / 'cmp').exists()
+
+    @pytest.mark.parametrize(
+        'links',
+        [
+            [('link', '/etc/passwd')],
+            [('link', '../outside')],
+            # Points outside only when the other symlink is resolved
+            [('dir', '.'), ('link', 'dir/../outside')],
+        ],
+    )
+    def test_unpack_verified_rejects_links_outside(self, links, tmp_path):
+        archive_file = tmp_path / 'archive.tgz'
+        with tarfile.open(archive_file, 'w:gz') as archive:
+            for name, linkname in links:
+                info = tarfile.TarInfo(name)
+                info.type = tarfile.SYMTYPE
+                info.linkname = linkname
+                archive.addfile(info)
+
+        with pytest.raises(ArchiveVerificationError, match='Symlink "link" in the archive points'):
+            unpack_verified(archive_file, tmp_path / 'cmp', ChecksumsModel())
+
+        assert not (tmp_path / 'cmp').exists()
+
+    def test_unpack_verified_unsupported_entry(self, tmp_path):
+        archive_file = tmp_path / 'archive.tgz'
+        with tarfile.open(archive_file, 'w:gz') as archive:
+            info = tarfile.TarInfo('hardlink')
+            info.type = tarfile.LNKTYPE
+            info.linkname = 'file.txt'
+            archive.addfile(info)
+
+        with pytest.raises(
+            ArchiveUnverifiableError, match='Unsupported type of the entry "hardlink"'
+        ):
+            unpack_verified(archive_file, tmp_path / 'cmp', ChecksumsModel())
+
+    @pytest.mark.skipif(sys.platform == 'win32', reason='symlinks require privileges on Windows')
+    def test_unpack_verified_packed_symlinks(self, tmp_path):
+        source = tmp_path / 'source'
+        (source / 'include').mkdir(parents=True)
+        (source / 'include' / 'cmp.h').write_text('header')
+        (source / 'file.txt').write_text('content')
+        os.symlink('file.txt', source / 'link.txt')
+        os.symlink('include', source / 'include_link')
+        archive_file = tmp_path / 'archive.tgz'
+        pack_archive(source, archive_file)
+
+        checksums = ChecksumsModel(
+            files=[
+                FileField(path=path, size=len(content), hash=sha256(content).hexdigest())
+                for path, content in [
+                    ('file.txt', b'content'),
+                    ('link.txt', b'content'),
+                    ('include/cmp.h', b'header'),
+                    ('include_link/cmp.h', b'header'),
+                ]
+            ]
+        )
+        unpack_verified(archive_file, tmp_path / 'cmp', checksums)
+
+        assert os.readlink(tmp_path / 'cmp' / 'link.txt') == 'file.txt'
+        assert (tmp_path / 'cmp' / 'include_link' / 'cmp.h').read_text() == 'header'
+
+        # Content reached through symlinks is checked as well
+        checksums.files[1] = FileField(path='link.txt', size=7, hash='0' * 64)
+        with pytest.raises(ArchiveVerificationError, match='Hash of the file "link.txt"'):
+            unpack_verified(archive_file, tmp_path / 'cmp2', checksums)
+
+    def test_unpack_verified_oversized_entry(self, tmp_path):
+        archive_file = tmp_path / 'archive.tgz'
+        make_tar(archive_file, [('./big.bin', b'0' * 1000)])
+        checksums = ChecksumsModel(files=[FileField(path='big.bin', size=10, hash='0' * 64)])
+
+        with pytest.raises(ArchiveVerificationError, match='Size of the file "big.bin" is 1000'):
+            unpack_verified(archive_file, tmp_path / 'cmp', checksums)
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import os
+
+import pytest
+
+from idf_component_manager.dependencies import download_project_dependencies
+from idf_component_manager.version_solver import new_versions
+from idf_component_tools.debugger import KCONFIG_CONTEXT, SdkconfigContext
+from idf_component_tools.hash_tools.calculate import hash_dir
+from idf_component_tools.hash_tools.constants import HASH_FILENAME
+from idf_component_tools.manager import ManifestManager
+from idf_component_tools.semver import SimpleSpec, Version
+from idf_component_tools.sources import WebServiceSource
+from idf_component_tools.utils import (
+    ComponentWithVersions,
+    HashedComponentVersion,
+    ProjectRequirements,
+)
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch, tmp_path):
+    monkeypatch.setenv('IDF_COMPONENT_CACHE_PATH', str(tmp_path / 'cache'))
+    monkeypatch.setenv('IDF_PATH', str(tmp_path))
+    monkeypatch.setenv('IDF_TARGET', 'esp32')
+    token = KCONFIG_CONTEXT.set(SdkconfigContext())
+    yield
+    KCONFIG_CONTEXT.reset(token)
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    component = tmp_path / 'component'
+    component.mkdir()
+    (component / 'CMakeLists.txt').write_text('idf_component_register()\n')
+    component_hash = hash_dir(component)
+
+    versions_by_name = {'test/cmp': [HashedComponentVersion('1.0.0', component_hash)]}
+    requests = []
+
+    def versions(self, name, spec='*', target=None):  # noqa: ARG001
+        requests.append(name)
+        return ComponentWithVersions(
+            name,
+            [
+                version
+                for version in versions_by_name[name]
+                if SimpleSpec(spec or '*').match(Version(str(version)))
+            ],
+        )
+
+    def download(self, component, download_path):  # noqa: ARG001
+        os.makedirs(download_path)
+        with open(os.path.join(download_path, 'CMakeLists.txt'), 'w') as f:
+            f.write('idf_component_register()\n')
+        with open(os.path.join(download_path, HASH_FILENAME), 'w') as f:
+            f.write(component_hash)
+        return download_path
+
+    monkeypatch.setattr(WebServiceSource, 'versions', versions)
+    monkeypatch.setattr(WebServiceSource, 'download', download)
+    return requests
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    calls = []
+    monkeypatch.setattr(new_versions.subprocess, 'Popen', lambda args, **kwargs: calls.append(args))
+    return calls
+
+
+@pytest.mark.enable_disk_cache
+def test_registry_metadata_cached_between_runs(tmp_path, registry, spawned):
+    (tmp_path / 'main').mkdir()
+    (tmp_path / 'main' / 'idf_component.yml').write_text('dependencies:\n  test/cmp: "*"\n')
+    requirements = ProjectRequirements([ManifestManager(str(tmp_path / 'main'), 'main').load()])
+
+    def run():
+        return download_project_dependencies(
+            requirements,
+            lock_path=str(tmp_path / 'dependencies.lock'),
+            managed_components_path=str(tmp_path / 'managed_components'),
+        )
+
+    # Dependencies are solved and downloaded
+    assert len(run()) == 1
+    assert registry == ['test/cmp']
+
+    # The locked version is verified against the registry,
+    # the check for new versions is started in the background
+    registry.clear()
+    assert len(run()) == 1
+    assert registry == ['test/cmp']
+    assert len(spawned) == 1
+
+    # The verified version is trusted, the check for new versions has just been started
+    registry.clear()
+    assert len(run()) == 1
+    assert registry == []
+    assert len(spawned) == 1
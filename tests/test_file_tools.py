@@ -8,6 +8,8 @@ from pathlib import Path
 import pytest
 
 from idf_component_tools.file_tools import (
+    DEFAULT_EXCLUDE,
+    PARALLEL_COPY_MIN_FILES,
     check_unexpected_component_files,
     copy_filtered_directory,
     directory_size,
@@ -140,6 +142,78 @@ def test_excluded_and_included_files(tmpdir_factory):
     assert os.listdir(temp_dir.strpath) == ['folder1']
 
 
+def glob_filtered_paths(path, include, exclude):
+    """Reference implementation of path filtering with one glob per pattern"""
+    paths = set(path.glob('**/*'))
+    for pattern in DEFAULT_EXCLUDE + exclude:
+        paths.difference_update(path.glob(pattern))
+    paths = {p for p in paths if not p.is_dir()}
+    for pattern in include:
+        paths.update(path.glob(pattern))
+    return paths
+
+
+@pytest.mark.parametrize(
+    ('include', 'exclude'),
+    [
+        ([], []),
+        (['build/*.c'], []),
+        (['**/build/**/*'], ['**/*.c']),
+        (['lib/**/*'], ['lib']),
+        (['*/src/?.c', 'lib'], ['**/src/*']),
+        ([], ['[ab]/*', 'a/**/b']),
+        (['a/..', '**/'], ['src/**', '']),
+    ],
+)
+def test_filtered_path_same_as_glob(tmp_path, include, exclude):
+    for file_path in [
+        'a/b/x.c',
+        'a/src/y.c',
+        'b/src/a.c',
+        'build/main.c',
+        'build/sub/.hidden',
+        'src/build/deep/z.c',
+        '.git/objects/pack',
+        '__pycache__/m.pyc',
+        'sdkconfig',
+        'dir/sdkconfig/file.c',
+    ]:
+        (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file_path).write_text('1')
+
+    (tmp_path / 'lib').symlink_to(tmp_path / 'a', target_is_directory=True)
+    (tmp_path / 'broken.c').symlink_to(tmp_path / 'missing.c')
+
+    try:
+        expected = glob_filtered_paths(tmp_path, include, exclude)
+    except ValueError:
+        with pytest.raises(ValueError):
+            filtered_paths(tmp_path, include=include, exclude=exclude)
+    else:
+        assert filtered_paths(tmp_path, include=include, exclude=exclude) == expected
+
+
+def test_copy_filtered_directory_keeps_metadata(tmp_path):
+    source = tmp_path / 'source'
+    for i in range(PARALLEL_COPY_MIN_FILES * 2):
+        file_path = source / f'dir_{i % 3}' / 'sub' / f'file_{i}.txt'
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(f'content {i}' * i)
+        file_path.chmod(0o640 if i % 2 else 0o755)
+        os.utime(file_path, (1_000_000 + i, 2_000_000 + i))
+    (source / 'link.txt').symlink_to(source / 'dir_0' / 'sub' / 'file_0.txt')
+
+    destination = tmp_path / 'destination'
+    copy_filtered_directory(str(source), str(destination))
+
+    for file_path in filtered_paths(source):
+        copied = destination / file_path.relative_to(source)
+        assert not copied.is_symlink()
+        assert copied.read_bytes() == file_path.read_bytes()
+        assert copied.stat().st_mode == file_path.stat().st_mode
+        assert copied.stat().st_mtime == file_path.stat().st_mtime
+
+
 def test_exclude_files_with_gitignore(assets_path):
     create_gitignore(assets_path, ['ignore.me', '1.txt'])
 
@@ -243,6 +317,48 @@ def test_include_files_excluded_by_gitignore(assets_path):
     }
 
 
+def test_gitignore_rules(tmp_path, monkeypatch):
+    for file_path in [
+        'build/out.bin',
+        'src/build/gen.c',
+        'src/main.c',
+        'src/main.o',
+        'docs/a.md',
+        'docs/deep/b.md',
+        'logs/keep.log',
+        'logs/other.log',
+        '.git/HEAD',
+    ]:
+        (tmp_path / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file_path).write_text('1')
+
+    create_gitignore(
+        tmp_path,
+        [
+            '# comment',
+            '/build/',  # anchored directory
+            '*.o',
+            'docs/**',
+            '!docs/deep/b.md',  # can't re-include a file from an ignored directory
+            'logs/*.log',
+            '!keep.log',
+        ],
+    )
+    create_gitignore(tmp_path / 'src', ['!*.o', 'build'])
+
+    # .gitignore files are evaluated without git
+    monkeypatch.setenv('PATH', '')
+
+    assert filtered_paths(tmp_path, use_gitignore=True) == {
+        tmp_path / '.git' / 'HEAD',
+        tmp_path / '.gitignore',
+        tmp_path / 'src' / '.gitignore',
+        tmp_path / 'src' / 'main.c',
+        tmp_path / 'src' / 'main.o',
+        tmp_path / 'logs' / 'keep.log',
+    }
+
+
 def test_check_suspicious_component_files(release_component_path, tmp_path, recording_log):
     sub = str(tmp_path / 'sub')
     shutil.copytree(release_component_path, sub)
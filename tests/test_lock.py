@@ -15,9 +15,10 @@ import requests_mock
 from ruamel.yaml import YAML
 
 from idf_component_manager.dependencies import is_solve_required
+from idf_component_manager.prepare_components.prepare import manifest_cache
 from idf_component_tools import setup_logging
 from idf_component_tools.build_system_tools import get_idf_version
-from idf_component_tools.errors import LockError
+from idf_component_tools.errors import InvalidComponentHashError, LockError
 from idf_component_tools.lock import EMPTY_LOCK, LockFile, LockManager
 from idf_component_tools.manager import ManifestManager
 from idf_component_tools.manifest import (
@@ -27,7 +28,12 @@ from idf_component_tools.manifest import (
     SolvedManifest,
 )
 from idf_component_tools.sources import IDFSource, LocalSource, WebServiceSource
-from idf_component_tools.utils import ComponentVersion, ProjectRequirements
+from idf_component_tools.utils import (
+    ComponentVersion,
+    ComponentWithVersions,
+    HashedComponentVersion,
+    ProjectRequirements,
+)
 
 
 @pytest.fixture
@@ -306,6 +312,67 @@ class TestLockManager(object):
 
         assert filecmp.cmp(lock_path, valid_lock_path, shallow=False)
 
+    def test_load_cached_lock(self, tmp_path, monkeypatch, valid_lock_path):
+        lock_path = tmp_path / 'dependencies.lock'
+        shutil.copyfile(valid_lock_path, lock_path)
+        (tmp_path / 'cmp').mkdir()
+        lock_content = lock_path.read_text().replace(
+            'dependencies:\n',
+            'dependencies:\n'
+            '  cmp:\n'
+            '    source:\n'
+            '      path: cmp\n'
+            '      type: local\n'
+            '    version: 1.0.0\n'
+            '  espressif/git_cmp:\n'
+            f'    component_hash: {"a" * 64}\n'
+            '    source:\n'
+            '      git: https://github.com/espressif/example_components.git\n'
+            '      path: git_cmp\n'
+            '      type: git\n'
+            '    version: 0123456789abcdef0123456789abcdef01234567\n',
+        )
+        lock_path.write_text(lock_content)
+
+        with manifest_cache(tmp_path):
+            solution = LockManager(str(lock_path)).load()
+
+        monkeypatch.setattr(
+            LockFile, 'fromdict', lambda *args, **kwargs: pytest.fail('validated again')
+        )
+        with manifest_cache(tmp_path):
+            cached_solution = LockManager(str(lock_path)).load()
+
+        assert cached_solution.model_dump() == solution.model_dump()
+        assert cached_solution.solved_components['cmp'].source._path == tmp_path / 'cmp'
+
+    def test_dump_compares_loaded_content_hash(self, tmp_path, monkeypatch, valid_lock_path):
+        monkeypatch.setenv('CI_TESTING_IDF_VERSION', '4.4.4')
+        monkeypatch.setenv('IDF_TARGET', 'esp32')
+        lock_path = os.path.join(str(tmp_path), 'dependencies.lock')
+        shutil.copyfile(valid_lock_path, lock_path)
+
+        parser = LockManager(lock_path)
+        solution = parser.load()
+        assert not parser.dump(solution)
+
+        solution.target = 'esp32s3'
+        monkeypatch.setenv('IDF_TARGET', 'esp32s3')
+        assert parser.dump(solution)
+        assert not parser.dump(solution)
+        assert not filecmp.cmp(lock_path, valid_lock_path, shallow=False)
+
+        # the lock file is deleted or changed after it was loaded
+        os.remove(lock_path)
+        assert parser.dump(solution)
+        assert os.path.isfile(lock_path)
+
+        content = Path(lock_path).read_text()
+        Path(lock_path).write_text(content.replace('esp32s3', 'esp32s2'))
+        os.utime(lock_path, ns=(0, 0))
+        assert parser.dump(solution)
+        assert Path(lock_path).read_text() == content
+
     def test_load_invalid_lock(self, monkeypatch, fixtures_path):
         monkeypatch.setenv('IDF_TARGET', 'esp32')
         lock_path = os.path.join(
@@ -676,3 +743,54 @@ class TestLockManager(object):
         lock_manager.dump(solution)
         assert 'path: components/cmp' in lock_path.read_text()
         assert 'path: components\\cmp' not in lock_path.read_text()
+
+    @pytest.mark.enable_disk_cache
+    def test_verified_locked_versions_are_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('IDF_COMPONENT_CACHE_PATH', str(tmp_path))
+        names = [f'example/cmp_{i}' for i in range(50)]
+        manifest = Manifest.fromdict({'dependencies': {name: '*' for name in names}})
+        project_requirements = ProjectRequirements([manifest])
+        registry_hashes = {name: f'{i:064x}' for i, name in enumerate(names)}
+        solution = SolvedManifest.fromdict({
+            'direct_dependencies': names,
+            'dependencies': {
+                name: {
+                    'component_hash': registry_hashes[name],
+                    'source': {'registry_url': 'https://repo.example.com', 'type': 'service'},
+                    'version': '1.0.0',
+                }
+                for name in names
+            },
+            'manifest_hash': project_requirements.manifest_hash,
+        })
+
+        requested = []
+
+        def versions(self, name, spec='*', target=None):  # noqa: ARG001
+            requested.append(name)
+            return ComponentWithVersions(
+                name, [HashedComponentVersion('1.0.0', registry_hashes[name])]
+            )
+
+        monkeypatch.setattr(WebServiceSource, 'versions', versions)
+
+        assert not is_solve_required(project_requirements, solution)
+        assert sorted(requested) == sorted(names)
+
+        # Served from the cache, no requests to the registry
+        requested.clear()
+        assert not is_solve_required(project_requirements, solution)
+        assert requested == []
+
+        # A different hash in the lock file is checked against the registry again
+        solution.dependencies[0].component_hash = 'f' * 64
+        requested.clear()
+        with pytest.raises(InvalidComponentHashError):
+            is_solve_required(project_requirements, solution)
+        assert requested == [names[0]]
+
+        monkeypatch.setenv('IDF_COMPONENT_METADATA_CACHE_TTL', '0')
+        solution.dependencies[0].component_hash = registry_hashes[names[0]]
+        requested.clear()
+        assert not is_solve_required(project_requirements, solution)
+        assert len(requested) == len(names)
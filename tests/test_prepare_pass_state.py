@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import json
+
+import pytest
+
+from idf_component_manager.prepare_components.prepare import PassState, get_cmake_pid
+from idf_component_tools.registry.request_processor import (
+    get_response_snapshot,
+    set_response_snapshot,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_snapshot():
+    yield
+    set_response_snapshot(None)
+
+
+@pytest.mark.enable_disk_cache
+def test_pass_state_shares_responses(tmp_path):
+    state = PassState(tmp_path)
+    assert state._file_path.name == f'component_manager_state.{get_cmake_pid()}.json'
+
+    state.load()
+    get_response_snapshot()['http://example.com/components/cmp'] = {'versions': []}
+    state.save()
+
+    next_state = PassState(tmp_path)
+    next_state.load()
+    assert get_response_snapshot() == {'http://example.com/components/cmp': {'versions': []}}
+
+    next_state.cleanup()
+    assert not next_state._file_path.exists()
+
+
+@pytest.mark.enable_disk_cache
+def test_pass_state_ignores_other_versions(tmp_path):
+    state = PassState(tmp_path)
+    state._file_path.write_text(json.dumps({'version': '0.0.0', 'responses': {'url': {}}}))
+    state.load()
+    assert get_response_snapshot() == {}
+
+
+def test_pass_state_disabled(tmp_path):
+    state = PassState(tmp_path)
+    state.load()
+    state.save()
+    assert get_response_snapshot() is None
+    assert not state._file_path.exists()
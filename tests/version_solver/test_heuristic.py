@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+from idf_component_manager.version_solver.metrics import SolverMetrics
+from idf_component_manager.version_solver.mixology.constraint import Constraint
+from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.range import Range
+from idf_component_manager.version_solver.mixology.term import Term
+from idf_component_manager.version_solver.mixology.version_solver import (
+    DecisionHeuristic,
+    PreferLockedHeuristic,
+    VersionSolver,
+)
+
+
+class AddedOrderHeuristic(DecisionHeuristic):
+    def term_priority(self, term, versions):  # noqa: ARG002
+        return 0
+
+
+def decisions(source, heuristic):
+    result = VersionSolver(source, heuristic=heuristic).solve()
+    return {
+        str(package): str(version)
+        for package, version in result.decisions.items()
+        if package != Package.root()
+    }
+
+
+def test_prefer_locked_newest_versions(source):
+    source.root_dep(Package('a'), '*')
+    source.root_dep(Package('b'), '*')
+
+    for version in ('1.0.0', '2.0.0', '3.0.0'):
+        source.add(Package('a'), version)
+        source.add(Package('b'), version)
+
+    # Locked versions only decide the order of packages, not the versions
+    assert decisions(source, PreferLockedHeuristic({Package('a'): '2.0.0'})) == {
+        'a': '3.0.0',
+        'b': '3.0.0',
+    }
+
+
+def test_prefer_locked_term_priority():
+    heuristic = PreferLockedHeuristic({Package('a'): '2.0.0', Package('b'): '1.0.0'})
+    versions = ['3.0.0', '2.0.0']
+
+    def priority(name):
+        return heuristic.term_priority(Term(Constraint(Package(name), Range()), True), versions)
+
+    assert priority('a') < priority('b')
+    assert priority('b') == priority('c')
+    assert priority('a') < heuristic.term_priority(
+        Term(Constraint(Package('b'), Range()), True), ['3.0.0', '2.0.0', '1.0.0']
+    )
+
+
+def test_fewest_versions_first(source):
+    # Deciding b and z first pins y, instead of trying the versions of a one by one
+    source.root_dep(Package('a'), '*')
+    source.root_dep(Package('b'), '*')
+
+    for major in range(1, 5):
+        source.add(Package('a'), f'{major}.0.0', deps={Package('x'): f'{major}.0.0'})
+        source.add(Package('x'), f'{major}.0.0', deps={Package('y'): f'{major}.0.0'})
+        source.add(Package('y'), f'{major}.0.0')
+    source.add(Package('b'), '1.0.0', deps={Package('z'): '*'})
+    source.add(Package('z'), '1.0.0', deps={Package('y'): '1.0.0'})
+
+    attempts = []
+    for heuristic in (AddedOrderHeuristic(), DecisionHeuristic()):
+        metrics = SolverMetrics()
+        VersionSolver(source, metrics=metrics, heuristic=heuristic).solve()
+        attempts.append(metrics.attempted_solutions)
+
+    assert attempts == [5, 4]
@@ -129,3 +129,53 @@ def test_evaluated_but_rejected_candidate_missing_kconfig_is_not_reported(tmp_pa
 
     assert str(solution.solved_components['test/comp_a'].version) == '1.0.0'
     assert MISSING_KCONFIG not in KCONFIG_CONTEXT.get().missed_keys
+
+
+def test_missed_keys_rollback():
+    ctx = SdkconfigContext()
+    req_a = ComponentRequirement(name='test/comp_a', version='*')
+    req_b = ComponentRequirement(name='test/comp_b', version='*')
+    ctx.set_missed_kconfig('A', req_a)
+
+    checkpoint = ctx.checkpoint()
+    ctx.set_missed_kconfig('A', req_a)
+    ctx.set_missed_kconfig('A', req_b)
+    ctx.set_missed_kconfig('B', req_b)
+
+    inner = ctx.checkpoint()
+    ctx.set_missed_kconfig('C', req_a)
+    assert ctx.rollback(inner) == {'C': {req_a}}
+
+    # Misses recorded before the checkpoint are kept
+    assert ctx.rollback(checkpoint) == {'A': {req_b}, 'B': {req_b}}
+    assert ctx.missed_keys == {'A': {req_a}}
+    assert ctx.rollback(ctx.checkpoint()) == {}
+
+
+def test_missed_keys_rollback_nested_at_same_position():
+    ctx = SdkconfigContext()
+    req = ComponentRequirement(name='test/comp_a', version='*')
+
+    outer = ctx.checkpoint()
+    inner = ctx.checkpoint()
+    assert ctx.rollback(inner) == {}
+
+    # The outer checkpoint is still active
+    ctx.set_missed_kconfig('X', req)
+    assert ctx.rollback(outer) == {'X': {req}}
+    assert ctx.missed_keys == {}
+    assert ctx._journal == []
+
+
+def test_missed_keys_read_only():
+    ctx = SdkconfigContext()
+    req = ComponentRequirement(name='test/comp_a', version='*')
+    ctx.set_missed_kconfig('A', req)
+
+    with pytest.raises(TypeError):
+        ctx.missed_keys['B'] = {req}  # type: ignore
+    with pytest.raises(AttributeError):
+        ctx.missed_keys['A'].add(req)  # type: ignore
+
+    # Misses are not journaled without a checkpoint to roll back to
+    assert ctx._journal == []
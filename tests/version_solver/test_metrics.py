@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import json
+
+import pytest
+
+from idf_component_manager.version_solver.metrics import SolverMetrics
+from idf_component_manager.version_solver.mixology.failure import SolverFailure
+from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.version_solver import VersionSolver
+from idf_component_manager.version_solver.version_solver import (
+    VersionSolver as ComponentVersionSolver,
+)
+from idf_component_tools.utils import ProjectRequirements
+
+
+def test_solver_counts_decisions_and_backtracks(source):
+    source.root_dep(Package('a'), '>=1.0.0')
+
+    source.add(Package('a'), '1.0.0')
+    source.add(Package('a'), '2.0.0', deps={Package('b'): '1.0.0'})
+    source.add(Package('b'), '1.0.0', deps={Package('a'): '1.0.0'})
+
+    metrics = SolverMetrics()
+    VersionSolver(source, metrics=metrics).solve()
+
+    assert metrics.attempted_solutions == 2
+    assert metrics.decisions == 3  # root, a 2.0.0, a 1.0.0
+    assert metrics.backtracks == 1
+    assert metrics.derived_incompatibilities == 1
+    assert metrics.largest_conflict_chain == 1
+    assert metrics.propagation_iterations >= metrics.decisions
+    assert metrics.checked_incompatibilities > 0
+    assert metrics.versions_for_calls > 0
+    assert metrics.trace_events is None
+
+
+def test_solver_metrics_on_failure(source):
+    source.root_dep(Package('a'), '*')
+    source.root_dep(Package('b'), '*')
+
+    source.add(Package('a'), '1.0.0', deps={Package('c'): '^1.0.0'})
+    source.add(Package('b'), '1.0.0', deps={Package('c'): '^2.0.0'})
+    source.add(Package('c'), '1.0.0')
+    source.add(Package('c'), '2.0.0')
+
+    metrics = SolverMetrics(trace=True)
+    with pytest.raises(SolverFailure):
+        VersionSolver(source, metrics=metrics).solve()
+
+    assert metrics.attempted_solutions == 1
+    assert metrics.largest_conflict_chain >= 2
+    assert {event['name'] for event in metrics.trace_events} == {
+        'propagate',
+        'choose version',
+        'resolve conflict',
+    }
+
+
+def test_export(monkeypatch, tmp_path):
+    metrics_file = tmp_path / 'metrics.jsonl'
+    trace_file = tmp_path / 'trace.json'
+    monkeypatch.setenv('IDF_COMPONENT_SOLVER_METRICS_FILE', str(metrics_file))
+    monkeypatch.setenv('IDF_COMPONENT_SOLVER_TRACE_FILE', str(trace_file))
+    monkeypatch.setenv('IDF_TARGET', 'esp32')
+
+    for _ in range(2):
+        solver = ComponentVersionSolver(ProjectRequirements([]))
+        solver.solve()
+
+    lines = metrics_file.read_text().splitlines()
+    assert len(lines) == 2
+    data = json.loads(lines[0])
+    assert data['solved'] is True
+    assert data['target'] == 'esp32'
+    assert data['decisions'] == 1  # root
+    assert set(data['fetch_versions']) == {'calls', 'time'}
+
+    # The trace is a JSON array without the optional closing bracket
+    trace = trace_file.read_text()
+    assert trace.startswith('[\n')
+    events = json.loads(trace.rstrip(',\n') + ']')
+    assert [event['name'] for event in events].count('solve') == 2
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+
+def test_export_disabled(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    metrics = SolverMetrics.from_settings()
+    assert metrics.trace_events is None
+
+    with metrics.phase('solve'):
+        pass
+
+    metrics.export()
+    assert list(tmp_path.iterdir()) == []
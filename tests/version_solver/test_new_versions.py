@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import time
+
+import pytest
+
+from idf_component_manager.version_solver import new_versions
+from idf_component_manager.version_solver.new_versions import NewVersionsCheck, run_request
+from idf_component_manager.version_solver.version_solver import VersionSolver
+from idf_component_tools.debugger import KCONFIG_CONTEXT, SdkconfigContext
+from idf_component_tools.manager import ManifestManager
+from idf_component_tools.manifest import ComponentRequirement
+from idf_component_tools.semver import SimpleSpec, Version
+from idf_component_tools.sources import WebServiceSource
+from idf_component_tools.utils import (
+    ComponentWithVersions,
+    HashedComponentVersion,
+    ProjectRequirements,
+)
+
+pytestmark = pytest.mark.enable_disk_cache
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch, tmp_path):
+    monkeypatch.setenv('IDF_COMPONENT_CACHE_PATH', str(tmp_path / 'cache'))
+    monkeypatch.setenv('IDF_TARGET', 'esp32')
+    token = KCONFIG_CONTEXT.set(SdkconfigContext())
+    yield
+    KCONFIG_CONTEXT.reset(token)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    versions_by_name = {
+        'test/cmp_a': [
+            HashedComponentVersion(
+                '1.0.0',
+                component_hash='a' * 64,
+                dependencies=[ComponentRequirement(name='test/cmp_b', version='^1.0.0')],
+            )
+        ],
+        'test/cmp_b': [HashedComponentVersion('1.0.0', component_hash='b' * 64)],
+    }
+
+    def versions(self, name, spec='*', target=None):  # noqa: ARG001
+        return ComponentWithVersions(
+            name,
+            [
+                version
+                for version in versions_by_name[name]
+                if SimpleSpec(spec or '*').match(Version(str(version)))
+            ],
+        )
+
+    monkeypatch.setattr(WebServiceSource, 'versions', versions)
+    return versions_by_name
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    (tmp_path / 'main').mkdir()
+    (tmp_path / 'main' / 'idf_component.yml').write_text('dependencies:\n  test/cmp_a: "*"\n')
+    return ProjectRequirements([ManifestManager(str(tmp_path / 'main'), 'main').load()])
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    calls = []
+    monkeypatch.setattr(new_versions.subprocess, 'Popen', lambda args, **kwargs: calls.append(args))
+    return calls
+
+
+def test_check_in_background(registry, requirements, spawned, tmp_path, recording_log):
+    old_solution = VersionSolver(requirements).solve()
+    registry['test/cmp_b'].append(HashedComponentVersion('1.1.0', component_hash='c' * 64))
+    check = NewVersionsCheck(str(tmp_path / 'dependencies.lock'))
+
+    check.run(requirements, old_solution)
+    assert len(spawned) == 1
+    assert 'new versions available' not in recording_log.text
+
+    # The check is in progress
+    check.run(requirements, old_solution)
+    assert len(spawned) == 1
+
+    run_request(spawned[0][-1])
+    assert not os.path.exists(spawned[0][-1])
+
+    check.run(requirements, old_solution)
+    assert len(spawned) == 1
+    assert 'Dependency "test/cmp_b": "1.0.0" -> "1.1.0"' in recording_log.text
+
+
+def test_check_interval(monkeypatch, registry, requirements, spawned, tmp_path):  # noqa: ARG001
+    monkeypatch.setenv('IDF_COMPONENT_CHECK_NEW_VERSION_INTERVAL', '60')
+    old_solution = VersionSolver(requirements).solve()
+    check = NewVersionsCheck(str(tmp_path / 'dependencies.lock'))
+    check.run(requirements, old_solution)
+
+    with open(check.state_path, encoding='utf-8') as f:
+        state = json.load(f)
+    state['checked_at'] = time.time() - 61
+    with open(check.state_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+    check.run(requirements, old_solution)
+    assert len(spawned) == 2
+
+    # Changed manifests are checked again
+    monkeypatch.setattr(ProjectRequirements, 'manifest_hash', 'changed')
+    check.run(requirements, old_solution)
+    assert len(spawned) == 3
+
+
+def test_check_on_every_run(monkeypatch, registry, requirements, spawned, tmp_path, recording_log):
+    monkeypatch.setenv('IDF_COMPONENT_CHECK_NEW_VERSION_INTERVAL', '0')
+    old_solution = VersionSolver(requirements).solve()
+    registry['test/cmp_b'].append(HashedComponentVersion('1.1.0', component_hash='c' * 64))
+    NewVersionsCheck(str(tmp_path / 'dependencies.lock')).run(requirements, old_solution)
+
+    assert not spawned
+    assert not (tmp_path / 'cache' / 'new_versions').exists()
+    assert 'Dependency "test/cmp_b": "1.0.0" -> "1.1.0"' in recording_log.text
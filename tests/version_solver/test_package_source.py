@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from idf_component_manager.version_solver.helper import PackageSource, parse_constraint
+from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.range import Range
+from idf_component_tools.sources.web_service import WebServiceSource
+
+VERSIONS = ['1.0.0', '2.0.0-rc.1', '1.2.0', '2.0.0', '0.9.0', '1.10.0', '3.0.0', '2.1.0']
+
+
+@pytest.fixture
+def package():
+    return Package('test/cmp', WebServiceSource())
+
+
+@pytest.fixture
+def source(package):
+    source = PackageSource()
+    for version in VERSIONS:
+        source.add(package, version)
+    return source
+
+
+def linear_versions_for(source, package, constraint):
+    return sorted(
+        [
+            version
+            for version in source._packages[package]
+            if constraint.allows_any(Range(version, version, True, True))
+        ],
+        reverse=True,
+    )
+
+
+@pytest.mark.parametrize(
+    'spec',
+    [
+        '*',
+        '1.2.0',
+        '>=1.0.0',
+        '>1.0.0,<=2.0.0',
+        '<2.0.0',
+        '^1.0.0',
+        '~1.2',
+        '!=2.0.0',
+        '!=1.0.0,!=2.1.0',
+        '>=4.0.0',
+    ],
+)
+def test_versions_for_constraint(source, package, spec):
+    constraint = parse_constraint(spec)
+
+    assert source.versions_for(package, constraint) == linear_versions_for(
+        source, package, constraint
+    )
+
+
+def test_versions_for_union_and_empty(source, package):
+    union = parse_constraint('<1.0.0').union(parse_constraint('>=2.0.0,<3.0.0'))
+    assert [str(v) for v in source.versions_for(package, union)] == ['2.1.0', '2.0.0', '0.9.0']
+
+    empty = parse_constraint('<1.0.0').intersect(parse_constraint('>2.0.0'))
+    assert source.versions_for(package, empty) == []
+
+
+def test_versions_for_is_cached(source, package):
+    constraint = parse_constraint('^1.0.0')
+    versions = source.versions_for(package, constraint)
+
+    # Equal constraint built separately returns the same result
+    assert source.versions_for(package, parse_constraint('^1.0.0')) is versions
+
+    # Adding a new version invalidates the cache
+    source.add(package, '1.5.0')
+    assert [str(v) for v in source.versions_for(package, constraint)] == [
+        '2.0.0-rc.1',
+        '1.10.0',
+        '1.5.0',
+        '1.2.0',
+        '1.0.0',
+    ]
+
+
+def test_versions_for_not_semver(package):
+    source = PackageSource()
+    commit_id = 'a' * 40
+    for version in ['1.0.0', commit_id]:
+        source.add(package, version)
+
+    assert [str(v) for v in source.versions_for(package, parse_constraint('>=1.0.0'))] == [
+        '1.0.0',
+        commit_id,
+    ]
+
+
+def test_versions_for_constraint_file(monkeypatch, package):
+    monkeypatch.setenv('IDF_COMPONENT_CONSTRAINTS', 'test/cmp<2.0.0')
+    source = PackageSource()
+    for version in VERSIONS:
+        source.add(package, version)
+
+    assert [str(v) for v in source.versions_for(package)] == [
+        '2.0.0-rc.1',
+        '1.10.0',
+        '1.2.0',
+        '1.0.0',
+        '0.9.0',
+    ]
+    assert [str(v) for v in source.versions_for(package, parse_constraint('>1.0.0'))] == [
+        '2.0.0-rc.1',
+        '1.10.0',
+        '1.2.0',
+    ]
@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+
+from idf_component_manager.version_solver.helper import parse_constraint
+from idf_component_manager.version_solver.mixology.constraint import Constraint
+from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.partial_solution import PartialSolution
+from idf_component_manager.version_solver.mixology.set_relation import SetRelation
+from idf_component_manager.version_solver.mixology.term import Term
+from idf_component_tools.sources.web_service import WebServiceSource
+from idf_component_tools.utils import HashedComponentVersion
+
+
+def test_relation_follows_assignments():
+    source = WebServiceSource()
+    package = Package('test/cmp', source)
+    other = Package('test/other', source)
+    term = Term(Constraint(package, parse_constraint('>=2.0.0')), True)
+
+    solution = PartialSolution()
+    assert solution.relation(term) == SetRelation.OVERLAPPING
+
+    solution.decide(other, HashedComponentVersion('1.0.0'))
+    solution.decide(package, HashedComponentVersion('2.1.0'))
+    assert solution.relation(term) == SetRelation.SUBSET
+
+    solution.backtrack(1)
+    assert solution.relation(term) == SetRelation.OVERLAPPING
+
+    solution.decide(package, HashedComponentVersion('1.0.0'))
+    assert solution.relation(term) == SetRelation.DISJOINT
@@ -0,0 +1,143 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+
+from idf_component_manager.version_solver.solution_cache import SolutionCache
+from idf_component_manager.version_solver.version_solver import VersionSolver
+from idf_component_tools.debugger import KCONFIG_CONTEXT, SdkconfigContext
+from idf_component_tools.manifest import ComponentRequirement, Manifest, SolvedManifest
+from idf_component_tools.semver import SimpleSpec, Version
+from idf_component_tools.sources import WebServiceSource
+from idf_component_tools.utils import (
+    ComponentWithVersions,
+    HashedComponentVersion,
+    ProjectRequirements,
+)
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch, tmp_path):
+    monkeypatch.setenv('IDF_COMPONENT_CACHE_PATH', str(tmp_path / 'cache'))
+    monkeypatch.setenv('IDF_COMPONENT_CACHE_HTTP_REQUESTS', '1')
+    monkeypatch.setenv('IDF_TARGET', 'esp32')
+    monkeypatch.setenv('CI_TESTING_IDF_VERSION', '5.3.0')
+    token = KCONFIG_CONTEXT.set(SdkconfigContext())
+    yield
+    KCONFIG_CONTEXT.reset(token)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    versions_by_name = {
+        'test/cmp_a': [
+            HashedComponentVersion(
+                '1.0.0',
+                component_hash='a' * 64,
+                dependencies=[ComponentRequirement(name='test/cmp_b', version='^1.0.0')],
+            )
+        ],
+        'test/cmp_b': [
+            HashedComponentVersion('1.0.0', component_hash='b' * 64),
+            HashedComponentVersion('1.1.0', component_hash='c' * 64),
+        ],
+    }
+    requests = []
+
+    def versions(self, name, spec='*', target=None):  # noqa: ARG001
+        requests.append(name)
+        return ComponentWithVersions(
+            name,
+            [
+                version
+                for version in versions_by_name[name]
+                if SimpleSpec(spec or '*').match(Version(str(version)))
+            ],
+        )
+
+    monkeypatch.setattr(WebServiceSource, 'versions', versions)
+    return versions_by_name, requests
+
+
+@pytest.fixture
+def requirements():
+    return ProjectRequirements([Manifest.fromdict({'dependencies': {'test/cmp_a': '*'}})])
+
+
+def solve(cache, requirements):
+    old_solution = SolvedManifest.fromdict({})
+    key = cache.key(requirements, old_solution)
+    solver = VersionSolver(requirements, old_solution=old_solution)
+    solution = solver.solve()
+    cache.add(key, solver, solution)
+    return key, solution
+
+
+def test_solution_cache(tmp_path, registry, requirements):
+    versions_by_name, requests = registry
+    cache = SolutionCache(str(tmp_path))
+    key, solution = solve(cache, requirements)
+    assert str(solution.solved_components['test/cmp_b'].version) == '1.1.0'
+
+    requests.clear()
+    cached_solution = cache.get(key)
+    assert cached_solution.model_dump() == solution.model_dump()
+    assert sorted(requests) == ['test/cmp_a', 'test/cmp_b']
+
+    # A new version was published, the solution is outdated
+    versions_by_name['test/cmp_b'].append(HashedComponentVersion('1.2.0', component_hash='d' * 64))
+    assert cache.get(key) is None
+
+
+def test_solution_cache_key(requirements):
+    old_solution = SolvedManifest.fromdict({})
+    key = SolutionCache.key(requirements, old_solution)
+    assert SolutionCache.key(requirements, old_solution) == key
+
+    KCONFIG_CONTEXT.get().sdkconfig['SOME_OPTION'] = True
+    assert SolutionCache.key(requirements, old_solution) != key
+
+
+@pytest.mark.usefixtures('registry')
+@pytest.mark.parametrize(
+    ('env', 'value'),
+    [
+        ('IDF_COMPONENT_SOLUTION_CACHE', '0'),
+        ('IDF_COMPONENT_CACHE_HTTP_REQUESTS', '0'),
+    ],
+)
+def test_solution_cache_disabled(monkeypatch, tmp_path, requirements, env, value):
+    key, _ = solve(SolutionCache(str(tmp_path)), requirements)
+
+    monkeypatch.setenv(env, value)
+    assert SolutionCache(str(tmp_path)).get(key) is None
+
+
+def test_solution_with_missed_kconfig_is_not_cached(tmp_path, registry, requirements):
+    versions_by_name, _ = registry
+    versions_by_name['test/cmp_a'][0].dependencies.append(
+        ComponentRequirement(
+            name='test/cmp_b', version='*', rules=[{'if': '$CONFIG{UNKNOWN_OPTION} == True'}]
+        )
+    )
+
+    cache = SolutionCache(str(tmp_path))
+    key, _ = solve(cache, requirements)
+    assert cache.get(key) is None
+
+
+@pytest.mark.usefixtures('registry')
+def test_solution_cache_local_component(tmp_path):
+    local_component = tmp_path / 'cmp_local'
+    local_component.mkdir()
+    (local_component / 'idf_component.yml').write_text('dependencies:\n  test/cmp_b: "1.0.0"\n')
+    requirements = ProjectRequirements([
+        Manifest.fromdict({'dependencies': {'cmp_local': {'path': str(local_component)}}})
+    ])
+
+    cache = SolutionCache(str(tmp_path / 'solutions'))
+    key, solution = solve(cache, requirements)
+    assert cache.get(key).model_dump() == solution.model_dump()
+
+    # Dependencies of the local component changed, the solution is outdated
+    (local_component / 'idf_component.yml').write_text('dependencies:\n  test/cmp_b: "1.1.0"\n')
+    assert cache.get(key) is None
@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: 2026 Espressif Systems (Shanghai) CO LTD
+# SPDX-License-Identifier: Apache-2.0
+import os
+
+import pytest
+
+from idf_component_manager.dependencies import use_current_idf_version
+from idf_component_manager.version_solver.target_locks import TargetLocks
+from idf_component_manager.version_solver.version_solver import VersionSolver
+from idf_component_tools.debugger import KCONFIG_CONTEXT, SdkconfigContext
+from idf_component_tools.lock import LockManager
+from idf_component_tools.manager import ManifestManager
+from idf_component_tools.semver import SimpleSpec, Version
+from idf_component_tools.sources import WebServiceSource
+from idf_component_tools.utils import (
+    ComponentWithVersions,
+    HashedComponentVersion,
+    ProjectRequirements,
+)
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv('IDF_TARGET', 'esp32')
+    monkeypatch.setenv('IDF_COMPONENT_LOCK_TARGETS', 'esp32;esp32s3')
+    token = KCONFIG_CONTEXT.set(SdkconfigContext())
+    yield
+    KCONFIG_CONTEXT.reset(token)
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    versions_by_name = {
+        'test/cmp': [
+            HashedComponentVersion('1.0.0', component_hash='a' * 64),
+            HashedComponentVersion('2.0.0', component_hash='b' * 64, targets=['esp32']),
+        ],
+    }
+
+    def versions(self, name, spec='*', target=None):  # noqa: ARG001
+        return ComponentWithVersions(
+            name,
+            [
+                version
+                for version in versions_by_name[name]
+                if SimpleSpec(str(spec or '*')).match(Version(str(version)))
+                and not (target and version.targets and target not in version.targets)
+            ],
+        )
+
+    monkeypatch.setattr(WebServiceSource, 'versions', versions)
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    (tmp_path / 'main').mkdir()
+    (tmp_path / 'main' / 'idf_component.yml').write_text('dependencies:\n  test/cmp: "*"\n')
+    return str(tmp_path / 'dependencies.lock')
+
+
+def requirements(lock_path):
+    manifest_dir = os.path.join(os.path.dirname(lock_path), 'main')
+    return ProjectRequirements([ManifestManager(manifest_dir, 'main').load()])
+
+
+def locked_version(path):
+    return str(LockManager(path).load().solved_components['test/cmp'].version)
+
+
+def test_update_and_load(monkeypatch, lock_path):
+    project_requirements = requirements(lock_path)
+    solution = VersionSolver(project_requirements).solve()
+    target_locks = TargetLocks(lock_path)
+    target_locks.update(project_requirements, solution, solved=True)
+
+    assert locked_version(f'{lock_path}.esp32') == '2.0.0'
+    assert locked_version(f'{lock_path}.esp32s3') == '1.0.0'
+
+    monkeypatch.setenv('IDF_TARGET', 'esp32s3')
+    target_solution = target_locks.load(requirements(lock_path))
+    assert target_solution is not None
+    assert target_solution.target == 'esp32s3'
+    assert str(target_solution.solved_components['test/cmp'].version) == '1.0.0'
+
+    # Lock files of other targets are up to date, nothing to solve
+    monkeypatch.setattr(VersionSolver, 'solve', lambda self: pytest.fail('solved again'))  # noqa: ARG005
+    target_locks.update(requirements(lock_path), target_solution, solved=False)
+
+
+def test_load_outdated(monkeypatch, lock_path, tmp_path):
+    project_requirements = requirements(lock_path)
+    solution = VersionSolver(project_requirements).solve()
+    TargetLocks(lock_path).update(project_requirements, solution, solved=True)
+
+    (tmp_path / 'main' / 'idf_component.yml').write_text('dependencies:\n  test/cmp: "^1.0.0"\n')
+    monkeypatch.setenv('IDF_TARGET', 'esp32s3')
+    assert TargetLocks(lock_path).load(requirements(lock_path)) is None
+
+    monkeypatch.setenv('IDF_COMPONENT_LOCK_TARGETS', 'esp32')
+    assert TargetLocks(lock_path).load(requirements(lock_path)) is None
+
+
+def test_kconfig_dependencies_not_solved_for_other_targets(lock_path, tmp_path):
+    (tmp_path / 'main' / 'idf_component.yml').write_text(
+        'dependencies:\n'
+        '  test/cmp:\n'
+        '    version: "*"\n'
+        '    rules:\n'
+        '      - if: "$CONFIG{BT_ENABLED} == True"\n'
+    )
+    KCONFIG_CONTEXT.get().sdkconfig['BT_ENABLED'] = True
+    project_requirements = requirements(lock_path)
+    solution = VersionSolver(project_requirements).solve()
+    TargetLocks(lock_path).update(project_requirements, solution, solved=True)
+
+    assert locked_version(f'{lock_path}.esp32') == '2.0.0'
+    assert not (tmp_path / 'dependencies.lock.esp32s3').exists()
+
+
+def test_load_uses_current_idf_version(monkeypatch, lock_path, tmp_path):
+    monkeypatch.setenv('CI_TESTING_IDF_VERSION', '5.0.0')
+    (tmp_path / 'main' / 'idf_component.yml').write_text(
+        'dependencies:\n  idf: ">=5.0"\n  test/cmp: "*"\n'
+    )
+    project_requirements = requirements(lock_path)
+    solution = VersionSolver(project_requirements).solve()
+    TargetLocks(lock_path).update(project_requirements, solution, solved=True)
+
+    monkeypatch.setenv('CI_TESTING_IDF_VERSION', '5.1.0')
+    monkeypatch.setenv('IDF_TARGET', 'esp32s3')
+    target_solution = TargetLocks(lock_path).load(requirements(lock_path))
+    assert target_solution is not None
+    assert str(target_solution.solved_components['idf'].version) == '5.0.0'
+
+    use_current_idf_version(target_solution)
+    assert str(target_solution.solved_components['idf'].version) == '5.1.0'
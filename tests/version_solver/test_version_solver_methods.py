@@ -4,8 +4,13 @@
 import pytest
 
 from idf_component_manager.version_solver.mixology.package import Package
+from idf_component_manager.version_solver.mixology.version_solver import (
+    DecisionHeuristic,
+    PreferLockedHeuristic,
+)
 from idf_component_manager.version_solver.version_solver import VersionSolver
 from idf_component_tools.debugger import KCONFIG_CONTEXT, SdkconfigContext
+from idf_component_tools.manifest import ComponentRequirement, SolvedManifest
 from idf_component_tools.sources.web_service import WebServiceSource
 from idf_component_tools.utils import ProjectRequirements
 
@@ -47,7 +52,7 @@ def test_collect_candidate_missed_kconfigs(solver):
     kconfig_ctx = KCONFIG_CONTEXT.get()
 
     # Initial global state
-    kconfig_ctx.missed_keys['A'].add('req1')
+    kconfig_ctx.set_missed_kconfig('A', 'req1')
 
     class FakeVersion:
         component_hash = None
@@ -59,8 +64,8 @@ def test_collect_candidate_missed_kconfigs(solver):
 
     with solver._collect_candidate_missed_kconfigs(pkg, version):
         # Simulate evaluating an optional dependency missing some keys
-        kconfig_ctx.missed_keys['A'].add('req2')
-        kconfig_ctx.missed_keys['B'].add('req3')
+        kconfig_ctx.set_missed_kconfig('A', 'req2')
+        kconfig_ctx.set_missed_kconfig('B', 'req3')
 
     # Global context should be completely restored
     assert kconfig_ctx.missed_keys['A'] == {'req1'}
@@ -110,3 +115,53 @@ def test_commit_selected_candidate_missed_kconfigs(solver):
 
     # pkg2 was NOT in decisions, so 'B' should not be committed
     assert 'B' not in kconfig_ctx.missed_keys
+
+
+def test_locked_component(solver):
+    solution = SolvedManifest.fromdict({
+        'dependencies': [
+            {
+                'name': 'test/cmp',
+                'version': '1.2.7',
+                'component_hash': 'a' * 64,
+                'source': {'type': 'service'},
+            },
+            {'name': 'test/local', 'version': '1.0.0', 'source': {'type': 'local', 'path': '.'}},
+        ],
+        'target': 'esp32',
+    })
+    dependencies = list(solution.dependencies)
+
+    locked = solver._locked_component(ComponentRequirement(name='test/cmp', version='*'), solution)
+    assert str(locked.version) == '1.2.7'
+    assert solver._locked_component(ComponentRequirement(name='test/cmp'), None) is None
+    assert solver._locked_component(ComponentRequirement(name='test/other'), solution) is None
+
+    # Different source than in the current solution
+    assert solver._locked_component(ComponentRequirement(name='test/local'), solution) is None
+
+    # The current solution is not modified
+    assert solution.dependencies == dependencies
+
+
+def test_decision_heuristic_prefers_locked_packages(solver):
+    assert type(solver._decision_heuristic()) is DecisionHeuristic
+
+    solver.old_solution = SolvedManifest.fromdict({
+        'dependencies': [
+            {
+                'name': 'test/cmp',
+                'version': '1.2.7',
+                'component_hash': 'a' * 64,
+                'source': {'type': 'service'},
+            },
+        ],
+        'target': 'esp32',
+    })
+    heuristic = solver._decision_heuristic()
+    assert isinstance(heuristic, PreferLockedHeuristic)
+
+    package = Package('test/cmp', WebServiceSource())
+    assert heuristic.choose_version(package, ['1.3.0', '1.2.7', '1.0.0']) == '1.3.0'
+    assert heuristic._is_locked_version_allowed(package, ['1.3.0', '1.2.7'])
+    assert not heuristic._is_locked_version_allowed(package, ['1.3.0', '1.0.0'])